@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+
+# Affiliation: Life Sciences, University of Bristol
+# Last Updated: 2026-10-18
+
+"""
+Slurm arrays of a job kept within the cluster's limits, and the results of a split job read back in the job's sim order.
+Set in INPUT_script_1/backend.txt (tab separated, see jobbackend.py):
+	MAXARRAYSIZE	most sims (knockouts and controls) in one array, i.e. the highest array index the cluster accepts (its MaxArraySize - 1).
+			Default: Stage 1 200 genes + the 2 controls per array (as before), the other stages one array per job
+	THROTTLE	most sims of an array running at the same time, written as --array=1-202%THROTTLE. Default: no limit
+A job with more sims than MAXARRAYSIZE is split into chunks, each a job of its own (ko.list, exp.list, bash script, endtimes.txt, e.g.
+minedivide_part1, divideko_part1_endtimes.txt) holding a run of the job's knockouts followed by the job's controls, sims numbered from 1.
+The job's ko.list, exp.list and manifest keep every sim (the outcome cache and the manifests use the job's sim numbers), and the chunk map
+(e.g. INPUT_script_3/divideko_chunks.txt, next to the endtimes.txt the job would have) records the job sims of each chunk:
+	chunk number, chunk job, first job sim, last job sim, chunk endtimes.txt
+jobResultLines() reads the chunks' endtimes.txt back into the job's sim order, so interpretResults() sees the job as one array.
+Stage 1 writes its genes as numbered chunks with no job around them (mineinputko1, mineinputko2, ...), matched in order by script_2.py.
+"""
+
+# Imports
+import os
+from collections import namedtuple
+from jobbackend import readBackendValues
+from outcomecache import arraySims, arraySpec, readKoList
+from simresults import placeResults, readEndtimes, resultLines
+
+# Global variables
+CHUNKS_SUFFIX = 'chunks.txt'
+# chunk jobs / endtimes names, e.g. minedivide -> minedivide_part1, divideko_e -> divideko_part1_e
+CHUNKLABEL = '_part{}'
+
+# One array of a job: its name, files, --array value, number of sims and endtimes.txt
+ArrayJob = namedtuple('ArrayJob', ['name', 'endtimename', 'kolist', 'explist', 'array', 'simnumber', 'endtimes'])
+# A line of a chunk map, first / last the job sims of the chunk's knockouts
+Chunk = namedtuple('Chunk', ['number', 'name', 'first', 'last', 'endtimes'])
+
+def arrayLimits(maxarraysize=None, values=None):
+	''' (most sims in one array, throttle) from backend.txt, maxarraysize (the stage's default) / None if not set '''
+
+	if values is None:
+		values = readBackendValues()
+	limits = []
+	for key, default in [('MAXARRAYSIZE', maxarraysize), ('THROTTLE', None)]:
+		value = values.get(key, '')
+		if value and (not value.isdigit() or int(value) < 1):
+			raise ValueError(f"{key} in backend.txt is a number of sims (1 or more), not {value}")
+		limits.append(int(value) if value else default)
+	return tuple(limits)
+
+def chunkSlices(count, size):
+	''' (start, end) of consecutive runs of at most size of count items, at least one run '''
+
+	if size < 1:
+		raise ValueError(f"An array needs room for at least one knockout besides its controls, not {size}")
+	return [(start, min(start + size, count)) for start in range(0, count, size)] or [(0, 0)]
+
+def throttled(array, throttle=None):
+	''' --array value with the throttle, e.g. 1-5,7 -> 1-5,7%50 '''
+
+	if throttle:
+		return array + '%' + str(throttle)
+	return array
+
+def chunkMapPath(endtimes):
+	''' e.g. INPUT_script_3/divideko_endtimes.txt -> INPUT_script_3/divideko_chunks.txt '''
+
+	return endtimes[:-len('endtimes.txt')] + CHUNKS_SUFFIX
+
+def readChunkMap(endtimes):
+	''' Chunks of the job whose results would be endtimes, [] if the job was not split '''
+
+	chunkmap = chunkMapPath(endtimes)
+	if not os.path.isfile(chunkmap):
+		return []
+	chunks = []
+	with open(chunkmap) as chunks_txt:
+		for line in chunks_txt:
+			values = line.rstrip('\n').split('\t')
+			if len(values) == 5 and values[0].isdigit():
+				chunks.append(Chunk(int(values[0]), values[1], int(values[2]), int(values[3]), values[4]))
+	return chunks
+
+def jobEndtimes(endtimes):
+	''' endtimes.txt files holding the results of a job: its chunks', or endtimes itself '''
+
+	return [chunk.endtimes for chunk in readChunkMap(endtimes)] or [endtimes]
+
+def jobArrays(name, endtimename, kolist, explist, array, controls, endtimes, maxarraysize=None, throttle=None):
+	''' createScripts() helper: the arrays to write a bash script for and submit, given the job's ko.list / exp.list (controls the last
+		lines) and --array (the job's sims to simulate). The job itself if it fits MAXARRAYSIZE, else its chunks, whose ko.list / exp.list
+		and chunk map are written here. '''
+
+	chunkmap = chunkMapPath(endtimes)
+	if os.path.isfile(chunkmap):
+		os.remove(chunkmap)
+	kolines = readKoList(kolist)
+	if maxarraysize is None or len(kolines) <= maxarraysize:
+		return [ArrayJob(name, endtimename, kolist, explist, throttled(array, throttle), str(len(kolines)), endtimes)]
+
+	explines = readKoList(explist)
+	knockouts = len(kolines) - controls
+	sims = set(arraySims(array))
+	folder = os.path.dirname(kolist)
+	arrays = []
+	with open(chunkmap, 'w+', newline ='\n') as chunks_txt:
+		for number, (start, end) in enumerate(chunkSlices(knockouts, maxarraysize - controls), start=1):
+			chunkname = name + CHUNKLABEL.format(number)
+			chunkendtimename = endtimename[:-len('_e')] + CHUNKLABEL.format(number) + '_e'
+			chunkendtimes = os.path.join(os.path.dirname(endtimes), chunkendtimename + 'ndtimes.txt').replace('\\', '/')
+			chunkkolist = os.path.join(folder, chunkname + '_ko.list')
+			chunkexplist = os.path.join(folder, chunkname + '_exp.list')
+			# the chunk's knockouts then the job's controls
+			jobsims = list(range(start + 1, end + 1)) + list(range(knockouts + 1, len(kolines) + 1))
+			with open(chunkkolist, 'w+', newline ='\n') as ko:
+				for sim in jobsims:
+					ko.write(kolines[sim - 1] + '\n')
+			with open(chunkexplist, 'w+', newline ='\n') as exp:
+				for sim in jobsims:
+					exp.write(explines[sim - 1] + '\n')
+			chunksims = [chunksim for chunksim, sim in enumerate(jobsims, start=1) if sim in sims]
+			chunkarray = throttled(arraySpec(chunksims or [1]), throttle)
+			chunks_txt.write('{}\t{}\t{}\t{}\t{}\n'.format(number, chunkname, start + 1, end, chunkendtimes))
+			arrays.append(ArrayJob(chunkname, chunkendtimename, chunkkolist, chunkexplist, chunkarray, str(len(jobsims)), chunkendtimes))
+	return arrays
+
+def jobResultLines(endtimes, length, skip=(), partial=False):
+	''' resultLines() of a job, read from its chunks' endtimes.txt if it was split (chunk sims placed at their job sims).
+		With partial, endtimes.txt not in place yet (e.g. a chunk still queued) are read as no results. '''
+
+	chunks = readChunkMap(endtimes)
+	if not chunks:
+		if partial and not os.path.isfile(endtimes):
+			return placeResults([], length, skip)
+		return resultLines(endtimes, length, skip)
+	knockouts = chunks[-1].last
+
+	def records():
+		for chunk in chunks:
+			if partial and not os.path.isfile(chunk.endtimes):
+				continue
+			size = chunk.last - chunk.first + 1
+			for record in readEndtimes(chunk.endtimes):
+				if record.sim <= size:
+					yield record._replace(sim=chunk.first + record.sim - 1)
+				else:
+					# the chunk's controls are the job's controls
+					yield record._replace(sim=knockouts + record.sim - size)
+
+	return placeResults(records(), length, skip)
+
+def controlSims(explist):
+	''' Sim numbers of the wildtype / mutant controls at the end of an exp.list (none for the large Stage 4X rounds) '''
+
+	experiments = readKoList(explist)
+	sims = set()
+	for sim in range(len(experiments), 0, -1):
+		if experiments[sim - 1] not in ('wildtype', 'mutant'):
+			break
+		sims.add(sim)
+	return sims
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+
+# Affiliation: Life Sciences, University of Bristol
+# Last Updated: 2026-10-18
+
+"""
+Packed arrays: each Slurm array task simulates PACK sims of the job one after another in one MATLAB session, instead of starting
+MATLAB twice (simulation, then runGraphs / compareGraphs) for every ko.list line. Set in INPUT_script_1/backend.txt (see jobbackend.py):
+	PACK	sims per array task, default 1 (templatescript/TemplateScript.sh, one sim per task, as before)
+With PACK above 1 every createScripts() writes its bash scripts from templatescript/TemplatePackedScript.sh and, next to each ko.list,
+a packs list (e.g. OUTPUT_script_2/minedivide_packs.list, uploaded to KOLists with the ko.list) holding the sims of each task:
+	1 2 3 4		line 1, the sims of task 1
+	5 6 7 11	line 2, ...
+The bash script's --array is the tasks (1-2), throttled as set. Sims keep their ko.list / exp.list line numbers, output folders and seeds,
+and each still writes its own endtimes.txt record, so interpretResults() reads a packed job as any other. The backend is handed the
+job's sims, the local backend packs them itself (a SIMULATOR command with {batch}).
+"""
+
+# Imports
+import os
+from jobbackend import packSize
+from outcomecache import arraySims, arraySpec
+
+# Global variables
+PACKEDTEMPLATESCRIPT = "templatescript/TemplatePackedScript.sh"
+# packs list name, e.g. OUTPUT_script_2/minedivide_ko.list -> OUTPUT_script_2/minedivide_packs.list
+PACK_SUFFIX = '_packs.list'
+
+def packTemplate(templatescript, pack=None):
+	''' Template of the stage's bash scripts, the packed template if PACK is above 1 '''
+
+	if pack is None:
+		pack = packSize()
+	if pack > 1:
+		return PACKEDTEMPLATESCRIPT
+	return templatescript
+
+def packListPath(kolist):
+	''' e.g. OUTPUT_script_2/minedivide_ko.list -> OUTPUT_script_2/minedivide_packs.list '''
+
+	return kolist[:-len('_ko.list')] + PACK_SUFFIX
+
+def packedArray(kolist, array, pack=None):
+	''' --array of a job's bash script: array (the sims to simulate, throttled or not) itself with one sim per task, else the tasks
+		of PACK sims each, whose packs list is written next to kolist '''
+
+	if pack is None:
+		pack = packSize()
+	packlist = packListPath(kolist)
+	if os.path.isfile(packlist):
+		os.remove(packlist)
+	if pack <= 1:
+		return array
+
+	spec, percent, throttle = array.partition('%')
+	sims = arraySims(spec)
+	tasks = 0
+	with open(packlist, 'w+', newline ='\n') as packs:
+		for x in range(0, len(sims), pack):
+			packs.write(' '.join(str(sim) for sim in sims[x:x + pack]) + '\n')
+			tasks = tasks + 1
+	return arraySpec(range(1, tasks + 1) or [1]) + percent + throttle
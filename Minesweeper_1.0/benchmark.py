@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+
+# Affiliation: Life Sciences, University of Bristol
+# Last Updated: 2026-10-18
+
+"""
+End-to-end benchmark: runs Stage 1 - 4X (engine.py) on the Minesweeper_0.9 DEMO Completed results (DemoReplay) and on
+synthetic genomes of 100 - 5000 genes (SurrogateSimulator with a generated ground truth), once per eights search.
+For every run it reports the simulations requested (per stage), the rounds, the final genome size of each variant, the wall
+time per stage and the CPU time per function (interpretResults, remainingGenes, endingDecision, eightPanelGroupingsGeneration,
+searchEights, submit = the in-memory createScripts, simulate = the simulator / replay itself), as JSON, to track regressions.
+Usage: python benchmark.py [OUTPUT.json] [DEMO folder]   (default minesweeper_benchmark.json in the temp directory, not the working
+directory, and ../Minesweeper_0.9 DEMO Completed, '-' skips the DEMO)
+"""
+
+# Imports
+from datetime import datetime
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from geneset import GeneRegistry, loadRegistry
+from engine import DemoReplay, MinesweeperEngine
+from surrogate import SurrogateSimulator
+
+# Global variables
+BENCHMARK_JSON = os.path.join(tempfile.gettempdir(), "minesweeper_benchmark.json")
+DEMO_FOLDER = "../Minesweeper_0.9 DEMO Completed"
+SIZES = [100, 500, 1000, 2000, 5000]
+SEARCHES = ['full', 'largest', 'level']
+# synthetic ground truth: share of essential genes, synthetic lethal pairs per 100 genes, stochastic failure rate
+ESSENTIAL_FRACTION = 0.4
+LETHALPAIRS_PER_100 = 2
+FAILURERATE = 0.01
+SEED = 0
+
+def syntheticGenome(size, seed=SEED):
+	''' Registry of size genes (SG_0001, ...) and a SurrogateSimulator with a random ground truth over them '''
+
+	registry = GeneRegistry('SG_{:04d}'.format(x + 1) for x in range(size))
+	chance = random.Random(seed)
+	genes = list(registry.genes)
+	essential = set(chance.sample(genes, int(size * ESSENTIAL_FRACTION)))
+	nonessential = [gene for gene in genes if gene not in essential]
+	lethalsets = [chance.sample(nonessential, 2) for x in range(size * LETHALPAIRS_PER_100 // 100)]
+	simulator = SurrogateSimulator(registry, essential=sorted(essential), lethalsets=lethalsets, failurerate=FAILURERATE, seed=seed)
+	return registry, simulator
+
+def benchmarkRun(name, engine):
+	''' Run an engine from Stage 1 and collect its numbers '''
+
+	start = time.perf_counter()
+	finalresults = engine.run()
+	seconds = time.perf_counter() - start
+	genomesize = len(engine.genes)
+	lanes = {}
+	for lane in engine.lanes:
+		# lanes still running at maxrounds report their current deletion
+		deleted, remaining = finalresults.get(lane.id, (lane.deleted, lane.remaining))
+		lanes[lane.id] = {'rounds': lane.round, 'finished': lane.finished, 'merged': lane.merged, 'deleted': len(deleted), 'genomesize': genomesize - len(deleted)}
+	return {
+		'name': name,
+		'genes': genomesize,
+		'search': engine.eightssearch,
+		'width': engine.width,
+		'simulations': engine.simulations,
+		'rounds': max((lane.round for lane in engine.lanes), default=0),
+		'finished': all(lane.finished for lane in engine.lanes),
+		'finalgenomesize': min((lane['genomesize'] for lane in lanes.values()), default=genomesize),
+		'seconds': seconds,
+		'stages': engine.stages,
+		'cpu': engine.timings,
+		'lanes': lanes,
+		}
+
+def demoRuns(folder, searches=SEARCHES):
+	registry = loadRegistry(os.path.join(folder, "INPUT_script_1/genes.txt"))
+	replay = DemoReplay(folder, registry)
+	runs = []
+	for search in searches:
+		engine = MinesweeperEngine(replay, registry=registry, exclusions=replay.exclusions, requireproteinrna=False, checkpointdir=None, eightssearch=search)
+		runs.append(benchmarkRun('demo', engine))
+	return runs
+
+def syntheticRuns(sizes=SIZES, searches=SEARCHES):
+	runs = []
+	for size in sizes:
+		for search in searches:
+			registry, simulator = syntheticGenome(size)
+			engine = MinesweeperEngine(simulator, registry=registry, checkpointdir=None, eightssearch=search)
+			runs.append(benchmarkRun('synthetic_{}'.format(size), engine))
+	return runs
+
+def main():
+	output = sys.argv[1] if len(sys.argv) > 1 else BENCHMARK_JSON
+	folder = sys.argv[2] if len(sys.argv) > 2 else DEMO_FOLDER
+	runs = []
+	if folder != '-' and os.path.isdir(folder):
+		runs.extend(demoRuns(folder))
+	runs.extend(syntheticRuns())
+	for run in runs:
+		stopped = '' if run['finished'] else ' (stopped at maxrounds)'
+		print('{name:>16} {search:>8}: {simulations:>6} simulations, {rounds:>2} rounds, final genome {finalgenomesize:>5} of {genes:>5} genes, {seconds:.3f} s{0}'.format(stopped, **run))
+	benchmark = {
+		'version': 1,
+		'date': "{:%Y-%m-%d %H:%M:%S}".format(datetime.now()),
+		'python': platform.python_version(),
+		'runs': runs,
+		}
+	with open(output, 'w', newline ='\n') as benchmark_json:
+		json.dump(benchmark, benchmark_json, indent=1)
+	print('\nWrote {} runs to {}'.format(len(runs), output))
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+
+# Affiliation: Life Sciences, University of Bristol
+# Last Updated: 2026-10-18
+
+"""
+Compact COLOUR_N_eightsandgenes.txt of Stage 4X (script_4X.py). Every combination of a round is appended to the same deletion
+(the largest deletion so far), so the file stores that deletion once, the gene codes of each group once (eights group, appended
+single ko or group test pool), and one line of group names per combination, in ko.list order (tab separated):
+	#base	'MG_009', 'MG_012', ...
+	#group	1	'MG_186','MG_187',...
+	(blank line = the blank combination)
+	1
+	1 2
+A combination is expanded to its gene codes only when needed (ComboFile.genes(), ComboFile.koLines() when the ko.list is written,
+as a GeneSet so every ko.list line is rendered the same way: registry order, no duplicate genes).
+Files with the gene codes on every line (Stage 3 combosandgenes, eightsandgenes of earlier versions / the DEMO) are read as they are.
+"""
+
+# Imports
+import re
+
+# Global variables
+BASE = '#base'
+GROUP = '#group'
+# ko.list spacing of gene codes, 'MG_001','MG_002', -> 'MG_001', 'MG_002',
+COMMASPACING = re.compile(r",\s*'")
+
+def writeComboFile(path, base, groups, combos):
+	''' Write a compact combination file: base the deleted genes the combinations are appended to, groups (name, gene codes) pairs,
+		combos the combinations (tuples of group names, () the blank combination) in ko.list order, written as they are generated '''
+
+	with open(path, 'w+', newline ='\n') as combo_txt:
+		combo_txt.write(BASE + '\t' + base + '\n')
+		for name, genes in groups:
+			combo_txt.write(GROUP + '\t' + name + '\t' + genes + '\n')
+		for combo in combos:
+			combo_txt.write(' '.join(combo) + '\n')
+
+class ComboFile:
+	''' Combinations of a combosandgenes / eightsandgenes file, in ko.list order '''
+
+	def __init__(self):
+		# None = gene codes on every line (self.lines)
+		self.base = None
+		self.groups = {}
+		self.combos = []
+		self.lines = {}
+
+	def names(self):
+		''' Combination names, one per ko.list line (the blank combination '') '''
+
+		return list(self.combos)
+
+	def genes(self, name):
+		''' Gene codes of a combination, as the line of an uncompacted file (the deletion and the genes of its groups, ko.list spacing) '''
+
+		if self.base is None:
+			return self.lines[name]
+		if not name:
+			return ''
+		return COMMASPACING.sub(", '", self.base + '\t' + ''.join(self.groups[group] for group in name.split(' ')))
+
+	def koLines(self, registry):
+		''' ko.list lines of the combinations, each rendered by its GeneSet over registry (GeneSet.toKoLine()), the blank combination a blank line '''
+
+		for name in self.combos:
+			yield (registry.parse(self.genes(name)).toKoLine() or ' ') + '\n'
+
+def readComboFile(path):
+	''' ComboFile of a compact or uncompacted combination file '''
+
+	combofile = ComboFile()
+	with open(path) as combo_txt:
+		lines = combo_txt.read().split('\n')
+	if lines and lines[-1] == '':
+		lines = lines[:-1]
+	for line in lines:
+		if line.startswith(BASE + '\t'):
+			combofile.base = line[len(BASE) + 1:]
+		elif line.startswith(GROUP + '\t'):
+			group, genes = line[len(GROUP) + 1:].split('\t', 1)
+			combofile.groups[group] = genes
+		elif combofile.base is not None:
+			combofile.combos.append(line.strip())
+		else:
+			name, genes = line.partition('\t')[0::2]
+			combofile.combos.append(name.strip())
+			combofile.lines.setdefault(name.strip(), genes)
+	return combofile
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+
+# Affiliation: Life Sciences, University of Bristol
+# Last Updated: 2026-10-18
+
+"""
+Early stop of a Stage 4X round (script_4X.EARLYSTOP): the round is decided on the endtimes.txt landed so far, as soon as the sims
+without a result can no longer change what happens next, instead of waiting for the tail of every array.
+An eights / final round keeps the dividing combination deleting the most genes (the first in ko.list order of those as large), and only
+whether any divided matters besides it, so a variant is decided once it has a dividing combination (its running best) and no sim
+without a result deletes more genes, or as many ahead of it. Appended single ko and group test rounds use every result, they are
+decided once every sim has one. Results are read from the endtimes.txt (chunks, retries) landed so far and the outcome cache
+(OUTPUT_final/outcomecache.sqlite), without storing anything, so a round that can not be decided yet is simply read again on the next run.
+Once every variant of the round is decided, the sims still without a result are dominated: the jobs holding them can be cancelled.
+"""
+
+# Imports
+import os
+from collections import namedtuple
+from outcomecache import NO_RESULT, OutcomeCache, readKoList
+from arraychunks import readChunkMap
+from simretry import readRetryMap
+from eightswaves import readWaveMap
+
+# Global variables
+# phases decided by their best deletion, the others need every result
+BESTPHASES = ['eights', 'finalround']
+
+# Running best of a variant: the sim (0 none yet) and gene count of its best dividing combination, the dividing sims so far,
+# the sims without a result and those of them that could still beat the best
+VariantProgress = namedtuple('VariantProgress', ['name', 'phase', 'bestsim', 'best', 'dividing', 'unknown', 'contenders'])
+
+def knownResults(kolist, result_list):
+	''' result_list with the sims not simulated by the job filled from the outcome cache, read only (see outcomecache.cachedResults()) '''
+
+	if not os.path.isfile(kolist):
+		return result_list
+	known = list(result_list)
+	with OutcomeCache() as cache:
+		for x, line in enumerate(readKoList(kolist)[:len(known)]):
+			if known[x] == NO_RESULT and line.strip():
+				known[x] = cache.get(line) or NO_RESULT
+	return known
+
+def variantProgress(name, phase, kolist, result_list, skip, registry, divides):
+	''' VariantProgress of a variant's round from its results so far (result_list[i] = sim i + 1, 'No_Result' not landed yet),
+		skip the sims left out of the matched results (duplicate wildtype, controls), divides the test of a dividing result line '''
+
+	kolines = readKoList(kolist)
+	result_list = knownResults(kolist, result_list)
+	bestsim, best, dividing, unknown, sizes = 0, 0, [], [], {}
+	for sim, (line, result) in enumerate(zip(kolines, result_list), start=1):
+		if sim in skip or not line.strip():
+			continue
+		if result == NO_RESULT:
+			unknown.append(sim)
+			sizes[sim] = len(registry.parse(line))
+		elif divides(result):
+			dividing.append(sim)
+			size = len(registry.parse(line))
+			if size > best:
+				bestsim, best = sim, size
+	if not dividing:
+		contenders = list(unknown)
+	else:
+		contenders = [sim for sim in unknown if sizes[sim] > best or (sizes[sim] == best and sim < bestsim)]
+	return VariantProgress(name, phase, bestsim, best, dividing, unknown, contenders)
+
+def decided(progress):
+	''' Whether the sims without a result can no longer change the variant's next step '''
+
+	if progress.phase in BESTPHASES:
+		return not progress.contenders
+	return not progress.unknown
+
+def cancelJobs(job, endtimes):
+	''' Jobs of a variant's round that may still be running: the job (its chunks if it was split, arraychunks.py), its retries and its wave jobs (eightswaves.py) '''
+
+	jobs = [chunk.name for chunk in readChunkMap(endtimes)] or [job]
+	return jobs + [retry.name for retry in readRetryMap(endtimes)] + [wave.name for wave in readWaveMap(endtimes)]
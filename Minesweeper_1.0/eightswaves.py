@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+
+# Affiliation: Life Sciences, University of Bristol
+# Last Updated: 2026-10-18
+
+"""
+Waves of an adaptive eights round of Stage 4X (script_4X.py EIGHTSSEARCH, latticesearch.py). The round's ko.list, exp.list and manifest
+keep every combination, its job simulates the first wave, and each later wave is a job of its own next to the job's files (ko.list,
+exp.list, bash script, endtimes.txt, e.g. minegapko_red_3_wave2, gapko_red_3_wave2_endtimes.txt) holding the wave's sims without a
+cached result, numbered from 1, split / packed like any job (arraychunks.py, arraypacks.py).
+The wave map (e.g. INPUT_script_4X/gapko_red_3_waves.txt, next to the job's endtimes.txt) records the job sims of each wave job:
+	wave number, wave job, wave endtimes.txt, job sims (space separated)
+wavedResultLines() reads the job's results with those of its retries and wave jobs placed at their job sims.
+The search (LatticeSearch.state() and the wave pending) is kept with the variant in OUTPUT_final/runstate.json, so each run of
+script_4X.py records the wave that has landed and submits the next, and the round is interpreted once the search is exhausted.
+Wave sims are not pending in the outcome cache, so their crashed sims are not retried (RETRIES), they are read as not dividing, as engine.py does.
+"""
+
+# Imports
+import os
+from collections import namedtuple
+from outcomecache import NO_RESULT, OutcomeCache, jobName, readKoList
+from arraychunks import jobEndtimes
+from simretry import placeJobResults, retriedResultLines, submitSims
+
+# Global variables
+WAVES_SUFFIX = 'waves.txt'
+# wave jobs / endtimes names, e.g. minegapko_red_3 -> minegapko_red_3_wave2, gapko_red_3_e -> gapko_red_3_wave2_e
+WAVELABEL = '_wave{}'
+
+# A line of a wave map, sims the job sims of the wave job's sims 1, 2, ...
+Wave = namedtuple('Wave', ['number', 'name', 'endtimes', 'sims'])
+
+def waveMapPath(endtimes):
+	''' e.g. INPUT_script_4X/gapko_red_3_endtimes.txt -> INPUT_script_4X/gapko_red_3_waves.txt '''
+
+	return endtimes[:-len('endtimes.txt')] + WAVES_SUFFIX
+
+def readWaveMap(endtimes):
+	''' Wave jobs of the job whose results are endtimes, [] if it had none '''
+
+	wavemap = waveMapPath(endtimes)
+	if not os.path.isfile(wavemap):
+		return []
+	waves = []
+	with open(wavemap) as waves_txt:
+		for line in waves_txt:
+			values = line.rstrip('\n').split('\t')
+			if len(values) == 4 and values[0].isdigit():
+				waves.append(Wave(int(values[0]), values[1], values[2], [int(sim) for sim in values[3].split()]))
+	return waves
+
+def clearWaves(endtimes):
+	''' createScripts() helper: forget the wave jobs of an earlier run of the job '''
+
+	wavemap = waveMapPath(endtimes)
+	if os.path.isfile(wavemap):
+		os.remove(wavemap)
+
+def waveEndtimes(endtimes):
+	''' endtimes.txt files of the job's wave jobs (of their chunks for waves split into several arrays) '''
+
+	return [waveendtimes for wave in readWaveMap(endtimes) for waveendtimes in jobEndtimes(wave.endtimes)]
+
+def wavedResultLines(endtimes, length, skip=(), partial=False):
+	''' retriedResultLines() of a job, with the results of its wave jobs (those in place, or with partial those landed so far) placed at their job sims '''
+
+	return placeJobResults(retriedResultLines(endtimes, length, skip, partial), readWaveMap(endtimes), skip, partial)
+
+def uncachedSims(kolist, wave):
+	''' Sims of a wave (combination indexes, sim = index + 1) without a result in OUTPUT_final/outcomecache.sqlite, those to simulate '''
+
+	kolines = readKoList(kolist)
+	with OutcomeCache() as cache:
+		return [index + 1 for index in wave if cache.get(kolines[index]) is None]
+
+def waveResults(kolist, endtimes, wave):
+	''' Results of a wave's combinations: simulated by the job or its wave jobs (stored in the outcome cache), or cached when it was submitted '''
+
+	kolines = readKoList(kolist)
+	result_list = wavedResultLines(endtimes, len(kolines))
+	results = []
+	with OutcomeCache() as cache:
+		for index in wave:
+			result = result_list[index]
+			if result != NO_RESULT:
+				cache.put(kolines[index], result, jobName(kolist), index + 1)
+			else:
+				result = cache.get(kolines[index]) or NO_RESULT
+			results.append(result)
+	return results
+
+def submitWave(kolist, explist, endtimes, sims):
+	''' Write and submit the next wave job of sims (ko.list, exp.list, bash scripts, a line of the wave map), its Wave '''
+
+	number = len(readWaveMap(endtimes)) + 2
+	# the map line first, so a wave run by the local backend is read back with the job
+	name = jobName(kolist) + WAVELABEL.format(number)
+	waveendtimes = os.path.join(os.path.dirname(endtimes), os.path.basename(endtimes)[:-len('_endtimes.txt')] + WAVELABEL.format(number) + '_endtimes.txt').replace('\\', '/')
+	wave = Wave(number, name, waveendtimes, sims)
+	with open(waveMapPath(endtimes), 'a', newline ='\n') as waves_txt:
+		waves_txt.write('{}\t{}\t{}\t{}\n'.format(number, name, waveendtimes, ' '.join(str(sim) for sim in sims)))
+	submitSims(WAVELABEL.format(number), kolist, explist, endtimes, sims)
+	return wave
@@ -0,0 +1,615 @@
+#!/usr/bin/env python
+
+# Affiliation: Life Sciences, University of Bristol
+# Last Updated: 2026-10-18
+
+"""
+In-memory Minesweeper: runs Stage 1 through Stage 4X without the intermediate text files the scripts pass between each other
+(gene_list.txt, nonessential.txt, alldivisionsegments.txt, *_combosandgenes.txt, *_eightsandgenes.txt).
+The state between stages is carried in a MinesweeperEngine object, and only a compact checkpoint (JSON, gene sets stored as bitmasks)
+is written at the end of each stage / round, into OUTPUT_final.
+The decisions made are the same as script_1.py - script_4X.py, simulations are run by a simulate(jobname, combos) callable,
+combos being (combination name, GeneSet) pairs in ko.list order, which returns one result line ('time\toutcome', or 'No_Result' for crashed sims) per combination.
+DemoReplay is such a callable, it replays the results of a completed Minesweeper folder (e.g. Minesweeper_0.9 DEMO Completed).
+Usage: python engine.py "../Minesweeper_0.9 DEMO Completed" [full / largest / level]  (eights search, see latticesearch.py)
+       python engine.py "../Minesweeper_0.9 DEMO Completed" full CHECKPOINTDIR  (checkpoints written to CHECKPOINTDIR, a run
+       stopped part way resumes from the latest checkpoint in it, see latestCheckpoint())
+"""
+
+# Imports
+from itertools import chain, combinations
+import fnmatch
+import json
+import os
+import sys
+import time
+from geneset import GeneSet, loadRegistry, parseGenes
+from simresults import resultLines
+from latticesearch import LatticeSearch
+from partition import adaptiveGroups, groupCount, partitionSlices
+from evidence import geneRisks
+from grouptesting import GroupTest, POOLNAME
+from runstate import laneIds
+from combofile import readComboFile
+from segments import SCHEDULE, compatibleSegments, disjointCombinations, segmentSlices, tableMatching
+
+# Global variables
+NAME = 'mine'
+CHECKPOINT = "engine_stage{}.json"
+CHECKPOINT_VERSION = 1
+# stages in run order, a Stage 4X checkpoint is named after its round (4X_3)
+STAGES = ['1', '2', '3', '4X']
+
+def dividedAndProducedProteinRNA(line):
+	''' Same check as the scripts: the cell divided, and produced both protein and RNA (two UP scores) '''
+
+	return line.endswith('Divided') and line.count('UP') == 2
+
+def powerset(iterable):
+	''' Powerset of the unique elements of iterable, in the order they first appear
+		e.g. [1,2,3]) --> () (1,) (2,) (3,) (1,2) (1,3) (2,3) (1,2,3) '''
+
+	s = list(dict.fromkeys(iterable))
+	return chain.from_iterable(combinations(s, r) for r in range(len(s)+1))
+
+class Lane:
+	''' One variant (lane of the beam, id red / yellow / blue / ..., see runstate.laneIds) of Stage 3 and Stage 4X '''
+
+	def __init__(self, id, board, registry):
+		self.id = id
+		self.board = board
+		# id of the lane it converged onto and was merged into
+		self.merged = None
+		self.round = 0
+		self.mode = 'eights'
+		self.finalround = False
+		self.finished = False
+		self.combos = []
+		self.results = []
+		self.deleted = registry.empty()
+		self.remaining = registry.empty()
+
+	def name(self):
+		return '{}_{}'.format(self.id, self.round)
+
+	def jobName(self):
+		if self.round == 0:
+			return '{}conquer_{}'.format(NAME, self.name())
+		return '{}gapko_{}'.format(NAME, self.name())
+
+class MinesweeperEngine:
+	''' Carries the Minesweeper state between stages in memory.
+		simulate(jobname, combos) -> list of result lines, one per (combination name, GeneSet) in combos.
+		width lanes (script_3.VARIANTS) are carried forward from Stage 3, mergelanes merges lanes that converge (script_4X.MERGELANES),
+		groups / arraysize set the groups of remaining genes per round (script_4X.GROUPS / ARRAYSIZE, see partition.py),
+		adaptivegroups sizes them by the essentiality evidence of the simulations so far (script_4X.ADAPTIVEGROUPS, see evidence.py),
+		grouptesting finds the appended single kos by group testing (script_4X.GROUPTESTING, see grouptesting.py),
+		schedule sets the deletion segments of Stage 2 (script_2.SCHEDULE, see segments.py),
+		disjointmatching matches the Stage 3 variants with every dividing segment they share no gene with, otherwise with those of them
+		the table segments.COMPONENTS lists (script_3.DISJOINTMATCHING),
+		resimulatedeletion simulates a combination equal to a lane's current deletion again rather than use the cache (script_4X.RESIMULATEDELETION). '''
+
+	def __init__(self, simulate, registry=None, exclusions=(), requireproteinrna=True, checkpointdir="OUTPUT_final", maxrounds=100, cache=None, eightssearch='full', width=3, mergelanes=True, groups=None, arraysize=None, adaptivegroups=False, grouptesting=False, schedule=SCHEDULE, disjointmatching=True, resimulatedeletion=True):
+		self.simulate = simulate
+		self.resimulatedeletion = resimulatedeletion
+		self.schedule = schedule
+		self.disjointmatching = disjointmatching
+		self.grouptesting = grouptesting
+		self.adaptivegroups = adaptivegroups
+		# (GeneSet, result line) of every simulated knockout set, the evidence of adaptivegroups
+		self.outcomes = []
+		self.groups = groups
+		self.arraysize = arraysize
+		self.width = width
+		self.mergelanes = mergelanes
+		self.cache = cache
+		self.eightssearch = eightssearch
+		self.registry = registry if registry is not None else loadRegistry()
+		self.exclusions = self.registry.geneSet(exclusions)
+		self.requireproteinrna = requireproteinrna
+		self.checkpointdir = checkpointdir
+		self.maxrounds = maxrounds
+		self.genes = list(self.registry.genes)
+		self.singleko = {}
+		self.nonessential = self.registry.empty()
+		self.segments = []
+		self.segmentresults = []
+		self.lanes = []
+		self.finalresults = {}
+		self.simulations = 0
+		self.timings = {}
+		self.stages = {}
+		# last checkpointed stage
+		self.stage = None
+
+	def divided(self, line):
+		if self.requireproteinrna:
+			return dividedAndProducedProteinRNA(line)
+		return line.endswith('Divided')
+
+	def run(self, after=None):
+		''' Stage 1 to Stage 4X, or the stages after the checkpoint after (e.g. '3', or '4X_3' to carry on with Stage 4X),
+			returns the final results {lane id: (deleted GeneSet, remaining GeneSet)} '''
+
+		functions = {'1': self.stageOne, '2': self.stageTwo, '3': self.stageThree, '4X': self.stageFourX}
+		start = 0
+		if after is not None:
+			stage = after.split('_')[0]
+			start = STAGES.index(stage) + (0 if stage == '4X' else 1)
+		for stage in STAGES[start:]:
+			self.staged(stage, functions[stage])
+		return self.finalresults
+
+	def resume(self):
+		''' Carry on from the checkpoint this engine was restored from (see loadCheckpoint()) '''
+
+		return self.run(after=self.stage)
+
+	def staged(self, stage, function):
+		''' Run a stage, recording its wall time and the simulations it requested in self.stages '''
+
+		start = time.perf_counter()
+		simulations = self.simulations
+		function()
+		self.stages[stage] = {'seconds': time.perf_counter() - start, 'simulations': self.simulations - simulations}
+
+	def submit(self, jobname, combos, resimulate=None):
+		''' Results of one job, 'No_Result' for sims the simulator did not return.
+			With an OutcomeCache, blank combinations and knockout sets with a known outcome are not simulated,
+			and a knockout set repeated in the job is simulated once. The knockout set resimulate (a lane's current deletion)
+			is simulated even if its outcome is known, the new result replacing the cached one. '''
+
+		start = time.process_time()
+		results = ['No_Result'] * len(combos)
+		tosimulate = list(range(len(combos)))
+		firsts = {}
+		if self.cache is not None:
+			tosimulate = []
+			for index, (combo, geneset) in enumerate(combos):
+				if not geneset:
+					continue
+				if geneset == resimulate and geneset.mask not in firsts:
+					self.cache.expire(geneset)
+				known = self.cache.get(geneset)
+				if known is not None:
+					results[index] = known
+				elif geneset.mask not in firsts:
+					firsts[geneset.mask] = index
+					tosimulate.append(index)
+		self.simulations = self.simulations + len(tosimulate)
+		simulating = time.process_time()
+		simulated = list(self.simulate(jobname, [combos[index] for index in tosimulate]))
+		simulating = time.process_time() - simulating
+		self.addTiming('simulate', simulating)
+		for index, result in zip(tosimulate, simulated):
+			results[index] = result
+			if combos[index][1] and result != 'No_Result':
+				self.outcomes.append((combos[index][1], result))
+		if self.cache is not None:
+			for index in tosimulate:
+				self.cache.put(combos[index][1], results[index], jobname, index + 1)
+			for index, (combo, geneset) in enumerate(combos):
+				if results[index] == 'No_Result' and geneset.mask in firsts:
+					results[index] = results[firsts[geneset.mask]]
+		# job creation only (the engine's createScripts), the simulator's own time is under 'simulate'
+		self.addTiming('submit', time.process_time() - start - simulating)
+		return results
+
+	def timed(self, function, *args):
+		start = time.process_time()
+		value = function(*args)
+		self.addTiming(function.__name__, time.process_time() - start)
+		return value
+
+	def addTiming(self, name, seconds):
+		''' CPU time per function, in self.timings '''
+
+		self.timings[name] = self.timings.get(name, 0) + seconds
+
+	### Stage 1
+
+	def stageOne(self):
+		''' Single gene knockouts of every gene in the registry (script_1.py) '''
+
+		results = self.submit(NAME + 'inputko', [(gene, self.registry.geneSet([gene])) for gene in self.genes])
+		self.singleko = dict(zip(self.genes, results))
+		self.checkpoint('1')
+
+	### Stage 2
+
+	def stageTwo(self):
+		''' Non essential genes and the deletion segments of the schedule (script_2.py) '''
+
+		nonessential = [gene for gene in self.genes if self.divided(self.singleko.get(gene, 'No_Result'))]
+		self.nonessential = self.registry.geneSet(nonessential) - self.exclusions
+		genes = list(self.nonessential)
+		self.segments = []
+		for code, start, end in segmentSlices(len(genes), self.schedule):
+			self.segments.append((code, self.registry.geneSet(genes[start:end])))
+		self.segmentresults = self.submit(NAME + 'divide', self.segments)
+		self.checkpoint('2')
+
+	### Stage 3
+
+	def stageThree(self):
+		''' Variants (width largest dividing segments) matched with allowed dividing segments (script_3.py) '''
+
+		success = [(code, geneset) for (code, geneset), result in zip(self.segments, self.segmentresults) if self.divided(result)]
+		boards = dict(success)
+		table = not self.disjointmatching and tableMatching([code for code, geneset in self.segments])
+		self.lanes = []
+		for id, (code, geneset) in zip(laneIds(self.width), success[:self.width]):
+			lane = Lane(id, code, self.registry)
+			self.lanes.append(lane)
+			if code == '100':
+				# all non essential genes deleted, Minesweeper is finished
+				self.lanes = [lane]
+				self.finish(lane, geneset, self.registry.empty())
+				break
+			elif code in ('90a', '90b'):
+				# already removed 90% of the genes, carry forward one variant (red) without simulating combinations:
+				# its only combination is the segment itself, whose result is the one the simulator gave it in Stage 2
+				self.lanes = [lane]
+				lane.combos = [('', self.registry.empty()), (code, geneset)]
+				lane.results = ['No_Result', dict(zip((code for code, geneset in self.segments), self.segmentresults))[code]]
+				break
+			combos = disjointCombinations(compatibleSegments(code, boards, table), boards)
+			lane.combos = [(' '.join(combo), self.unionOf(boards[item] for item in combo)) for combo in combos]
+		for lane in self.lanes:
+			if not lane.finished and not lane.results:
+				lane.results = self.submit(lane.jobName(), lane.combos)
+		self.checkpoint('3')
+
+	def unionOf(self, genesets):
+		combined = self.registry.empty()
+		for geneset in genesets:
+			combined = combined | geneset
+		return combined
+
+	### Stage 4X
+
+	def stageFourX(self):
+		''' Rounds of eights / appended single knockouts until every variant is finished (script_4X.py) '''
+
+		while any(not lane.finished and lane.merged is None for lane in self.lanes):
+			active = [lane for lane in self.lanes if not lane.finished and lane.merged is None]
+			if active[0].round >= self.maxrounds:
+				break
+			dividing = self.timed(self.interpretResults, active)
+			self.timed(self.remainingGenes, active, dividing)
+			if self.mergelanes:
+				active, dividing = self.mergeLanes(active, dividing)
+			self.timed(self.endingDecision, active, dividing)
+			for lane in active:
+				if lane.finished:
+					continue
+				if lane.mode == 'eights' and self.eightssearch != 'full':
+					lane.results = self.searchEights(lane)
+				elif lane.mode == 'singleko' and self.grouptesting:
+					lane.results = self.groupTest(lane)
+				else:
+					lane.results = self.submit(lane.jobName(), lane.combos, self.ownDeletion(lane))
+			self.checkpoint('4X_{}'.format(active[0].round))
+
+	def ownDeletion(self, lane):
+		''' The knockout set a lane's round resimulates rather than take from the cache, its current deletion (resimulatedeletion) '''
+
+		return lane.deleted if self.resimulatedeletion else None
+
+	def interpretResults(self, lanes):
+		''' Dividing combinations of each lane's last round, skipping the blank combination (duplicate wildtype, sim 1) '''
+
+		dividing = []
+		for lane in lanes:
+			dividing.append([(combo, geneset) for index, ((combo, geneset), result) in enumerate(zip(lane.combos, lane.results))
+				if index > 0 and self.divided(result)])
+		return dividing
+
+	def remainingGenes(self, lanes, dividing):
+		''' New deleted / remaining genes of each lane, as script_4X.remainingGenes() '''
+
+		for lane, divided in zip(lanes, dividing):
+			if not divided:
+				if lane.round == 0:
+					# the variant's own segment divided in Stage 2
+					lane.deleted = self.nonessential & dict(self.segments)[lane.board]
+					lane.remaining = self.nonessential - lane.deleted
+				continue
+			if lane.mode == 'singleko':
+				# remaining genes = the appended single kos that still divided, the rest are temporarily excluded
+				lane.remaining = self.registry.geneSet(combo for combo, geneset in divided)
+				continue
+			bestresult = None
+			longestlength = 0
+			for combo, geneset in divided:
+				if len(geneset) > longestlength:
+					bestresult = geneset
+					longestlength = len(geneset)
+			lane.deleted = self.nonessential & bestresult
+			lane.remaining = self.nonessential - lane.deleted
+
+	def mergeLanes(self, lanes, dividing):
+		''' Lanes with the same deleted / remaining genes and next step as an earlier lane are merged into it, as script_4X.convergedVariants().
+			Returns the lanes that carry on, and their dividing combinations. '''
+
+		firsts = {}
+		carryon = []
+		for lane, divided in zip(lanes, dividing):
+			key = (lane.mode, lane.finalround, not divided, lane.deleted.mask, lane.remaining.mask)
+			if key not in firsts:
+				firsts[key] = lane
+				carryon.append((lane, divided))
+				continue
+			lane.merged = firsts[key].id
+			for other in self.lanes:
+				if other.merged == lane.id:
+					other.merged = lane.merged
+		return [lane for lane, divided in carryon], [divided for lane, divided in carryon]
+
+	def endingDecision(self, lanes, dividing):
+		''' Next round (eights / appended single kos / final round) or final result of each lane, as script_4X.endingDecision() '''
+
+		for lane, divided in zip(lanes, dividing):
+			counter = len(divided)
+			if lane.finalround:
+				self.finish(lane, lane.deleted, lane.remaining)
+				continue
+			elif lane.mode == 'singleko' and counter == 0:
+				self.finish(lane, lane.deleted, lane.remaining)
+				continue
+			elif lane.mode != 'singleko' and counter == 0:
+				lane.mode = 'singleko'
+				lane.round = lane.round + 1
+				lane.combos = [('', self.registry.empty())]
+				lane.combos.extend((gene, lane.deleted | self.registry.geneSet([gene])) for gene in lane.remaining)
+			else:
+				lane.mode = 'eights'
+				if len(lane.remaining) <= groupCount(self.groups, self.arraysize):
+					lane.finalround = True
+				lane.round = lane.round + 1
+				lane.combos = self.timed(self.eightPanelGroupingsGeneration, lane.remaining, lane.deleted)
+
+	def eightPanelGroupingsGeneration(self, remaining, deleted):
+		''' Powerset of the groups of remaining genes (eight by default), each appended to the current deletion (blank combination first) '''
+
+		genes = list(remaining)
+		if self.adaptivegroups:
+			risks = geneRisks(remaining, deleted, self.outcomes)
+			genegroups = adaptiveGroups(genes, [risks[gene] for gene in genes], groupCount(self.groups, self.arraysize))
+		else:
+			genegroups = [genes[start:end] for start, end in partitionSlices(len(genes), self.groups, self.arraysize)]
+		groups = [(str(x + 1), self.registry.geneSet(genegroup)) for x, genegroup in enumerate(genegroups)]
+		groupsets = dict(groups)
+		combos = []
+		for combo in powerset(name for name, geneset in groups):
+			if not combo:
+				combos.append(('', self.registry.empty()))
+				continue
+			combos.append((' '.join(combo), deleted | self.unionOf(groupsets[name] for name in combo)))
+		return combos
+
+	def searchEights(self, lane):
+		''' Eights round in waves (latticesearch.py, eightssearch = 'largest' / 'level'), only the combinations
+			the search asks for are simulated, the rest are labelled Inferred_Viable / Inferred_Lethal / Pruned '''
+
+		search = LatticeSearch(lane.combos, self.eightssearch)
+		results = [None] * len(lane.combos)
+		wave = search.nextWave()
+		while wave:
+			waveresults = self.submit(lane.jobName(), [lane.combos[index] for index in wave], self.ownDeletion(lane))
+			for index, result in zip(wave, waveresults):
+				results[index] = result
+			search.record(wave, [self.divided(result) for result in waveresults])
+			wave = search.nextWave()
+		return [result if result is not None else search.label(index) for index, result in enumerate(results)]
+
+	def groupTest(self, lane):
+		''' Appended single kos in waves of pools (grouptesting.py), script_4X.py runs one wave per round.
+			Each gene's result line is the result of the pool that resolved it, so the round is interpreted as single kos. '''
+
+		# each single group of the last round failed, so expect at least one conditionally essential gene per group
+		search = GroupTest([combo for combo, geneset in lane.combos[1:]], groupCount(self.groups, self.arraysize))
+		resolved = {}
+		wave = search.nextWave()
+		while wave:
+			pools = [(POOLNAME.format(x), lane.deleted | self.registry.geneSet(pool)) for x, pool in enumerate(wave, 1)]
+			waveresults = self.submit(lane.jobName(), pools)
+			for pool, result in zip(wave, waveresults):
+				for gene in pool:
+					resolved[gene] = result
+			search.record(wave, [self.divided(result) for result in waveresults])
+			wave = search.nextWave()
+		return ['No_Result'] + [resolved.get(combo, 'No_Result') for combo, geneset in lane.combos[1:]]
+
+	def finish(self, lane, deleted, remaining):
+		lane.finished = True
+		self.finalresults[lane.id] = (deleted, remaining)
+		# lanes merged into it finish with its result
+		for other in self.lanes:
+			if other.merged == lane.id:
+				other.finished = True
+				self.finalresults[other.id] = (deleted, remaining)
+
+	### Checkpoints
+
+	def state(self):
+		''' Compact, JSON serialisable state, gene sets stored as hex bitmasks over the registry gene list '''
+
+		def mask(geneset):
+			return format(geneset.mask, 'x')
+
+		return {
+			'version': CHECKPOINT_VERSION,
+			'stage': self.stage,
+			'genes': self.registry.genes,
+			'requireproteinrna': self.requireproteinrna,
+			'simulations': self.simulations,
+			'singleko': [self.singleko.get(gene, 'No_Result') for gene in self.genes],
+			'exclusions': mask(self.exclusions),
+			'nonessential': mask(self.nonessential),
+			'segments': [[code, mask(geneset)] for code, geneset in self.segments],
+			'segmentresults': self.segmentresults,
+			'lanes': [{'id': lane.id, 'board': lane.board, 'round': lane.round, 'mode': lane.mode, 'merged': lane.merged,
+				'finalround': lane.finalround, 'finished': lane.finished, 'deleted': mask(lane.deleted), 'remaining': mask(lane.remaining),
+				'combos': [[combo, mask(geneset)] for combo, geneset in lane.combos], 'results': lane.results} for lane in self.lanes],
+			'finalresults': {id: [mask(deleted), mask(remaining)] for id, (deleted, remaining) in self.finalresults.items()},
+			}
+
+	def restore(self, state):
+		''' Reload a state() / checkpoint into this engine, ValueError for a state of another version '''
+
+		if state.get('version') != CHECKPOINT_VERSION:
+			raise ValueError('Checkpoint is version {}, expected version {}'.format(state.get('version'), CHECKPOINT_VERSION))
+		for gene in state['genes']:
+			self.registry.index(gene)
+
+		def geneset(value):
+			return GeneSet(self.registry, int(value, 16))
+
+		self.genes = list(state['genes'])
+		self.stage = state['stage']
+		self.requireproteinrna = state['requireproteinrna']
+		self.simulations = state['simulations']
+		self.singleko = dict(zip(self.genes, state['singleko']))
+		self.exclusions = geneset(state['exclusions'])
+		self.nonessential = geneset(state['nonessential'])
+		self.segments = [(code, geneset(value)) for code, value in state['segments']]
+		self.segmentresults = state['segmentresults']
+		self.lanes = []
+		for values in state['lanes']:
+			lane = Lane(values['id'], values['board'], self.registry)
+			lane.merged = values['merged']
+			lane.round = values['round']
+			lane.mode = values['mode']
+			lane.finalround = values['finalround']
+			lane.finished = values['finished']
+			lane.deleted = geneset(values['deleted'])
+			lane.remaining = geneset(values['remaining'])
+			lane.combos = [(combo, geneset(value)) for combo, value in values['combos']]
+			lane.results = values['results']
+			self.lanes.append(lane)
+		self.finalresults = {id: (geneset(deleted), geneset(remaining)) for id, (deleted, remaining) in state['finalresults'].items()}
+
+	def checkpoint(self, stage):
+		''' Persist the state at the end of a stage / round, one write per stage '''
+
+		self.stage = stage
+		if self.checkpointdir is None:
+			return
+		checkpoint = os.path.join(self.checkpointdir, CHECKPOINT.format(stage))
+		with open(checkpoint, 'w', newline ='\n') as checkpoint_txt:
+			json.dump(self.state(), checkpoint_txt, separators=(',', ':'))
+
+def loadCheckpoint(checkpoint, simulate, **options):
+	''' MinesweeperEngine restored from a checkpoint file written by MinesweeperEngine.checkpoint() '''
+
+	with open(checkpoint) as checkpoint_txt:
+		state = json.load(checkpoint_txt)
+	engine = MinesweeperEngine(simulate, **options)
+	engine.restore(state)
+	return engine
+
+class DemoReplay:
+	''' simulate() callable that replays the simulation results of a completed Minesweeper folder.
+		Results are looked up by job (e.g. minegapko_red_3) and combination name (in any order, so the replay does not depend
+		on powerset order), then by knockout set in any job. Sim 1 of each combination file is skipped, as in
+		script_4X.interpretResults() (duplicate wildtype). Knockout sets that were never simulated return 'No_Result'. '''
+
+	def __init__(self, folder, registry):
+		self.folder = folder
+		self.registry = registry
+		self.outcomes = {}
+		self.jobs = {}
+		self.exclusions = []
+		self.loadStageOne()
+		self.loadStageTwo()
+		self.loadComboFiles("OUTPUT_script_3", "{}conquer_{}", "_combosandgenes.txt", "INPUT_script_4X/conquerko_{}_endtimes.txt")
+		self.loadComboFiles("OUTPUT_script_4X", "{}gapko_{}", "_eightsandgenes.txt", "INPUT_script_4X/gapko_{}_endtimes.txt")
+
+	def path(self, *parts):
+		return os.path.join(self.folder, *parts)
+
+	def record(self, job, combo, geneset, result):
+		if geneset:
+			self.outcomes.setdefault(geneset.mask, result)
+			self.jobs.setdefault(job, {})[frozenset(combo.split())] = result
+
+	def loadStageOne(self):
+		with open(self.path("OUTPUT_script_1/gene_list.txt")) as gene_list_txt:
+			genes = [line.strip() for line in gene_list_txt if line.strip()]
+		results = []
+		endtimes = sorted(fnmatch.filter(os.listdir(self.path("INPUT_script_2")), 'inputko*_endtimes.txt'))
+		for n in range(1, len(endtimes) + 1):
+			with open(self.path("OUTPUT_script_1/mineinputko{}_exp.list".format(n))) as exp:
+				length = sum(1 for line in exp)
+			results.extend(resultLines(self.path("INPUT_script_2/inputko{}_endtimes.txt".format(n)), length)[:-2])
+		for gene, result in zip(genes, results):
+			self.record(NAME + 'inputko', gene, self.registry.parse(gene), result)
+		exclusionlist = self.path("INPUT_script_2/exclusionlist.txt")
+		if os.path.isfile(exclusionlist):
+			with open(exclusionlist) as exclusion_txt:
+				self.exclusions = parseGenes(exclusion_txt.read())
+
+	def loadStageTwo(self):
+		with open(self.path("OUTPUT_script_2/alldivisionsegments.txt")) as segments_txt:
+			lines = [line.strip() for line in segments_txt if line.strip()]
+		# code line followed by genes line
+		segments = [(code, self.registry.parse(genes)) for code, genes in zip(lines[0::2], lines[1::2])]
+		results = resultLines(self.path("INPUT_script_3/divideko_endtimes.txt"), len(segments))
+		for (code, geneset), result in zip(segments, results):
+			self.record(NAME + 'divide', code, geneset, result)
+
+	def loadComboFiles(self, folder, job, suffix, endtimes):
+		for combofile in sorted(fnmatch.filter(os.listdir(self.path(folder)), '*' + suffix)):
+			name = combofile[:-len(suffix)]
+			endtimes_txt = self.path(endtimes.format(name))
+			if not os.path.isfile(endtimes_txt):
+				continue
+			combos = readComboFile(self.path(folder, combofile))
+			combos = [(combo, combos.genes(combo)) for combo in combos.names()]
+			results = resultLines(endtimes_txt, len(combos))
+			for (combo, genes), result in list(zip(combos, results))[1:]:
+				self.record(job.format(NAME, name), combo, self.registry.parse(genes), result)
+
+	def __call__(self, jobname, combos):
+		job = self.jobs.get(jobname, {})
+		return [job.get(frozenset(combo.split()), self.outcomes.get(geneset.mask, 'No_Result')) for combo, geneset in combos]
+
+def latestCheckpoint(checkpointdir):
+	''' Path of the last checkpoint written to checkpointdir (Stage 4X by round, then Stage 3, 2, 1), None if there is none '''
+
+	if not os.path.isdir(checkpointdir):
+		return None
+	stages = []
+	for checkpoint in fnmatch.filter(os.listdir(checkpointdir), CHECKPOINT.format('*')):
+		stage = checkpoint[len(CHECKPOINT.split('{}')[0]):-len(CHECKPOINT.split('{}')[1])]
+		name, underscore, round = stage.partition('_')
+		if name in STAGES and (not round or round.isdigit()):
+			stages.append((STAGES.index(name), int(round or 0), checkpoint))
+	if not stages:
+		return None
+	return os.path.join(checkpointdir, max(stages)[2])
+
+def main():
+	folder = sys.argv[1] if len(sys.argv) > 1 else '.'
+	eightssearch = sys.argv[2] if len(sys.argv) > 2 else 'full'
+	checkpointdir = sys.argv[3] if len(sys.argv) > 3 else None
+	start = time.perf_counter()
+	registry = loadRegistry(os.path.join(folder, "INPUT_script_1/genes.txt"))
+	replay = DemoReplay(folder, registry)
+	loaded = time.perf_counter()
+	checkpoint = latestCheckpoint(checkpointdir) if checkpointdir else None
+	if checkpoint:
+		engine = loadCheckpoint(checkpoint, replay, registry=registry, checkpointdir=checkpointdir, eightssearch=eightssearch)
+		print(f'Resuming after {checkpoint}.')
+		finalresults = engine.resume()
+	else:
+		engine = MinesweeperEngine(replay, registry=registry, exclusions=replay.exclusions, requireproteinrna=False, checkpointdir=checkpointdir, eightssearch=eightssearch)
+		finalresults = engine.run()
+	finished = time.perf_counter()
+	for id, (deleted, remaining) in finalresults.items():
+		print(f'{id} deleted {len(deleted)} genes, did not delete {remaining.tokens()}')
+	print(f'\n{engine.simulations} simulations requested. Loaded results in {(loaded - start)*1000:.1f} ms, replayed Stage 1 - 4X in {(finished - loaded)*1000:.1f} ms.')
+
+if __name__ == '__main__':
+	main()
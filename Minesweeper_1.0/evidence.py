@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+
+# Affiliation: Life Sciences, University of Bristol
+# Last Updated: 2026-10-18
+
+"""
+Essentiality evidence for the adaptive groups of a Stage 4X round (script_4X.ADAPTIVEGROUPS, engine.py adaptivegroups=True).
+Every knockout set simulated so far (OUTPUT_final/outcomecache.sqlite, or the engine's own results) scores the remaining genes:
+	lethal set   - the set minus the current deletion holds the culprit, each of its genes is blamed an equal share
+	dividing set - each of its genes is viable together with the rest of the set
+	single ko    - the end time of a gene's Stage 1 single knockout, slower division (relative to the other remaining genes) = riskier
+risk = (blame + slowness) / (blame + viable + 1), between 0 (no lethal evidence) and 1.
+partition.adaptiveGroups() then packs low risk genes into large groups and isolates high risk genes in small ones.
+"""
+
+# Imports
+import os
+from outcomecache import OUTCOMECACHE, OutcomeCache
+
+def divided(result):
+	''' Whether a result line (end time, tab, outcome) divided, the Protein / RNA scores do not matter for lethality '''
+
+	return result.rstrip().endswith('Divided')
+
+def endTime(result):
+	try:
+		return float(result.split('\t')[0])
+	except ValueError:
+		return None
+
+def geneRisks(remaining, deleted, outcomes):
+	''' {gene: risk} of the remaining genes (GeneSet) of a variant with deletion deleted (GeneSet),
+		from outcomes = (GeneSet, result line) pairs of the knockout sets simulated so far '''
+
+	blame = dict.fromkeys(remaining, 0.0)
+	viable = dict.fromkeys(remaining, 0)
+	endtimes = {}
+	for geneset, result in outcomes:
+		candidates = geneset & remaining
+		if not candidates:
+			continue
+		if len(geneset) == 1:
+			# Stage 1 single knockout
+			if divided(result):
+				endtimes[next(iter(geneset))] = endTime(result)
+			continue
+		if divided(result):
+			for gene in candidates:
+				viable[gene] = viable[gene] + 1
+		else:
+			suspects = geneset - deleted
+			share = 1 / len(suspects)
+			for gene in candidates:
+				blame[gene] = blame[gene] + share
+
+	times = [time for time in endtimes.values() if time is not None]
+	fastest = min(times, default=0)
+	spread = max(times, default=0) - fastest
+	risks = {}
+	for gene in remaining:
+		slowness = 0.0
+		if spread and endtimes.get(gene) is not None:
+			slowness = (endtimes[gene] - fastest) / spread
+		risks[gene] = (blame[gene] + slowness) / (blame[gene] + viable[gene] + 1)
+	return risks
+
+def cachedOutcomes(registry, outcomecache=OUTCOMECACHE):
+	''' (GeneSet, result line) of every knockout set with a result in the outcome cache, [] without a cache '''
+
+	if not os.path.isfile(outcomecache):
+		return []
+	with OutcomeCache(outcomecache) as cache:
+		return [(registry.geneSet(key.split()), result) for key, result in cache.results()]
@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+
+# Affiliation: Life Sciences, University of Bristol
+# Last Updated: 2026-10-18
+
+"""
+GeneSet: an immutable set of gene codes stored as an integer bitmask over an indexed gene registry.
+Shared by all four stages so that knockout sets can be combined and compared without re-splitting 'MG_XXX', strings.
+The registry is built from INPUT_script_1/genes.txt (one gene per line, in format MG_XXX), each gene's line number is its bit.
+Union / difference / intersection / subset tests are single integer operations, and rendering back to the ko.list token format
+('MG_001', 'MG_003', ) always follows registry order, so the same set always produces the same line.
+"""
+
+# Imports
+import re
+import os
+
+# Global variables
+GENES_TXT = "INPUT_script_1/genes.txt"
+# anything that is not whitespace, a quote or a comma, i.e. 'MG_009', -> MG_009
+GENE_TOKEN = re.compile(r"[^\s',]+")
+
+def normaliseGene(token):
+	''' Strip the ko.list formatting from a single gene token, e.g. "'MG_009'," -> "MG_009" '''
+
+	return token.strip().strip(",").strip("'")
+
+def parseGenes(text):
+	''' Split any ko.list / remaininggenes / deletedgenes style text into a list of bare gene codes (duplicates kept, in order) '''
+
+	return GENE_TOKEN.findall(text)
+
+class GeneRegistry:
+	''' Ordered index of gene codes, the position of each gene is its bit in a GeneSet mask.
+		Genes not in the registry are appended (given the next bit) the first time they are seen,
+		so existing masks stay valid as the registry grows. '''
+
+	def __init__(self, genes=()):
+		self.genes = []
+		self.positions = {}
+		for gene in genes:
+			self.index(gene)
+
+	def __len__(self):
+		return len(self.genes)
+
+	def __contains__(self, gene):
+		return normaliseGene(gene) in self.positions
+
+	def index(self, gene):
+		''' Bit position of a gene, registering it if it is new '''
+
+		gene = normaliseGene(gene)
+		position = self.positions.get(gene)
+		if position is None:
+			position = len(self.genes)
+			self.genes.append(gene)
+			self.positions[gene] = position
+		return position
+
+	def empty(self):
+		return GeneSet(self, 0)
+
+	def geneSet(self, genes):
+		''' GeneSet from an iterable of gene codes (bare or in 'MG_XXX', format) '''
+
+		mask = 0
+		for gene in genes:
+			if not gene.strip():
+				continue
+			mask |= 1 << self.index(gene)
+		return GeneSet(self, mask)
+
+	def parse(self, text):
+		''' GeneSet from ko.list style text, e.g. "'MG_009', 'MG_012', " '''
+
+		return self.geneSet(parseGenes(text))
+
+	def full(self):
+		return GeneSet(self, (1 << len(self.genes)) - 1)
+
+def loadRegistry(genes_txt=GENES_TXT):
+	''' Build a GeneRegistry from genes.txt (one gene per line, MG_XXX or 'MG_XXX', format).
+		If the file is missing an empty registry is returned, which registers genes as they are parsed. '''
+
+	registry = GeneRegistry()
+	if os.path.isfile(genes_txt):
+		with open(genes_txt) as given_genes:
+			for line in given_genes:
+				for gene in parseGenes(line):
+					registry.index(gene)
+	return registry
+
+class GeneSet:
+	''' Immutable set of genes, backed by an integer bitmask over a GeneRegistry.
+		Iterates, and renders, in registry (i.e. genes.txt) order. '''
+
+	__slots__ = ('registry', 'mask')
+
+	def __init__(self, registry, mask=0):
+		object.__setattr__(self, 'registry', registry)
+		object.__setattr__(self, 'mask', mask)
+
+	def __setattr__(self, name, value):
+		raise AttributeError('GeneSet is immutable')
+
+	def _other(self, other):
+		if other.registry is not self.registry:
+			raise ValueError('GeneSets come from different gene registries')
+		return other.mask
+
+	def __or__(self, other):
+		return GeneSet(self.registry, self.mask | self._other(other))
+
+	def __and__(self, other):
+		return GeneSet(self.registry, self.mask & self._other(other))
+
+	def __sub__(self, other):
+		return GeneSet(self.registry, self.mask & ~self._other(other))
+
+	def __xor__(self, other):
+		return GeneSet(self.registry, self.mask ^ self._other(other))
+
+	union = __or__
+	intersection = __and__
+	difference = __sub__
+
+	def __le__(self, other):
+		return self.mask & ~self._other(other) == 0
+
+	def __lt__(self, other):
+		return self <= other and self.mask != other.mask
+
+	def __ge__(self, other):
+		return other <= self
+
+	def __gt__(self, other):
+		return other < self
+
+	issubset = __le__
+	issuperset = __ge__
+
+	def isdisjoint(self, other):
+		return self.mask & self._other(other) == 0
+
+	def __eq__(self, other):
+		if not isinstance(other, GeneSet):
+			return NotImplemented
+		return self.registry is other.registry and self.mask == other.mask
+
+	def __hash__(self):
+		return hash(self.mask)
+
+	def __len__(self):
+		return bin(self.mask).count('1')
+
+	def __bool__(self):
+		return self.mask != 0
+
+	def __contains__(self, gene):
+		position = self.registry.positions.get(normaliseGene(gene))
+		if position is None:
+			return False
+		return (self.mask >> position) & 1 == 1
+
+	def __iter__(self):
+		genes = self.registry.genes
+		mask = self.mask
+		while mask:
+			lowest = mask & -mask
+			yield genes[lowest.bit_length() - 1]
+			mask ^= lowest
+
+	def __repr__(self):
+		return 'GeneSet({})'.format(list(self))
+
+	def tokens(self):
+		''' Genes in the token format used by remaininggenes / deletedgenes lists, e.g. ["'MG_009',", "'MG_012',"] '''
+
+		return ["'{}',".format(gene) for gene in self]
+
+	def toKoLine(self):
+		''' Render in ko.list format, e.g. "'MG_009', 'MG_012', " (registry order, trailing space as in the stage files) '''
+
+		return ''.join("'{}', ".format(gene) for gene in self)
+
+	def canonical(self):
+		''' Registry independent key: sorted gene codes joined by spaces '''
+
+		return ' '.join(sorted(self))
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+
+# Affiliation: Life Sciences, University of Bristol
+# Last Updated: 2026-10-18
+
+"""
+Group testing search for the appended single ko round of Stage 4X, instead of appending every remaining gene singly to the largest
+deletion (one simulation per remaining gene). The remaining genes are appended in pools, and pools are split in waves (binary splitting):
+	dividing pool - every gene of the pool can be appended to the largest deletion (and still divide)
+	lethal pool   - holds at least one conditionally essential gene, both halves are simulated in the next wave
+	lethal gene   - a pool of one gene that does not divide, the gene is temporarily excluded (as a non dividing single ko)
+The first pools hold 2^floor(log2((n - d + 1) / d)) genes (Hwang's generalised binary splitting), d being the expected number of
+conditionally essential genes among the n remaining genes, so the search takes about n / s + 2 * d * log2(s) simulations (s = the
+first pool size) instead of n, in log2(s) + 1 waves. A pool that only fails together (a synthetic lethal pair split between its halves)
+leaves both halves dividing, and its genes are viable singly, as an appended single ko round would find.
+Used by script_4X.py (GROUPTESTING, one wave per round) and engine.py (grouptesting=True, the waves of one round).
+"""
+
+# Global variables
+POOLNAME = 'pool{}'
+
+def poolSize(genes, defectives):
+	''' Genes per first wave pool, for genes remaining genes with about defectives conditionally essential genes '''
+
+	defectives = max(1, min(defectives, genes))
+	return 2 ** max(0, ((genes - defectives + 1) // defectives).bit_length() - 1)
+
+class GroupTest:
+	''' Waves of pools to simulate for one appended single ko round.
+		genes are the remaining genes (names, in order), defectives the expected number of conditionally essential genes among them. '''
+
+	def __init__(self, genes, defectives=1):
+		self.genes = list(dict.fromkeys(genes))
+		# gene -> True (appended and divided) / False (appended singly and did not divide), unknown genes are not in it
+		self.viable = {}
+		size = poolSize(len(self.genes), defectives)
+		self.pending = [self.genes[start:start + size] for start in range(0, len(self.genes), size)]
+		self.waves = 0
+		self.simulations = 0
+
+	def nextWave(self):
+		''' Pools to simulate next (lists of genes), [] when the search is finished '''
+
+		return self.pending
+
+	def record(self, pools, divides):
+		''' Results of a wave, the lethal pools (of more than one gene) are split in halves for the next wave '''
+
+		self.pending = []
+		if pools:
+			self.waves = self.waves + 1
+		for pool, divided in zip(pools, divides):
+			self.simulations = self.simulations + 1
+			if divided or len(pool) == 1:
+				for gene in pool:
+					self.viable[gene] = bool(divided)
+				continue
+			half = (len(pool) + 1) // 2
+			self.pending.extend([pool[:half], pool[half:]])
+
+	def finished(self):
+		return not self.pending
+
+	def dividing(self):
+		''' Genes that divided when appended to the largest deletion, in order '''
+
+		return [gene for gene in self.genes if self.viable.get(gene)]
+
+	def lethal(self):
+		''' Genes that did not divide when appended singly to the largest deletion, in order '''
+
+		return [gene for gene in self.genes if self.viable.get(gene) is False]
+
+	def state(self):
+		''' JSON serialisable state, between the waves (rounds) of script_4X.py '''
+
+		return {'genes': self.genes, 'viable': self.viable, 'pending': self.pending, 'waves': self.waves, 'simulations': self.simulations}
+
+def loadGroupTest(state):
+	''' GroupTest from a GroupTest.state() '''
+
+	grouptest = GroupTest([])
+	grouptest.genes = state['genes']
+	grouptest.viable = state['viable']
+	grouptest.pending = state['pending']
+	grouptest.waves = state['waves']
+	grouptest.simulations = state['simulations']
+	return grouptest
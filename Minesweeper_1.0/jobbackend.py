@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+
+# Affiliation: Life Sciences, University of Bristol
+# Last Updated: 2026-10-18
+
+"""
+Job backends used by every createScripts() once the bash script, ko.list and exp.list of a job are written.
+Chosen in INPUT_script_1/backend.txt (tab separated, like user_input.txt), Slurm if the file is missing:
+	BACKEND		slurm, local or dryrun
+	SIMULATOR	(local) command run once per ko.list line, {sim} {experiment} {genes} {seed} are replaced, e.g. python mysim.py {genes} {seed}
+			(with PACK, {batch} {results}). Only these placeholders are replaced, any other braces (a MATLAB cell {...},
+			an awk '{print $1}') are passed to the simulator as they are
+	WORKERS		(local) number of simulations run at the same time, default all cores
+	PACK		sims simulated one after another by one array task (templatescript/TemplatePackedScript.sh, one MATLAB session per task)
+			or by one run of a local SIMULATOR command with {batch}, default 1 (one sim per task / run, as before), see arraypacks.py
+	MAXARRAYSIZE, THROTTLE	array limits of the cluster, see arraychunks.py
+	RETRIES		retry jobs for the crashed sims of a job, default 0, see simretry.py
+slurm  - the bash script is submitted by hand on the supercomputer (sbatch), as before
+local  - the simulator command is run for every sim of the array on this machine, its output (end time and outcome, on one line
+         separated by a tab or on two lines) is written as a two line record to the endtimes.txt the next stage expects, in finishing order.
+         Sims that exit with an error or print nothing are left out, like crashed sims on the supercomputer.
+         With PACK and {batch} {results} in the command, it is run once per PACK sims: {batch} a file of their ko.list lines (sim, experiment,
+         genes and seed, tab separated), {results} a folder the simulator writes each sim's output to, as <sim>.txt. A sim without its file
+         crashed. Every sim still gets its own record.
+dryrun - nothing is run, the sims that would be simulated are reported
+"""
+
+# Imports
+import os
+import shlex
+import subprocess
+import tempfile
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from outcomecache import arraySims, readKoList
+from runlog import deletionLog, jobFields
+
+# Global variables
+BACKEND_TXT = "INPUT_script_1/backend.txt"
+BACKENDS = ['slurm', 'local', 'dryrun']
+
+# One job of a stage: the files written by createScripts(), the sims of the --array and the endtimes.txt the next stage reads
+Job = namedtuple('Job', ['name', 'script', 'kolist', 'explist', 'array', 'endtimes'])
+
+def readBackendValues(backend_txt=BACKEND_TXT):
+	''' {KEY: value} from backend.txt, {} if there is no backend.txt '''
+
+	values = {}
+	if not os.path.isfile(backend_txt):
+		return values
+	with open(backend_txt) as backend_values:
+		for line in backend_values:
+			key, tab, value = line.strip().partition('\t')
+			if tab:
+				values[key.strip().upper()] = value.strip()
+	return values
+
+class SlurmBackend:
+	''' Slurm arrays on the supercomputer, the bash script is uploaded and submitted by hand '''
+
+	name = 'slurm'
+
+	def submit(self, job):
+		return ''
+
+class DryRunBackend:
+	''' Reports the sims of a job without running them '''
+
+	name = 'dryrun'
+
+	def submit(self, job):
+		kolines = readKoList(job.kolist)
+		sims = [sim for sim in arraySims(job.array) if sim <= len(kolines)]
+		return '\nDry run: {} would simulate {} of {} sims (--array={}), results expected in {}.\n'.format(job.name, len(sims), len(kolines), job.array, job.endtimes)
+
+def packSize(values=None):
+	''' Sims per array task / local simulator run, PACK in backend.txt (default 1) '''
+
+	if values is None:
+		values = readBackendValues()
+	pack = values.get('PACK', '')
+	if pack and (not pack.isdigit() or int(pack) < 1):
+		raise ValueError(f"PACK in backend.txt is a number of sims (1 or more), not {pack}")
+	return int(pack) if pack else 1
+
+def simulationRecord(sim, output):
+	''' (sim, end time, outcome) of a simulator's output, end time and outcome on one line separated by a tab or on two lines, None if empty '''
+
+	lines = [line.strip() for line in output.splitlines() if line.strip()]
+	if not lines:
+		return None
+	if len(lines) == 1:
+		endtime, tab, outcome = lines[0].partition('\t')
+	else:
+		endtime, outcome = lines[-2], lines[-1]
+	return sim, endtime.strip(), outcome.strip()
+
+def commandArgs(command, **values):
+	''' Arguments of a SIMULATOR command, each {key} of values replaced (e.g. {sim}), other braces left as they are '''
+
+	args = []
+	for arg in shlex.split(command):
+		for key, value in values.items():
+			arg = arg.replace('{' + key + '}', str(value))
+		args.append(arg)
+	return args
+
+def runSimulation(command, sim, experiment, genes):
+	''' Run the simulator for one ko.list line, (sim, end time, outcome) or None if it crashed '''
+
+	args = commandArgs(command, sim=sim, experiment=experiment, genes=genes, seed=sim)
+	try:
+		completed = subprocess.run(args, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, universal_newlines=True)
+	except OSError:
+		return None
+	if completed.returncode:
+		return None
+	return simulationRecord(sim, completed.stdout)
+
+def runPack(command, lines):
+	''' Run the simulator once for a pack of ko.list lines [(sim, experiment, genes)], a (sim, end time, outcome) or None per sim.
+		Every sim is read from its own result file, so one that crashed does not lose the rest of the pack. '''
+
+	with tempfile.TemporaryDirectory(prefix='minesweeper_pack') as folder:
+		batch = os.path.join(folder, 'batch.txt')
+		results = os.path.join(folder, 'results')
+		os.mkdir(results)
+		with open(batch, 'w+', newline ='\n') as batch_txt:
+			for sim, experiment, genes in lines:
+				batch_txt.write('{}\t{}\t{}\t{}\n'.format(sim, experiment, genes, sim))
+		args = commandArgs(command, batch=batch, results=results)
+		try:
+			subprocess.run(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+		except OSError:
+			return [None for line in lines]
+		records = []
+		for sim, experiment, genes in lines:
+			result = os.path.join(results, '{}.txt'.format(sim))
+			if not os.path.isfile(result):
+				records.append(None)
+				continue
+			with open(result) as result_txt:
+				records.append(simulationRecord(sim, result_txt.read()))
+		return records
+
+class LocalBackend:
+	''' Runs the simulator command for every sim of a job on this machine, workers at a time.
+		Each simulation (or pack of pack sims, for a command with {batch}) is its own process, the pool threads only wait on them
+		and write the endtimes.txt. '''
+
+	name = 'local'
+
+	def __init__(self, command, workers=None, pack=1):
+		if not command:
+			raise ValueError('The local backend needs a SIMULATOR command in {}'.format(BACKEND_TXT))
+		self.command = command
+		self.workers = workers or os.cpu_count() or 1
+		self.pack = pack if '{batch}' in command else 1
+
+	def submit(self, job):
+		kolines = readKoList(job.kolist)
+		experiments = readKoList(job.explist)
+		sims = [sim for sim in arraySims(job.array) if sim <= len(kolines)]
+		crashed = 0
+		with open(job.endtimes, 'w+', newline ='\n') as endtimes:
+			with ThreadPoolExecutor(max_workers=self.workers) as pool:
+				if self.pack > 1:
+					lines = [(sim, experiments[sim - 1], kolines[sim - 1].strip()) for sim in sims]
+					futures = [pool.submit(runPack, self.command, lines[x:x + self.pack]) for x in range(0, len(lines), self.pack)]
+				else:
+					futures = [pool.submit(runSimulation, self.command, sim, experiments[sim - 1], kolines[sim - 1].strip()) for sim in sims]
+				for future in as_completed(futures):
+					records = future.result() if self.pack > 1 else [future.result()]
+					for record in records:
+						if record is None:
+							crashed = crashed + 1
+							continue
+						endtimes.write('{}\t{}\n{}\n'.format(*record))
+					endtimes.flush()
+		if self.pack > 1:
+			return '\nRan {} sims of {} locally, {} per run ({} runs at a time), {} crashed. Results written to {}.\n'.format(len(sims), job.name, self.pack, self.workers, crashed, job.endtimes)
+		return '\nRan {} sims of {} locally ({} at a time), {} crashed. Results written to {}.\n'.format(len(sims), job.name, self.workers, crashed, job.endtimes)
+
+def jobBackend(values=None):
+	''' The backend chosen in backend.txt '''
+
+	if values is None:
+		values = readBackendValues()
+	name = values.get('BACKEND', 'slurm').lower() or 'slurm'
+	if name == 'slurm':
+		return SlurmBackend()
+	if name == 'dryrun':
+		return DryRunBackend()
+	if name == 'local':
+		workers = values.get('WORKERS', '')
+		return LocalBackend(values.get('SIMULATOR', ''), int(workers) if workers.isdigit() else None, packSize(values))
+	raise ValueError('Unknown backend {} in {}, expected one of {}'.format(name, BACKEND_TXT, BACKENDS))
+
+def submitJob(jobname, script, kolist, explist, array, endtimes):
+	''' createScripts() helper: hand a job to the chosen backend, print and log what it did '''
+
+	backend = jobBackend()
+	log = deletionLog()
+	log.event('submitted', backend=backend.name, sims=len(arraySims(array)), kolines=len(readKoList(kolist)), **jobFields(jobname))
+	message = backend.submit(Job(jobname, script, kolist, explist, array, endtimes))
+	if message:
+		print(message)
+		log.write(message)
+	return message
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+
+# Affiliation: Life Sciences, University of Bristol
+# Last Updated: 2026-10-18
+
+"""
+Bash scripts of every createScripts() from templatescript/TemplateScript.sh. The template is compiled once (loadTemplate()) into
+its literal text and placeholders, and each script is rendered in a single pass, so values are never substituted into text
+written by an earlier value, and text around the placeholders (SLURM_ARRAY_TASK_ID, _name_) is left as it is.
+Placeholders are explicit, @KEY@:
+	@NAME@ @EMAIL@ @DEPARTMENT@ @UNI@ @SUPERPC@ @SUPERQUEUE@ @GROUP@ @USER@ @PROJECTFOLDER@	from INPUT_script_1/user_input.txt
+	@JOB@ @ENDTIMENAME@ @DATE@ @ARRAY@ (the --array) @SIMNUMBER@						decided by the script
+A template without any @KEY@ (modified from an earlier version) is compiled with the original bare words (NAME, ..., JOBx, 'e',
+DATE, 1-SIMNUMBER, SIMNUMBER), matched the same way the original substitutions did.
+"""
+
+# Imports
+import re
+
+# Global variables
+TEMPLATESCRIPT = "templatescript/TemplateScript.sh"
+USER_INPUT_TXT = "INPUT_script_1/user_input.txt"
+# keys of the user_input.txt lines, in order
+USERKEYS = ['NAME', 'EMAIL', 'DEPARTMENT', 'UNI', 'SUPERPC', 'SUPERQUEUE', 'GROUP', 'USER', 'PROJECTFOLDER']
+PLACEHOLDER = re.compile(r"@([A-Z]+)@")
+# bare words of earlier templates -> keys, in the order they were substituted
+LEGACYWORDS = [(key, key) for key in USERKEYS] + [('JOBx', 'JOB'), ("'e'", 'ENDTIMENAME'), ('DATE', 'DATE'),
+	('1-SIMNUMBER', 'ARRAY'), ('SIMNUMBER', 'SIMNUMBER')]
+LEGACYPLACEHOLDER = re.compile('|'.join('(' + re.escape(word) + ')' for word, key in LEGACYWORDS))
+# compiled templates by path
+compiled = {}
+
+class JobTemplate:
+	''' A job script template compiled into literal text and placeholders, literals[0] key[0] literals[1] ... literals[-1] '''
+
+	def __init__(self, text):
+		self.literals = []
+		self.keys = []
+		if PLACEHOLDER.search(text):
+			pattern, key = PLACEHOLDER, lambda match: match.group(1)
+		else:
+			pattern, key = LEGACYPLACEHOLDER, lambda match: LEGACYWORDS[match.lastindex - 1][1]
+		start = 0
+		for match in pattern.finditer(text):
+			self.literals.append(text[start:match.start()])
+			self.keys.append(key(match))
+			start = match.end()
+		self.literals.append(text[start:])
+
+	def render(self, values):
+		''' Script text with every placeholder replaced by values[key], in one pass '''
+
+		missing = set(self.keys).difference(values)
+		if missing:
+			raise KeyError(f"No value for the template placeholder/s {', '.join(sorted(missing))}")
+		pieces = [self.literals[0]]
+		for key, literal in zip(self.keys, self.literals[1:]):
+			pieces.append(values[key])
+			pieces.append(literal)
+		return ''.join(pieces)
+
+def loadTemplate(templatescript=TEMPLATESCRIPT):
+	''' JobTemplate of a template script, compiled the first time it is used '''
+
+	if templatescript not in compiled:
+		with open(templatescript) as template:
+			compiled[templatescript] = JobTemplate(template.read())
+	return compiled[templatescript]
+
+def userValues(user_input_txt=USER_INPUT_TXT):
+	''' {KEY: value} of the user_input.txt lines (NAME to PROJECTFOLDER) '''
+
+	with open(user_input_txt) as user_input_values:
+		value_list = [line.rstrip() for line in user_input_values.readlines()]
+	return {key: line.split("\t")[1] for key, line in zip(USERKEYS, value_list)}
@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+
+# Affiliation: Life Sciences, University of Bristol
+# Last Updated: 2026-10-18
+
+"""
+Adaptive search of the eight group powerset (Stage 4X), instead of simulating all 256 combinations at once.
+Combinations are submitted in waves, and the results already in are used to prune the rest, assuming monotonicity:
+if a combination of groups fails to divide every combination containing it fails too, and if a combination divides
+every combination within it divides too (and is smaller, so uninteresting for the largest deletion).
+Used by engine.py (eightssearch, the waves of one round) and script_4X.py (EIGHTSSEARCH, one wave per run, see eightswaves.py).
+Both orders go up the lattice a level per wave (single groups, then pairs of dividing groups, ...), like the apriori algorithm,
+never simulating a combination containing one that failed to divide:
+largest - also skips combinations whose dividing supersets can not delete more genes than the best dividing combination found,
+          and looks ahead: each combination of a wave is simulated together with the largest superset that may still divide
+          (itself plus every group it is not known to fail with), whose division settles every combination within it.
+          On monotone results it finds the best deletion of the full powerset, with a fraction of its simulations
+level   - the levels only, without the bound or the look-ahead
+Results that are not monotone (a stochastic failure of a combination whose supersets divide) prune combinations the full
+powerset would have found dividing, so either order can then stop at a smaller deletion.
+"""
+
+# Global variables
+ORDERS = ['largest', 'level']
+INFERRED_VIABLE = 'Inferred_Viable'
+INFERRED_LETHAL = 'Inferred_Lethal'
+PRUNED = 'Pruned'
+
+class LatticeSearch:
+	''' Waves of combinations to simulate for one eights round.
+		combos are (name, GeneSet) pairs as produced by eightPanelGroupingsGeneration(), the name being the groups joined by spaces.
+		The blank combination is the wildtype and is taken as dividing. '''
+
+	def __init__(self, combos, order='largest'):
+		if order not in ORDERS:
+			raise ValueError('Unknown search order {}, expected one of {}'.format(order, ORDERS))
+		self.order = order
+		self.members = [frozenset(name.split()) for name, geneset in combos]
+		self.weights = [len(geneset) for name, geneset in combos]
+		self.index()
+		# None = unknown, True = divides, False = does not divide
+		self.viable = [None] * len(combos)
+		self.tested = [False] * len(combos)
+		for index in self.levels.get(0, []):
+			self.viable[index] = True
+		self.level = 1
+		self.waves = 0
+
+	def index(self):
+		''' Combinations by lattice level and by their groups '''
+
+		self.levels = {}
+		self.indexes = {}
+		for index, members in enumerate(self.members):
+			self.levels.setdefault(len(members), []).append(index)
+			self.indexes[members] = index
+		self.top = max(self.levels) if self.levels else 0
+		self.groups = frozenset().union(*self.members)
+
+	def best(self):
+		''' Largest number of genes deleted by a tested dividing combination (0 if none) '''
+
+		return max((weight for weight, viable, tested in zip(self.weights, self.viable, self.tested) if viable and tested), default=0)
+
+	def bounds(self):
+		''' Most genes deleted by a combination or any superset of it that may still divide, -1 if none may (superset maximum, a group at a time) '''
+
+		bounds = [weight if viable is not False else -1 for weight, viable in zip(self.weights, self.viable)]
+		for group in self.groups:
+			for index, members in enumerate(self.members):
+				if group not in members:
+					superset = self.indexes.get(members | {group})
+					if superset is not None and bounds[superset] > bounds[index]:
+						bounds[index] = bounds[superset]
+		return bounds
+
+	def lookAhead(self, index):
+		''' The combination plus every group it is not known to fail with, if that is a different combination of unknown outcome '''
+
+		members = self.members[index]
+		extension = set(members)
+		for group in self.groups - members:
+			superset = self.indexes.get(members | {group})
+			if superset is not None and self.viable[superset] is not False:
+				extension.add(group)
+		ahead = self.indexes.get(frozenset(extension))
+		if ahead is None or ahead == index or self.viable[ahead] is not None:
+			return None
+		return ahead
+
+	def nextWave(self):
+		''' Indexes of the combinations to simulate next, [] when the search is finished '''
+
+		while 0 < self.level <= self.top:
+			level = self.level
+			self.level = self.level + 1
+			wave = [index for index in self.levels.get(level, []) if self.viable[index] is None and self.subsetsViable(index)]
+			if self.order == 'largest':
+				best = self.best()
+				bounds = self.bounds()
+				wave = [index for index in wave if bounds[index] > best]
+				aheads = [self.lookAhead(index) for index in wave]
+				wave = wave + sorted(set(ahead for ahead in aheads if ahead is not None and self.weights[ahead] > best) - set(wave))
+			if wave:
+				self.waves = self.waves + 1
+				return wave
+		return []
+
+	def subsetsViable(self, index):
+		members = self.members[index]
+		for other in self.levels.get(len(members) - 1, []):
+			if self.members[other] < members and not self.viable[other]:
+				return False
+		return True
+
+	def record(self, indexes, viable):
+		''' Results of a wave, inferring the status of supersets (does not divide) and subsets (divides) '''
+
+		for index, divides in zip(indexes, viable):
+			self.tested[index] = True
+			self.viable[index] = divides
+			members = self.members[index]
+			for other, status in enumerate(self.viable):
+				if status is not None:
+					continue
+				if divides and self.members[other] <= members:
+					self.viable[other] = True
+				elif not divides and self.members[other] >= members:
+					self.viable[other] = False
+
+	def label(self, index):
+		''' Result line for a combination that was not simulated '''
+
+		if self.viable[index] is None:
+			return PRUNED
+		if self.viable[index]:
+			return INFERRED_VIABLE
+		return INFERRED_LETHAL
+
+	def simulations(self):
+		return sum(self.tested)
+
+	def state(self):
+		''' JSON serialisable state, between the waves (runs) of script_4X.py '''
+
+		return {'order': self.order, 'members': [sorted(members) for members in self.members], 'weights': self.weights,
+			'viable': self.viable, 'tested': self.tested, 'level': self.level, 'waves': self.waves}
+
+def loadLatticeSearch(state):
+	''' LatticeSearch from a LatticeSearch.state() '''
+
+	search = LatticeSearch([], state['order'])
+	search.members = [frozenset(members) for members in state['members']]
+	search.weights = state['weights']
+	search.index()
+	search.viable = state['viable']
+	search.tested = state['tested']
+	search.level = state['level']
+	search.waves = state['waves']
+	return search
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+
+# Affiliation: Life Sciences, University of Bristol
+# Last Updated: 2026-10-18
+
+"""
+Sim number -> combination manifests, written next to every ko.list (e.g. OUTPUT_script_3/mineconquer_red_0_manifest.txt).
+One tab separated line per sim: sim number, experiment (from the exp.list), combination (gene code, % board code or
+powerset combination name, the controls are named after their experiment) and its genes (sorted gene codes separated by spaces,
+blank for the wildtype). The manifest records exactly which combination each array task simulated:
+	writeManifest()  - a script regenerating a ko.list with different combinations than the manifest its jobs were submitted with
+	                   stops, keeping the manifest, rather than match those jobs' results to the new combinations
+	checkManifest()  - interpretResults() / cachedResults() read the ko.list lines through it, and stop if a ko.list line no longer has
+	                   the genes, or the combination file the combination, recorded for its sim
+Manifests written before the genes column (three columns) are checked on the combinations only, ko.lists without a manifest
+(earlier versions, the DEMO) are read as they are.
+"""
+
+# Imports
+import os
+from geneset import GeneRegistry, normaliseGene
+from combofile import readComboFile
+
+# Global variables
+MANIFEST_SUFFIX = '_manifest.txt'
+
+def manifestPath(kolist):
+	''' e.g. OUTPUT_script_3/mineconquer_red_0_ko.list -> OUTPUT_script_3/mineconquer_red_0_manifest.txt '''
+
+	return kolist[:-len('_ko.list')] + MANIFEST_SUFFIX
+
+def comboNames(combofile):
+	''' Combination names (first column) of a combosandgenes / eightsandgenes file (compact or not), one per ko.list line '''
+
+	return readComboFile(combofile).names()
+
+def readLines(path):
+	with open(path) as lines_txt:
+		return [line.rstrip('\n') for line in lines_txt]
+
+def manifestRows(kolist, explist, names):
+	''' {sim number: (experiment, combination, genes)} of a ko.list, names[i] being the combination of sim i + 1 '''
+
+	registry = GeneRegistry()
+	kolines = readLines(kolist)
+	sims = {}
+	for sim, experiment in enumerate(readLines(explist), start=1):
+		if sim <= len(names):
+			combo = normaliseGene(names[sim - 1])
+		else:
+			combo = experiment
+		genes = registry.parse(kolines[sim - 1]).canonical() if sim <= len(kolines) else ''
+		sims[sim] = (experiment, combo, genes)
+	return sims
+
+def comboLabel(combo):
+	return combo or 'the blank combination'
+
+def manifestMismatch(previous, sims):
+	''' First sim whose combination / genes differ between two manifests, as a message, None if they match '''
+
+	for sim in sorted(set(previous) | set(sims)):
+		if sim not in previous or sim not in sims:
+			return 'the manifest has {} sims, the ko.list {}'.format(len(previous), len(sims))
+		experiment, combo, genes = previous[sim]
+		if combo != sims[sim][1]:
+			return 'sim {} was {}, it is now {}'.format(sim, comboLabel(combo), comboLabel(sims[sim][1]))
+		if genes is not None and genes != sims[sim][2]:
+			return 'sim {} ({}) has different genes'.format(sim, comboLabel(combo))
+	return None
+
+def writeManifest(kolist, explist, names):
+	''' Write the manifest of a ko.list, names[i] being the combination of sim i + 1, sims past names are the controls.
+		ValueError (the manifest kept) if the ko.list was regenerated with different combinations than an existing manifest. '''
+
+	sims = manifestRows(kolist, explist, names)
+	manifest = manifestPath(kolist)
+	if os.path.isfile(manifest):
+		mismatch = manifestMismatch(readManifest(manifest), sims)
+		if mismatch:
+			raise ValueError(f"{kolist} was regenerated with different combinations than {manifest} ({mismatch}). The results of jobs submitted with it could not be matched. "
+				f"Regenerate it with the settings it was created with (e.g. POWERSETSEED, GROUPS), or delete {manifest} if those jobs will not be interpreted.")
+	with open(manifest, 'w+', newline ='\n') as manifest_txt:
+		for sim, (experiment, combo, genes) in sims.items():
+			manifest_txt.write('{}\t{}\t{}\t{}\n'.format(sim, experiment, combo, genes))
+
+def readManifest(manifest):
+	''' {sim number: (experiment, combination, genes)} from a manifest file, genes None for manifests without the genes column '''
+
+	sims = {}
+	with open(manifest) as manifest_txt:
+		for line in manifest_txt:
+			values = line.rstrip('\n').split('\t')
+			if len(values) in (3, 4) and values[0].isdigit():
+				sims[int(values[0])] = (values[1], values[2], values[3] if len(values) == 4 else None)
+	return sims
+
+def checkManifest(kolist, names=None):
+	''' ko.list lines of a ko.list, checked against its manifest: every line must have the genes, and names[i] (the combinations the
+		stage matches the results to, sim i + 1) the combination, recorded for its sim. ValueError if not. Unchecked without a manifest. '''
+
+	kolines = readLines(kolist)
+	manifest = manifestPath(kolist)
+	if not os.path.isfile(manifest):
+		return kolines
+	sims = readManifest(manifest)
+	registry = GeneRegistry()
+	if len(kolines) != len(sims):
+		raise ValueError(f"{kolist} has {len(kolines)} sims, {manifest} {len(sims)}: it was regenerated since its jobs were submitted, their results can not be matched to it.")
+	for sim, line in enumerate(kolines, start=1):
+		experiment, combo, genes = sims[sim]
+		if genes is not None and registry.parse(line).canonical() != genes:
+			raise ValueError(f"Sim {sim} of {kolist} no longer has the genes recorded in {manifest}: it was regenerated since its jobs were submitted, their results can not be matched to it.")
+		if names is not None and sim <= len(names) and normaliseGene(names[sim - 1]) != combo:
+			raise ValueError(f"Sim {sim} of {kolist} was submitted as {comboLabel(combo)} ({manifest}), the results would be matched to {comboLabel(normaliseGene(names[sim - 1]))}.")
+	return kolines
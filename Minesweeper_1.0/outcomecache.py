@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+
+# Affiliation: Life Sciences, University of Bristol
+# Last Updated: 2026-10-18
+
+"""
+Persistent store of knockout outcomes (OUTPUT_final/outcomecache.sqlite), keyed by the canonical (sorted) gene set of a ko.list line.
+Every interpretResults() stores the results it matched, and every createScripts() leaves knockout sets with a known outcome out of
+the Slurm array (#SBATCH --array=1-5,7,9-64), so identical knockouts are only simulated once across rounds, variants and re-runs.
+Knockout sets submitted earlier in the same round (e.g. shared by red and yellow) are recorded as pending and are also left out,
+their result is copied over when the owning job is interpreted. The ko.list / exp.list files keep every line, so sim numbers are unchanged.
+Blank lines (the wildtype, incl. the blank powerset combination) are never cached, the wildtype / mutant controls always run.
+Results of stochastic simulations are otherwise final, so a Stage 4X round can expire the cached result of its lane's current deletion
+(script_4X.RESIMULATEDELETION): a combination with exactly those genes is simulated again, and the new replicate replaces the old one.
+"""
+
+# Imports
+import os
+import sqlite3
+from geneset import GeneRegistry
+from manifest import checkManifest
+
+# Global variables
+OUTCOMECACHE = "OUTPUT_final/outcomecache.sqlite"
+NO_RESULT = 'No_Result'
+
+def arraySpec(sims):
+	''' Slurm --array value for a list of sim numbers, e.g. [1,2,3,5,7,8] -> 1-3,5,7-8 '''
+
+	ranges = []
+	for sim in sorted(set(sims)):
+		if ranges and sim == ranges[-1][1] + 1:
+			ranges[-1][1] = sim
+		else:
+			ranges.append([sim, sim])
+	return ','.join(str(start) if start == end else '{}-{}'.format(start, end) for start, end in ranges)
+
+def arraySims(spec):
+	''' Sim numbers of a Slurm --array value, e.g. 1-3,5,7-8 (or 1-3,5,7-8%50, throttled) -> [1,2,3,5,7,8] '''
+
+	sims = []
+	for part in spec.split('%')[0].split(','):
+		start, dash, end = part.strip().partition('-')
+		if start:
+			sims.extend(range(int(start), int(end or start) + 1))
+	return sims
+
+class OutcomeCache:
+	''' SQLite backed outcome store, one row per canonical knockout set.
+		result is NULL while the knockout set is pending (submitted in job, not yet interpreted). '''
+
+	def __init__(self, path=OUTCOMECACHE):
+		self.path = path
+		self.registry = GeneRegistry()
+		self.connection = sqlite3.connect(path)
+		self.connection.execute("CREATE TABLE IF NOT EXISTS outcomes (geneset TEXT PRIMARY KEY, result TEXT, job TEXT, sim INTEGER)")
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc):
+		self.close()
+
+	def close(self):
+		self.connection.commit()
+		self.connection.close()
+
+	def key(self, genes):
+		''' Canonical key of a GeneSet or a ko.list line, '' for blank lines '''
+
+		if isinstance(genes, str):
+			genes = self.registry.parse(genes)
+		return genes.canonical()
+
+	def get(self, genes):
+		''' Known result line of a knockout set, or None '''
+
+		row = self.connection.execute("SELECT result FROM outcomes WHERE geneset = ?", (self.key(genes),)).fetchone()
+		if row is None:
+			return None
+		return row[0]
+
+	def known(self, genes):
+		''' Whether a knockout set has a result, or is pending in a job '''
+
+		return self.connection.execute("SELECT 1 FROM outcomes WHERE geneset = ?", (self.key(genes),)).fetchone() is not None
+
+	def results(self):
+		''' (canonical key, result line) of every knockout set with a result '''
+
+		return self.connection.execute("SELECT geneset, result FROM outcomes WHERE result IS NOT NULL").fetchall()
+
+	def expire(self, genes):
+		''' Forget the result (or pending entry) of a knockout set, so it is simulated again '''
+
+		self.connection.execute("DELETE FROM outcomes WHERE geneset = ?", (self.key(genes),))
+
+	def pendingSims(self, job):
+		''' Sims of job submitted for simulation whose results have not been interpreted yet '''
+
+		return [row[0] for row in self.connection.execute("SELECT sim FROM outcomes WHERE job = ? AND result IS NULL ORDER BY sim", (job,))]
+
+	def put(self, genes, result, job='', sim=0):
+		''' Store a result line (crashed sims, 'No_Result', and blank lines are not stored) '''
+
+		key = self.key(genes)
+		if not key or result == NO_RESULT:
+			return
+		self.connection.execute("INSERT OR IGNORE INTO outcomes VALUES (?, ?, ?, ?)", (key, result, job, sim))
+		self.connection.execute("UPDATE outcomes SET result = ?, job = ?, sim = ? WHERE geneset = ? AND result IS NULL", (result, job, sim, key))
+
+	def submit(self, kolines, job, controls=2, resimulate=None):
+		''' Sims (1 indexed) of a ko.list that need simulating: not blank, no known / pending outcome, plus the controls (last lines).
+			The rest are recorded as pending for job. Previous pending entries of job (an earlier run of the same script) are dropped.
+			The first line with the genes of resimulate (a GeneSet or ko.list line) is simulated even if its outcome is known. '''
+
+		self.connection.execute("DELETE FROM outcomes WHERE job = ? AND result IS NULL", (job,))
+		expired = self.key(resimulate) if resimulate is not None else ''
+		sims = []
+		controlstart = len(kolines) - controls
+		for sim, line in enumerate(kolines, start=1):
+			key = self.key(line)
+			if sim > controlstart:
+				sims.append(sim)
+			elif not key or (key != expired and self.known(line)):
+				continue
+			else:
+				if key == expired:
+					self.expire(line)
+					expired = ''
+				self.connection.execute("INSERT INTO outcomes VALUES (?, NULL, ?, ?)", (key, job, sim))
+				sims.append(sim)
+		self.connection.commit()
+		return sims
+
+	def merge(self, kolines, result_list, job):
+		''' Store the simulated results of job (result_list[i] = sim i + 1), then fill the sims left out of the array from the cache.
+			Pending entries of job that crashed are dropped, so they are simulated again. '''
+
+		for sim, (line, result) in enumerate(zip(kolines, result_list), start=1):
+			self.put(line, result, job, sim)
+		self.connection.execute("DELETE FROM outcomes WHERE job = ? AND result IS NULL", (job,))
+		merged = []
+		for line, result in zip(kolines, result_list):
+			if result == NO_RESULT and line.strip():
+				result = self.get(line) or NO_RESULT
+			merged.append(result)
+		merged.extend(result_list[len(merged):])
+		self.connection.commit()
+		return merged
+
+def readKoList(kolist):
+	with open(kolist) as kolist_txt:
+		return [line.rstrip('\n') for line in kolist_txt]
+
+def jobName(kolist):
+	''' e.g. OUTPUT_script_3/mineconquer_red_0_ko.list -> mineconquer_red_0 '''
+
+	return os.path.basename(kolist)[:-len('_ko.list')]
+
+def cachedArray(kolist, controls=2, resimulate=None):
+	''' createScripts() helper: the --array value of a ko.list, leaving out sims with a known / pending outcome
+		(apart from the knockout set resimulate, e.g. the lane's current deletion, see OutcomeCache.submit()).
+		If every sim is known, sim 1 is still run so the job produces an endtimes.txt for interpretResults(). '''
+
+	with OutcomeCache() as cache:
+		sims = cache.submit(readKoList(kolist), jobName(kolist), controls, resimulate)
+	return arraySpec(sims or [1])
+
+def cachedResults(kolist, result_list):
+	''' interpretResults() helper: store the matched results of a ko.list and fill the sims that were not simulated.
+		The ko.list lines are checked against its manifest (manifest.py), so results are never stored under a regenerated line.
+		Without the ko.list (e.g. replaced DEMO outputs) the results are returned unchanged. '''
+
+	if not os.path.isfile(kolist):
+		return result_list
+	kolines = checkManifest(kolist)
+	with OutcomeCache() as cache:
+		return cache.merge(kolines, result_list, jobName(kolist))
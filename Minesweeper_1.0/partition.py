@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+
+# Affiliation: Life Sciences, University of Bristol
+# Last Updated: 2026-10-18
+
+"""
+Partitions of the remaining genes into the groups of a Stage 4X round (script_4X.eightPanelGroupingsGeneration(), engine.py).
+The powerset of k groups is 2^k combinations per variant per round: more groups = wider arrays and fewer rounds (better on a
+busy cluster, where each round waits in the queue), fewer groups = narrower arrays and more rounds.
+	eights   - the original layout, 8 groups (256 combinations): 15 or more genes, groups of trunc(12.5% of the genes) + 1 and the
+	           eighth group takes the rest; 8 - 14 genes, the first (genes - 8) groups hold two genes; fewer than 8, one gene per group.
+	           For counts where the first seven groups would use up every gene (e.g. 17, 24 or 27 genes) the 8 groups are balanced
+	           instead, an empty group's combinations would delete nothing new and stall the lane
+	balanced - k groups (GROUPS, or the most groups whose powerset fits in ARRAYSIZE combinations) whose sizes differ by at most
+	           one gene, larger groups first; fewer genes than groups, one gene per group
+	adaptive - k groups sized by essentiality evidence (evidence.py): genes ordered from least to most risky, each group holding about
+	           the same total risk, so likely viable genes are batched into large groups and risky genes isolated in small ones
+Once every gene is its own group the powerset tries every combination, so a round with no more genes than groups is the final round.
+Every partition is checked to cover the genes in order with no empty or inverted group (checkedSlices()).
+"""
+
+# Imports
+import math
+
+# Global variables
+EIGHTS = 8
+# weight of a gene without lethal evidence, relative to a risk of 1: with no evidence at all the adaptive groups are balanced
+RISKFLOOR = 0.05
+
+def groupCount(groups=None, arraysize=None):
+	''' Number of groups of a round: the most groups whose powerset fits in arraysize combinations, else groups, else 8 '''
+
+	if arraysize:
+		return max(1, int(arraysize).bit_length() - 1)
+	if groups:
+		return int(groups)
+	return EIGHTS
+
+def eightsSlices(whole):
+	''' Start / end of each group of whole remaining genes, in the original eights layout '''
+
+	if whole >= 15:
+		ngenes = math.trunc((whole/100)*12.5)
+		if (ngenes + 1)*7 >= whole:
+			# the eighth group would be empty (or the later groups run past the genes)
+			return balancedSlices(whole, EIGHTS)
+		slices = [((ngenes + 1)*x, (ngenes + 1)*(x + 1)) for x in range(0, 7)]
+		slices.append(((ngenes + 1)*7, whole))
+		return slices
+	if whole >= 8:
+		# first (whole - 8) groups hold two genes, the rest one
+		return balancedSlices(whole, EIGHTS)
+	return [(x, x + 1) for x in range(0, whole)]
+
+def balancedSlices(whole, groups):
+	''' Start / end of each of groups groups of whole remaining genes, sizes differing by at most one gene, larger groups first '''
+
+	groups = min(groups, whole)
+	slices = []
+	start = 0
+	for x in range(0, groups):
+		end = start + whole // groups + (1 if x < whole % groups else 0)
+		slices.append((start, end))
+		start = end
+	return slices
+
+def checkedSlices(slices, whole):
+	''' slices, if they cover the whole remaining genes in order with no empty or inverted group, else ValueError '''
+
+	start = 0
+	for slice_start, slice_end in slices:
+		if slice_start != start or slice_end <= slice_start:
+			raise ValueError('Partition {} of {} genes has an empty, inverted or misplaced group ({}, {})'.format(slices, whole, slice_start, slice_end))
+		start = slice_end
+	if start != whole:
+		raise ValueError('Partition {} does not cover all {} genes'.format(slices, whole))
+	return slices
+
+def partitionSlices(whole, groups=None, arraysize=None):
+	''' Start / end of each group of whole remaining genes: the eights layout, or balanced groups if groups / arraysize are given '''
+
+	if not groups and not arraysize:
+		return checkedSlices(eightsSlices(whole), whole)
+	return checkedSlices(balancedSlices(whole, groupCount(groups, arraysize)), whole)
+
+def weightedSlices(weights, groups):
+	''' Start / end of groups groups of consecutive genes with about the same total weight, none empty '''
+
+	whole = len(weights)
+	groups = min(groups, whole)
+	slices = []
+	start = 0
+	for x in range(0, groups):
+		left = groups - x
+		if left == 1:
+			slices.append((start, whole))
+			break
+		target = sum(weights[start:]) / left
+		end = start + 1
+		total = weights[start]
+		# leave at least one gene for each of the groups still to fill
+		while end < whole - (left - 1) and total + weights[end] / 2 <= target:
+			total = total + weights[end]
+			end = end + 1
+		slices.append((start, end))
+		start = end
+	return checkedSlices(slices, whole)
+
+def adaptiveGroups(genes, risks, groups=EIGHTS):
+	''' Groups (lists) of genes, risks[i] being the risk of genes[i] (evidence.geneRisks()), least risky group first '''
+
+	order = sorted(range(len(genes)), key=lambda x: risks[x])
+	weights = [risks[x] + RISKFLOOR for x in order]
+	return [[genes[x] for x in order[start:end]] for start, end in weightedSlices(weights, groups)]
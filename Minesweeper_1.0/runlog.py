@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+
+# Affiliation: Life Sciences, University of Bristol
+# Last Updated: 2026-10-18
+
+"""
+Deletion log of a run: one buffered handle to OUTPUT_final/deletionlog.txt (human readable, as before) for the whole run of a script,
+instead of opening and closing the file for every message, plus a JSON-lines event stream in OUTPUT_final/deletionlog.jsonl.
+Every event is one line: {"time", "run", "stage", "event", ...fields}, e.g. submitted jobs (variant, round, sims), the deletion of
+each variant per round (genes deleted / remaining), the ending decision, and the run's wall / CPU time ("end"), so round progress
+can be followed without parsing the text log. Both files are flushed when the script exits (also on sys.exit or an error).
+Worker processes (variantpool.py) keep their messages and events in memory (captureLog()), the main process appends them (replay()).
+"""
+
+# Imports
+import atexit
+from datetime import datetime
+import io
+import json
+import os
+import re
+import sys
+import time
+
+# Global variables
+DELETIONLOG = "OUTPUT_final/deletionlog.txt"
+EVENTLOG = "OUTPUT_final/deletionlog.jsonl"
+# e.g. minegapko_red_3 -> red, 3
+JOBNAME = re.compile(r"_([a-z][a-z0-9]*)_(\d+)$")
+
+def stageName(script):
+	''' script_4X.py -> 4X, anything else (engine.py, benchmark.py) -> the file name '''
+
+	name = os.path.splitext(os.path.basename(script))[0]
+	if name.startswith('script_'):
+		return name[len('script_'):]
+	return name
+
+def jobFields(jobname):
+	''' {'job', 'variant', 'round'} of a job name, variant / round only for Stage 3 and 4X jobs '''
+
+	fields = {'job': jobname}
+	match = JOBNAME.search(jobname)
+	if match:
+		fields['variant'] = match.group(1)
+		fields['round'] = int(match.group(2))
+	return fields
+
+class RunLog:
+	''' Buffered deletion log and event stream of one run. Files are opened on the first message. '''
+
+	def __init__(self, deletionlog=DELETIONLOG, eventlog=EVENTLOG, stage=None):
+		self.deletionlog = deletionlog
+		self.eventlog = eventlog
+		self.stage = stage if stage is not None else stageName(sys.argv[0])
+		self.run = "{:%Y-%m-%dT%H:%M:%S}".format(datetime.now())
+		self.text = None
+		self.events = None
+		self.start = time.perf_counter()
+		self.cpu = time.process_time()
+
+	def write(self, message):
+		''' Append to deletionlog.txt '''
+
+		if self.text is None:
+			self.text = open(self.deletionlog, "a+", newline ='\n')
+		self.text.write(message)
+
+	def close(self):
+		''' End of a message block, the handle stays open (buffered) until the run ends, see end() '''
+
+		pass
+
+	def event(self, event, **fields):
+		''' Append one event to deletionlog.jsonl '''
+
+		if self.events is None:
+			self.events = open(self.eventlog, "a+", newline ='\n')
+		record = {'time': "{:%Y-%m-%dT%H:%M:%S}".format(datetime.now()), 'run': self.run, 'stage': self.stage, 'event': event}
+		record.update(fields)
+		self.events.write(json.dumps(record) + '\n')
+
+	def captured(self):
+		''' (messages, event lines) of a captureLog() RunLog '''
+
+		return self.text.getvalue(), self.events.getvalue()
+
+	def replay(self, messages, events):
+		''' Append the messages and event lines captured in a worker process '''
+
+		if messages:
+			self.write(messages)
+		if events:
+			if self.events is None:
+				self.events = open(self.eventlog, "a+", newline ='\n')
+			self.events.write(events)
+
+	def flush(self):
+		for handle in (self.text, self.events):
+			if handle is not None:
+				handle.flush()
+
+	def end(self):
+		''' Record the run's wall / CPU time and close both files '''
+
+		if self.text is None and self.events is None:
+			return
+		self.event('end', seconds=round(time.perf_counter() - self.start, 3), cpu=round(time.process_time() - self.cpu, 3))
+		for handle in (self.text, self.events):
+			if handle is not None:
+				handle.close()
+		self.text = None
+		self.events = None
+
+# created on import, so the "end" event times the whole run of the script
+_runlog = RunLog()
+atexit.register(_runlog.end)
+
+def deletionLog():
+	''' The RunLog of this run, shared by every function of a script '''
+
+	return _runlog
+
+def captureLog(run, stage):
+	''' Worker processes: deletionLog() becomes a RunLog of the main process's run that keeps everything in memory, see replay() '''
+
+	global _runlog
+	_runlog = RunLog(stage=stage)
+	_runlog.run = run
+	_runlog.text = io.StringIO()
+	_runlog.events = io.StringIO()
+	return _runlog
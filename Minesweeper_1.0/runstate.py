@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+
+# Affiliation: Life Sciences, University of Bristol
+# Last Updated: 2026-10-18
+
+"""
+Run state of a project (OUTPUT_final/runstate.json), replacing the round detection of script_4X.py from endtimes.txt mtimes and
+file name characters, and the singleko{colour}.txt / finalround{colour}.txt trigger files.
+The state records the round of the pending jobs and, per variant, its phase and pending job:
+	eights     - an eights powerset round is pending
+	singleko   - an appended single ko round is pending (its results are interpreted as single kos)
+	grouptest  - a wave of group tested single kos is pending (pools, see grouptesting.py, OUTPUT_script_4X/grouptest_COLOUR_N.json)
+	finalround - the final eights round is pending (8 or fewer remaining genes), the variant finishes when it is interpreted
+	finished   - final result written
+	merged     - converged onto the same deleted / remaining genes as an earlier variant ("into"), which carries on for both,
+	             the final result of the earlier variant is also written for the merged one
+An eights / finalround round searched in waves (script_4X.py EIGHTSSEARCH) also keeps its search (eightswaves.py).
+Variants are lanes of a beam search (script_3.py VARIANTS wide), identified by an id: the colours, then lane17, lane18, ...
+Script 3 records the round 0 (conquer) jobs, script 4X reads the pending round, and records the next round when it creates its scripts.
+The state before each round is kept in history, so a round can be interpreted again. Writes are atomic (temporary file + rename),
+so an interrupted run never leaves a partial state, and copying a project between machines (rsync, mtimes reset) changes nothing.
+Projects started before the state file are migrated once from their endtimes.txt files and trigger files.
+"""
+
+# Imports
+import copy
+import glob
+import json
+import os
+import re
+from arraychunks import jobEndtimes
+from simretry import retryEndtimes
+from eightswaves import waveEndtimes
+
+# Global variables
+RUNSTATE = "OUTPUT_final/runstate.json"
+VERSION = 1
+# ids of the first variants in the order script_3.py assigns them (largest dividing segment first), see laneIds()
+COLOURS = ['red', 'yellow', 'blue', 'green', 'orange', 'purple', 'pink', 'brown', 'grey', 'cyan', 'magenta', 'olive', 'navy', 'teal', 'maroon', 'gold']
+PHASES = ['eights', 'singleko', 'grouptest', 'finalround', 'finished', 'merged']
+# e.g. INPUT_script_4X/gapko_red_12_endtimes.txt -> red, 12
+ENDTIMES = re.compile(r"_(" + '|'.join(COLOURS) + r")_(\d+)_endtimes\.txt$")
+
+def laneIds(width):
+	''' Ids of the variants of a beam width wide, no underscores as file / job names are built as _ID_ROUND '''
+
+	return [COLOURS[x] if x < len(COLOURS) else 'lane{}'.format(x + 1) for x in range(width)]
+
+class RunState:
+	''' Variants, round and pending jobs of a project '''
+
+	def __init__(self, path=RUNSTATE):
+		self.path = path
+		self.round = 0
+		self.variants = {}
+		self.history = []
+
+	def pending(self):
+		''' Variants with a pending job, in the order script_3.py recorded them '''
+
+		return [colour for colour in self.variants if self.variants[colour]['phase'] not in ('finished', 'merged')]
+
+	def phase(self, colour):
+		return self.variants.get(colour, {}).get('phase', 'finished')
+
+	def endtimes(self, colour):
+		return self.variants[colour]['endtimes']
+
+	def expectedEndtimes(self):
+		''' endtimes.txt files of the pending jobs, those of their chunks for jobs split into several arrays (arraychunks.py),
+			of the retries of their crashed sims (simretry.py) and of the waves of adaptive eights rounds (eightswaves.py) '''
+
+		return [endtimes for colour in self.pending() for job in [self.endtimes(colour)] for endtimes in jobEndtimes(job) + retryEndtimes(job) + waveEndtimes(job)]
+
+	def missingEndtimes(self):
+		''' endtimes.txt files of the pending jobs that are not in place yet '''
+
+		return [endtimes for endtimes in self.expectedEndtimes() if not os.path.isfile(endtimes)]
+
+	def startRound(self, round):
+		''' Keep the current state in history before the jobs of the next round are recorded '''
+
+		if self.variants:
+			self.history.append({'round': self.round, 'variants': copy.deepcopy(self.variants)})
+		self.round = round
+
+	def submit(self, colour, round, phase, job, endtimes):
+		''' Record the pending job of a variant '''
+
+		if phase not in PHASES:
+			raise ValueError('Unknown phase {}, expected one of {}'.format(phase, PHASES))
+		self.round = round
+		self.variants[colour] = {'phase': phase, 'round': round, 'job': job, 'endtimes': endtimes}
+
+	def search(self, colour):
+		''' Search of a variant's adaptive eights round (LatticeSearch.state() and the pending wave, see eightswaves.py), None without '''
+
+		return self.variants.get(colour, {}).get('search')
+
+	def setSearch(self, colour, search):
+		self.variants[colour]['search'] = search
+
+	def finish(self, colour):
+		self.variants.setdefault(colour, {'round': self.round, 'job': '', 'endtimes': ''})['phase'] = 'finished'
+
+	def merge(self, colour, into):
+		''' The variant converged onto variant into, its earlier merged variants follow it '''
+
+		self.variants[colour]['phase'] = 'merged'
+		self.variants[colour]['into'] = into
+		for other in self.merged(colour):
+			self.variants[other]['into'] = into
+
+	def merged(self, colour):
+		''' Variants merged into this variant '''
+
+		return [other for other in self.variants if self.variants[other]['phase'] == 'merged' and self.variants[other].get('into') == colour]
+
+	def rewind(self):
+		''' Go back to the state before the last round, so it is interpreted again. False if there is no earlier round. '''
+
+		if not self.history:
+			return False
+		previous = self.history.pop()
+		self.round = previous['round']
+		self.variants = previous['variants']
+		return True
+
+	def save(self):
+		''' Atomic write: a temporary file next to the state file, renamed over it '''
+
+		state = {'version': VERSION, 'round': self.round, 'variants': self.variants, 'history': self.history}
+		temporary = self.path + '.tmp'
+		with open(temporary, 'w', newline ='\n') as state_json:
+			json.dump(state, state_json, indent=1)
+			state_json.flush()
+			os.fsync(state_json.fileno())
+		os.replace(temporary, self.path)
+
+def legacyRunState(path=RUNSTATE):
+	''' RunState of a project without a state file: the latest round of INPUT_script_4X/*_endtimes.txt (by round number, not mtime),
+		its colours, and phases from the OUTPUT_final trigger files. None if there are no endtimes.txt files. '''
+
+	rounds = {}
+	for endtimes in glob.glob("INPUT_script_4X/*_endtimes.txt"):
+		match = ENDTIMES.search(endtimes.replace('\\', '/'))
+		if match:
+			rounds.setdefault(int(match.group(2)), {})[match.group(1)] = endtimes.replace('\\', '/')
+	if not rounds:
+		return None
+	state = RunState(path)
+	latest = max(rounds)
+	for colour in COLOURS:
+		if colour not in rounds[latest]:
+			continue
+		phase = 'eights'
+		if os.path.isfile('OUTPUT_final/finalround{}.txt'.format(colour)):
+			phase = 'finalround'
+		elif os.path.isfile('OUTPUT_final/singleko{}.txt'.format(colour)):
+			phase = 'singleko'
+		if latest == 0:
+			job = 'mineconquer_{}_0'.format(colour)
+		else:
+			job = 'minegapko_{}_{}'.format(colour, latest)
+		state.submit(colour, latest, phase, job, rounds[latest][colour])
+	return state
+
+def loadRunState(path=RUNSTATE):
+	''' The project's RunState, migrated from the endtimes.txt / trigger files if there is no state file yet '''
+
+	if os.path.isfile(path):
+		with open(path) as state_json:
+			values = json.load(state_json)
+		if values.get('version') != VERSION:
+			raise ValueError('{} is version {}, expected version {}'.format(path, values.get('version'), VERSION))
+		state = RunState(path)
+		state.round = values['round']
+		state.variants = values['variants']
+		state.history = values['history']
+		return state
+	state = legacyRunState(path)
+	if state is None:
+		state = RunState(path)
+	return state
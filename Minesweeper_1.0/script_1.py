@@ -15,8 +15,15 @@ Output: bash scripts and / exp list / ko list and gene list text into OUTPUT_scr
 # Imports
 import re
 from datetime import datetime
-import math
 import os
+from outcomecache import cachedArray
+from manifest import writeManifest
+from jobtemplate import loadTemplate, userValues
+from jobbackend import packSize, submitJob
+from arraychunks import arrayLimits, chunkSlices, throttled
+from arraypacks import packedArray, packTemplate
+from simretry import clearRetries
+from runlog import deletionLog
 
 # Global variables
 #JOB = "What is this experiment/run of simulations called? "
@@ -25,6 +32,8 @@ JOB = name + 'inputko{}'
 SIMNAMESTART = len(name)
 SIMNAMEEND = (len(JOB))-2
 SIMNAME = JOB[SIMNAMESTART:SIMNAMEEND]
+# sims per array script (200 genes + the 2 controls), unless MAXARRAYSIZE is set in INPUT_script_1/backend.txt (see arraychunks.py)
+MAXARRAYSIZE = 202
 
 def splashscreen():
 	""" Fancy splash screen for Minesweeper scripts """
@@ -108,8 +117,7 @@ def userInput(job, simname):
 
 		print('\nYour input values have been saved in INPUT_script_1/user_input.txt - you can update them there if needed.')
 		
-		deletionlog = "OUTPUT_final/deletionlog.txt"
-		log = open(deletionlog,"a+", newline ='\n')
+		log = deletionLog()
 		log.write("\nYour input values have been saved in INPUT_script_1/user_input.txt - you can update them there if needed.\n")
 		log.close()
 
@@ -139,7 +147,6 @@ def createGeneList():
 
 def createScripts(gene_list,job, simname):
 	""" Convert template script to bash script using user input, create exp and ko txt files """
-	# Two pathways depending on number of genes: <200 - one script, >200 - multiple scripts
 
 	JOB = job
 	SIMNAME = simname
@@ -151,359 +158,82 @@ def createScripts(gene_list,job, simname):
 	experimentscript = "OUTPUT_script_1/mineinputko{}.sh"
 	gene_list_retrieved = gene_list
 
+	# compiled once and user_input.txt read once, for every script of the stage
+	# (the packed template if PACK sims share an array task, INPUT_script_1/backend.txt, see arraypacks.py)
+	pack = packSize()
+	template = loadTemplate(packTemplate(templatescript, pack))
+	user_values = userValues(user_input_txt)
+
 	nofgenecandidates = len(gene_list_retrieved)
 
-	if nofgenecandidates < 200:
-		
-		#create knock out txt file
+	# one script per array of at most MAXARRAYSIZE sims (INPUT_script_1/backend.txt, default 200 genes + 2 controls, see arraychunks.py),
+	# numbered 1, 2, ... in gene order, as script_2.interpretResults() reads them back
+	maxarraysize, throttle = arrayLimits(MAXARRAYSIZE)
+	divisions = chunkSlices(nofgenecandidates, maxarraysize - 2)
 
-		kolist = kolist.format("")
-		with open(kolist, 'w+', newline ='\n') as ko:
-			for gene in gene_list_retrieved:
+	for scriptnameincrement, (startinggene, endinggene) in enumerate(divisions, start=1):
+		part_gene_list = gene_list_retrieved[startinggene:endinggene]
+		scriptnameincrement_str = str(scriptnameincrement)
+
+		#create knock out txt file
+		tempko = kolist.format(scriptnameincrement_str)
+		with open(tempko, 'w+', newline ='\n') as ko:
+			for gene in part_gene_list:
 				ko.write("%s\n" % gene)
 			#append control simulations to gene candidates
 			ko.write("%s\n" % "")
 			ko.write("%s\n" % "'MG_006',")
-		
-		
-		#create exp txt file
 
-		explist = explist.format("")
-		with open(explist, 'w+', newline ='\n') as exp:
-			stopper = nofgenecandidates
-			for gene in range(0,stopper):
+		#create exp txt file
+		tempexp = explist.format(scriptnameincrement_str)
+		with open(tempexp, 'w+', newline ='\n') as exp:
+			for gene in range(startinggene,endinggene):
 				exp.write("%s\n" % SIMNAME)
 			#append control simulations to gene candidates
 			exp.write("%s\n" % "wildtype")
-			exp.write("%s\n" % "mutant")	
+			exp.write("%s\n" % "mutant")
 
-		
 		#create simulation bash script
+		tempexpscript = experimentscript.format(scriptnameincrement_str)
+		expscript = open(tempexpscript, 'w+', newline ='\n')
 
-		user_input_values = open(user_input_txt, "r+")
-		tempscript = open(templatescript).read()
-		experimentscript = experimentscript.format("")
-		expscript = open(experimentscript, 'w+', newline ='\n')
-
-		value_list = [line.rstrip() for line in user_input_values.readlines()]
-		user_input_values.close()
-		value_list = value_list[0:10]
-
-		### List of templatescript KEYS that need to change
-		### Imported from user_input.txt
-		### NAME
-		name_value = value_list[0]
-		name_value = name_value.split("\t")
-		name_value = name_value[1]
-		tempscript = re.sub(r"NAME", name_value, tempscript, flags=re.MULTILINE)
-		### EMAIL
-		email_value = value_list[1]
-		email_value = email_value.split("\t")
-		email_value = email_value[1]
-		tempscript = re.sub(r"EMAIL", email_value, tempscript, flags=re.MULTILINE)
-		### DEPARTMENT
-		department_value = value_list[2]
-		department_value = department_value.split("\t")
-		department_value = department_value[1]
-		tempscript = re.sub(r"DEPARTMENT", department_value, tempscript, flags=re.MULTILINE)
-		### UNI
-		uni_value = value_list[3]
-		uni_value = uni_value.split("\t")
-		uni_value = uni_value[1]
-		tempscript = re.sub(r"UNI", uni_value, tempscript, flags=re.MULTILINE)
-		### SUPERPC
-		superpc_value = value_list[4]
-		superpc_value = superpc_value.split("\t")
-		superpc_value = superpc_value[1]
-		tempscript = re.sub(r"SUPERPC", superpc_value, tempscript, flags=re.MULTILINE)
-		### SUPERQUEUE
-		superqueue_value = value_list[5]
-		superqueue_value = superqueue_value.split("\t")
-		superqueue_value = superqueue_value[1]
-		tempscript = re.sub(r"SUPERQUEUE", superqueue_value, tempscript, flags=re.MULTILINE)
-		### GROUP
-		GROUP_value = value_list[6]
-		GROUP_value = GROUP_value.split("\t")
-		GROUP_value = GROUP_value[1]
-		tempscript = re.sub(r"GROUP", GROUP_value, tempscript, flags=re.MULTILINE)
-		### USER
-		USER_value = value_list[7]
-		USER_value = USER_value.split("\t")
-		USER_value = USER_value[1]
-		tempscript = re.sub(r"USER", USER_value, tempscript, flags=re.MULTILINE)
-		### PROJECTFOLDER
-		projectfolder_value = value_list[8]
-		projectfolder_value = projectfolder_value.split("\t")
-		projectfolder_value = projectfolder_value[1]
-		tempscript = re.sub(r"PROJECTFOLDER", projectfolder_value, tempscript, flags=re.MULTILINE)
-	
 		### Decided by script
 		### JOB is determined globally, so that users can see folder structure
-		job_clone = JOB.format("")
-		tempscript = re.sub(r"JOBx", job_clone, tempscript, flags=re.MULTILINE)
-		
+		job_clone = JOB.format(scriptnameincrement_str)
+
 		### ENDTIMENAME default is 'e', producing 'e' + 'ndtimes.txt'
-		ENDTIMENAME = 'inputko_e'
-		endtimename_clone = ENDTIMENAME
-		tempscript = re.sub(r"'e'", endtimename_clone, tempscript, flags=re.MULTILINE)
+		ENDTIMENAME = 'inputko{}_e'
+		endtimename_clone = ENDTIMENAME.format(scriptnameincrement_str)
 
 		### Calculate: DATE, SIMNUMBER
 		### DATE
 		DATE = "{:%Y-%m-%d}".format(datetime.now())
-		tempscript = re.sub(r"DATE", DATE, tempscript, flags=re.MULTILINE)
-		
-		### SIMNUMBER
-		SIMNUMBER = nofgenecandidates + 2
-		SIMNUMBER = str(SIMNUMBER)
-		tempscript = re.sub(r"SIMNUMBER", SIMNUMBER, tempscript, flags=re.MULTILINE)
 
-		expscript.write(tempscript)
+		### SIMNUMBER, knockouts with a known / pending outcome (OUTPUT_final/outcomecache.sqlite) are left out of the array
+		SIMNUMBER = (endinggene - startinggene) + 2
+		SIMNUMBER = str(SIMNUMBER)
+		ARRAY = throttled(cachedArray(tempko), throttle)
 
-		ko.close()
-		exp.close()
+		### templatescript placeholders (jobtemplate.py), the user_input.txt values and those decided by the script
+		values = dict(user_values, JOB=job_clone, ENDTIMENAME=endtimename_clone, DATE=DATE, ARRAY=packedArray(tempko, ARRAY, pack), SIMNUMBER=SIMNUMBER)
+		expscript.write(template.render(values))
 		expscript.close()
-		
-		print('\nCreated bash script (*.sh), *_exp.list, and *_ko.list in OUTPUT_script_1.\n\n> See readme / lines 10-32 in bash script for what to do next.\n> See lines 128 - 154 in bash script for directories you need to create locally or on supercomputer.')
-
 
-	elif nofgenecandidates > 200:
-		# division based on 200 simulations (+2 for controls), 
-		# need X files which contain N simulations
-		# divide into X new txt files > ko list, exp list in loop
-		# modify X generic scripts 
-
-		division = nofgenecandidates / 200
-		divisions = math.ceil(division)
-		penultimatedivision = divisions - 1
-
-		divisioncounter = 1
-		startinggene = 0
-		scriptnameincrement = 1
-		
-		while divisioncounter < divisions:
-			endinggene = startinggene + 200
-			part_gene_list = gene_list_retrieved[startinggene:endinggene]
-			scriptnameincrement_str = str(scriptnameincrement)
-		
-			#create knock out txt file
-			tempko = kolist.format(scriptnameincrement_str)
-			with open(tempko, 'w+', newline ='\n') as ko:
-				for gene in part_gene_list:
-					ko.write("%s\n" % gene)
-				ko.write("%s\n" % "")
-				ko.write("%s\n" % "'MG_006',")
-
-			#create exp txt file
-			tempexp = explist.format(scriptnameincrement_str)
-			with open(tempexp, 'w+', newline ='\n') as exp:
-				for gene in range(startinggene,endinggene):
-					exp.write("%s\n" % SIMNAME)
-				#append control simulations to gene candidates
-				exp.write("%s\n" % "wildtype")
-				exp.write("%s\n" % "mutant")
-
-			#create simulation bash script
-			user_input_values = open(user_input_txt, "r+")
-			tempscript = open(templatescript).read()
-
-			value_list = [line.rstrip() for line in user_input_values.readlines()]
-			user_input_values.close()
-			value_list = value_list[0:10]
-
-			### List of templatescript KEYS that need to change
-			### Imported from user_input.txt
-			### NAME
-			name_value = value_list[0]
-			name_value = name_value.split("\t")
-			name_value = name_value[1]
-			tempscript = re.sub(r"NAME", name_value, tempscript, flags=re.MULTILINE)
-			### EMAIL
-			email_value = value_list[1]
-			email_value = email_value.split("\t")
-			email_value = email_value[1]
-			tempscript = re.sub(r"EMAIL", email_value, tempscript, flags=re.MULTILINE)
-			### DEPARTMENT
-			department_value = value_list[2]
-			department_value = department_value.split("\t")
-			department_value = department_value[1]
-			tempscript = re.sub(r"DEPARTMENT", department_value, tempscript, flags=re.MULTILINE)
-			### UNI
-			uni_value = value_list[3]
-			uni_value = uni_value.split("\t")
-			uni_value = uni_value[1]
-			tempscript = re.sub(r"UNI", uni_value, tempscript, flags=re.MULTILINE)
-			### SUPERPC
-			superpc_value = value_list[4]
-			superpc_value = superpc_value.split("\t")
-			superpc_value = superpc_value[1]
-			tempscript = re.sub(r"SUPERPC", superpc_value, tempscript, flags=re.MULTILINE)
-			### SUPERQUEUE
-			superqueue_value = value_list[5]
-			superqueue_value = superqueue_value.split("\t")
-			superqueue_value = superqueue_value[1]
-			tempscript = re.sub(r"SUPERQUEUE", superqueue_value, tempscript, flags=re.MULTILINE)
-			### GROUP
-			GROUP_value = value_list[6]
-			GROUP_value = GROUP_value.split("\t")
-			GROUP_value = GROUP_value[1]
-			tempscript = re.sub(r"GROUP", GROUP_value, tempscript, flags=re.MULTILINE)
-			### USER
-			USER_value = value_list[7]
-			USER_value = USER_value.split("\t")
-			USER_value = USER_value[1]
-			tempscript = re.sub(r"USER", USER_value, tempscript, flags=re.MULTILINE)
-			### PROJECTFOLDER
-			projectfolder_value = value_list[8]
-			projectfolder_value = projectfolder_value.split("\t")
-			projectfolder_value = projectfolder_value[1]
-			tempscript = re.sub(r"PROJECTFOLDER", projectfolder_value, tempscript, flags=re.MULTILINE)
-			
-			### Decided by script
-			### JOB is determined globally, so that users can see folder structure
-			job_clone = JOB.format(scriptnameincrement_str)
-			tempscript = re.sub(r"JOBx", job_clone, tempscript, flags=re.MULTILINE)
-
-			### ENDTIMENAME default is 'e', producing 'e' + 'ndtimes.txt'
-			ENDTIMENAME = 'inputko{}_e'
-			endtimename_clone = ENDTIMENAME.format(scriptnameincrement_str)
-			tempscript = re.sub(r"'e'", endtimename_clone, tempscript, flags=re.MULTILINE)
-
-			### Calculate: DATE, SIMNUMBER
-			### DATE
-			DATE = "{:%Y-%m-%d}".format(datetime.now())
-			tempscript = re.sub(r"DATE", DATE, tempscript, flags=re.MULTILINE)
-			
-			### SIMNUMBER
-			SIMNUMBER = 202
-			SIMNUMBER = str(SIMNUMBER)
-			tempscript = re.sub(r"SIMNUMBER", SIMNUMBER, tempscript, flags=re.MULTILINE)
-
-			tempexpscript = experimentscript.format(scriptnameincrement_str)
-			expscript = open(tempexpscript, 'w+', newline ='\n')
-			expscript.write(tempscript)
-
-			startinggene = startinggene + 200
-			scriptnameincrement = scriptnameincrement + 1
-			divisioncounter = divisioncounter + 1
-			ko.close()
-			exp.close()
-			expscript.close()
-
-		while divisioncounter == divisions:
-			endinggene = nofgenecandidates
-			part_gene_list = gene_list_retrieved[startinggene:endinggene]
-			scriptnameincrement_str = str(scriptnameincrement)
-
-			#create knock out txt file
-			tempko = kolist.format(scriptnameincrement_str)
-			with open(tempko, 'w+', newline ='\n') as ko:
-				for gene in part_gene_list:
-					ko.write("%s\n" % gene)
-				ko.write("%s\n" % "")
-				ko.write("%s\n" % "'MG_006',")
-
-			#create exp txt file
-			tempexp = explist.format(scriptnameincrement_str)
-			with open(tempexp, 'w+', newline ='\n') as exp:
-				for gene in range(startinggene,endinggene):
-					exp.write("%s\n" % SIMNAME)
-				#append control simulations to gene candidates
-				exp.write("%s\n" % "wildtype")
-				exp.write("%s\n" % "mutant")
-
-			#create simulation bash script
-			user_input_values = open(user_input_txt, "r+")
-			tempscript = open(templatescript).read()
-
-			value_list = [line.rstrip() for line in user_input_values.readlines()]
-			user_input_values.close()
-			value_list = value_list[0:10]
-
-			### List of templatescript KEYS that need to change
-			### Imported from user_input.txt
-			### NAME
-			name_value = value_list[0]
-			name_value = name_value.split("\t")
-			name_value = name_value[1]
-			tempscript = re.sub(r"NAME", name_value, tempscript, flags=re.MULTILINE)
-			### EMAIL
-			email_value = value_list[1]
-			email_value = email_value.split("\t")
-			email_value = email_value[1]
-			tempscript = re.sub(r"EMAIL", email_value, tempscript, flags=re.MULTILINE)
-			### DEPARTMENT
-			department_value = value_list[2]
-			department_value = department_value.split("\t")
-			department_value = department_value[1]
-			tempscript = re.sub(r"DEPARTMENT", department_value, tempscript, flags=re.MULTILINE)
-			### UNI
-			uni_value = value_list[3]
-			uni_value = uni_value.split("\t")
-			uni_value = uni_value[1]
-			tempscript = re.sub(r"UNI", uni_value, tempscript, flags=re.MULTILINE)
-			### SUPERPC
-			superpc_value = value_list[4]
-			superpc_value = superpc_value.split("\t")
-			superpc_value = superpc_value[1]
-			tempscript = re.sub(r"SUPERPC", superpc_value, tempscript, flags=re.MULTILINE)
-			### SUPERQUEUE
-			superqueue_value = value_list[5]
-			superqueue_value = superqueue_value.split("\t")
-			superqueue_value = superqueue_value[1]
-			tempscript = re.sub(r"SUPERQUEUE", superqueue_value, tempscript, flags=re.MULTILINE)
-			### GROUP
-			GROUP_value = value_list[6]
-			GROUP_value = GROUP_value.split("\t")
-			GROUP_value = GROUP_value[1]
-			tempscript = re.sub(r"GROUP", GROUP_value, tempscript, flags=re.MULTILINE)
-			### USER
-			USER_value = value_list[7]
-			USER_value = USER_value.split("\t")
-			USER_value = USER_value[1]
-			tempscript = re.sub(r"USER", USER_value, tempscript, flags=re.MULTILINE)
-			### PROJECTFOLDER
-			projectfolder_value = value_list[8]
-			projectfolder_value = projectfolder_value.split("\t")
-			projectfolder_value = projectfolder_value[1]
-			tempscript = re.sub(r"PROJECTFOLDER", projectfolder_value, tempscript, flags=re.MULTILINE)
-			
-			### Decided by script
-			### JOB is determined globally, so that users can see folder structure
-			job_clone = JOB.format(scriptnameincrement_str)
-			tempscript = re.sub(r"JOBx", job_clone, tempscript, flags=re.MULTILINE)
-
-			### ENDTIMENAME default is 'e', producing 'e' + 'ndtimes.txt'
-			ENDTIMENAME = 'inputko{}_e'
-			endtimename_clone = ENDTIMENAME.format(scriptnameincrement_str)
-			tempscript = re.sub(r"'e'", endtimename_clone, tempscript, flags=re.MULTILINE)
-
-			### Calculate: DATE, SIMNUMBER
-			### DATE
-			DATE = "{:%Y-%m-%d}".format(datetime.now())
-			tempscript = re.sub(r"DATE", DATE, tempscript, flags=re.MULTILINE)
-			
-			### SIMNUMBER
-			SIMNUMBER = (nofgenecandidates - (penultimatedivision*200))+2
-			SIMNUMBER = str(SIMNUMBER)
-			tempscript = re.sub(r"SIMNUMBER", SIMNUMBER, tempscript, flags=re.MULTILINE)
-
-			tempexpscript = experimentscript.format(scriptnameincrement_str)
-			expscript = open(tempexpscript, 'w+', newline ='\n')
-			expscript.write(tempscript)
-
-			ko.close()
-			exp.close()
-			expscript.close()
-
-			break
+		# sim number -> gene manifest next to the ko.list
+		writeManifest(tempko, tempexp, part_gene_list)
+		# run / submit the job with the backend chosen in INPUT_script_1/backend.txt, any retries of an earlier run forgotten
+		clearRetries('INPUT_script_2/' + endtimename_clone + 'ndtimes.txt')
+		submitJob(job_clone, tempexpscript, tempko, tempexp, ARRAY, 'INPUT_script_2/' + endtimename_clone + 'ndtimes.txt')
 
+	if len(divisions) == 1:
+		print('\nCreated bash script (*.sh), *_exp.list, and *_ko.list in OUTPUT_script_1.\n\n> See readme / lines 10-32 in bash script for what to do next.\n> See lines 128 - 154 in bash script for directories you need to create locally or on supercomputer.')
+	else:
 		print('\nCreated multiple bash scripts (*.sh), *_exp.lists, and *_ko.lists in OUTPUT_script_1.\n\n> See readme / lines 10-32 in bash script for what to do next.\n> See lines 128 - 154 in bash script for directories you need to create locally or on supercomputer.')
 
-	deletionlog = "OUTPUT_final/deletionlog.txt"
-	log = open(deletionlog,"a+", newline ='\n')
+	log = deletionLog()
 	log.write("\nCreated bash script/s (*.sh), *_exp.list/s, and *_ko.list/s in OUTPUT_script_1.\n\n> See readme / lines 10-32 in bash script for what to do next.\n> See lines 128 - 154 in bash script for directories you need to create locally or on supercomputer.\n")
 	log.write("\nYour/one of your expected folder structures is:\n")
-	log.write(f'- projects\n\t- {GROUP_value}\n\t\t- {USER_value}\n\t\t\t- output\n\t\t\t\t- {projectfolder_value}\n\t\t\t\t\t- {job}\n\t\t\t\t\t\t- {simname}\n\t\t\t\t\t\t- wildtype\n\t\t\t\t\t\t- mutant\n\t\t\t\t\t\t- pdfs\n\t\t\t\t\t\t- figs\n\n')
+	log.write(f'- projects\n\t- {user_values["GROUP"]}\n\t\t- {user_values["USER"]}\n\t\t\t- output\n\t\t\t\t- {user_values["PROJECTFOLDER"]}\n\t\t\t\t\t- {job}\n\t\t\t\t\t\t- {simname}\n\t\t\t\t\t\t- wildtype\n\t\t\t\t\t\t- mutant\n\t\t\t\t\t\t- pdfs\n\t\t\t\t\t\t- figs\n\n')
 	log.close()
 
 def main():
@@ -5,7 +5,8 @@
 # Last Updated: 2019-06-04
 
 """
-Stage 2: 26 deletion segments, ranging in size from 100% to 12.5% of the low / no essentiality genes, are generated. 
+Stage 2: deletion segments, by default 26 ranging in size from 100% to 12.5% of the low / no essentiality genes, are generated. 
+The segment sizes and layouts follow SCHEDULE (see segments.py, a coarser or finer sweep for the genome size / cluster budget).
 Deletion segments that do not prevent division go to Stage 3. 
 Create deletion segments from inputko*_endtimes.txt, output segments bash scripts and text files.
 Expects: Place N inputko*.txt files in INPUT_script_2 folder.
@@ -15,9 +16,18 @@ Output: deletion segments, deletion segments list, single bash script and exp /
 # Imports
 import os
 import fnmatch
-import re
-import math
+from sys import exit
 from datetime import datetime
+from geneset import loadRegistry
+from outcomecache import cachedArray, cachedResults
+from manifest import checkManifest, writeManifest
+from jobtemplate import loadTemplate, userValues
+from jobbackend import packSize, submitJob
+from arraychunks import arrayLimits, jobArrays
+from arraypacks import packedArray, packTemplate
+from simretry import RETRYENDTIMES, clearRetries, resubmitCrashedSims, retriedResultLines
+from runlog import deletionLog
+from segments import SCHEDULE as DEFAULTSCHEDULE, parseCode, segmentFileName, segmentSlices
 
 # Global variables
 #JOB = "What is this experiment/run of simulations called? "
@@ -26,6 +36,8 @@ JOB = name + 'divide'
 SIMNAMESTART = len(name)
 SIMNAMEEND = (len(JOB))
 SIMNAME = JOB[SIMNAMESTART:SIMNAMEEND]
+# deletion segments of Stage 2, (percent, 'anchored' / 'tiled') tiers, see segments.py (script_3.py follows alldivisionsegments_codes.txt)
+SCHEDULE = DEFAULTSCHEDULE
 
 def splashscreen():
     """ Fancy splash screen for Lego scripts """
@@ -33,90 +45,56 @@ def splashscreen():
     pass
 
 def interpretResults():
-    """ Match the simulation results of Stage 1 to the knocked out gene, create unsortedsimresults and matchedgeneresults.txt. """
+    """ Match the simulation results of Stage 1 to the knocked out gene, create matchedgeneresults.txt. """
 
     explist_path = "OUTPUT_script_1/mineinputko{}_exp.list"
+    kolist_path = "OUTPUT_script_1/mineinputko{}_ko.list"
     genelist = "OUTPUT_script_1/gene_list.txt"
     endtimes = "INPUT_script_2/inputko{}_endtimes.txt"
-    unsortedsimresults = "OUTPUT_script_2/unsortedsimresults{}.txt"
     matchedresults = "OUTPUT_script_2/matchedgeneresults.txt"
     full_results_list = []
 
-    numberofendtimes = len(fnmatch.filter(os.listdir('INPUT_script_2/'), '*endtimes.txt'))
-    for n in range(1, numberofendtimes + 1):
-        iteration = n
-        nthendtimes = endtimes.format(iteration)
-
-        # open endtimes results and solve results being on two lines
-        firstinput = open(nthendtimes).read()
-        firstinput = re.sub(r"(\d)\n^(\w)", r"\1\t\2", firstinput, flags=re.MULTILINE)
+    # the endtimes.txt of each Stage 1 array, not those of its retries
+    numberofendtimes = len([endtimesname for endtimesname in fnmatch.filter(os.listdir('INPUT_script_2/'), '*endtimes.txt') if not RETRYENDTIMES.search(endtimesname)])
 
-        nthunsortedsimresults = unsortedsimresults.format(iteration)
-        firstoutput = open(nthunsortedsimresults,"w+", newline ='\n')
-        firstoutput.truncate()
-        firstoutput.write(firstinput)
-        firstoutput.close()
+    # simulate the crashed sims again before matching (RETRIES in INPUT_script_1/backend.txt, see simretry.py)
+    missing = []
+    for n in range(1, numberofendtimes + 1):
+        missing.extend(resubmitCrashedSims(kolist_path.format(n), explist_path.format(n), endtimes.format(n)))
+    if missing:
+        print(f"\nThe endtimes.txt of the retried sims are not all in place yet, missing: {missing}\nPlace them in INPUT_script_2 and run this script again." )
+        exit(0)
 
-        # open unsortedsimresults.txt, create list and a list of equal length, account for intended length, insert sim result in location, append lists together, save as file
-        secondinput = open(nthunsortedsimresults, "r+")
-        result_list = [line.rstrip() for line in secondinput.readlines()]
+    thirdinput = open(genelist, "r+")
+    gene_list = [line.rstrip() for line in thirdinput.readlines()]
 
-        # create an equal length list of default 'No_Result'
-        result_list_copy = []
-        for line in result_list:
-            result_list_copy.append('No_Result')
+    for n in range(1, numberofendtimes + 1):
+        iteration = n
+        nthendtimes = endtimes.format(iteration)
 
-        # add additional lines to account for crashed sims
+        # read endtimes results (one or two lines per sim, in finishing order, with those of any retries) and place each at its sim number, 'No_Result' for crashed sims
         explist = explist_path.format(iteration)
         lenexplist = sum(1 for line in open(explist))
-        lenendtimes = sum(1 for line in open(nthunsortedsimresults))
-        difference = (lenexplist - lenendtimes)
-        for iteration in range(0, difference):
-            result_list_copy.append('No_Result')
 
         # remove the control sims for results (the last two sims in every *exp.list)
         wildtype = lenexplist-1
         mutant = lenexplist
-
-        # copy actual results into prepared list, by deleting and inserting at sorted location (row = sim number (0 indexed))
-        for line in result_list:
-            results = line.split("\t")
-            sim = results[0]
-            sim = int(sim)
-            if sim == mutant:
-                continue
-            elif sim == wildtype:
-                continue
-            else:
-                #account for 0 index
-                sim = sim-1
-                time = results[1]
-                outcome = results[2:]
-                outcome = '\t'.join(outcome)
-                #print(result_list_copy[sim-1])
-                #print(result_list_copy[sim])
-                #print(result_list_copy[sim+1])
-                del result_list_copy[sim]
-                #print(result_list_copy[sim-1])
-                #print(result_list_copy[sim])
-                #print(result_list_copy[sim+1])
-                new_result = time + '\t' + outcome
-                result_list_copy.insert(sim, new_result)
-                #print(result_list_copy[sim-1])
-                #print(result_list_copy[sim])
-                #print(result_list_copy[sim+1])
-                #input("Press Enter to continue...")
+        result_list_copy = retriedResultLines(nthendtimes, lenexplist, skip={wildtype, mutant})
+        # store the new results, fill the knockouts that were not simulated (known outcome) from OUTPUT_final/outcomecache.sqlite
+        result_list_copy = cachedResults(kolist_path.format(iteration), result_list_copy)
 
         # remove the 'NoResult' for wildtype and mutant sims that were not copied
         result_list_copy = result_list_copy[:-2]
 
+        # the sims must still be the genes their manifest recorded when the job was submitted (manifest.py)
+        if os.path.isfile(kolist_path.format(iteration)):
+            checkManifest(kolist_path.format(iteration), gene_list[len(full_results_list):len(full_results_list) + len(result_list_copy)])
+
         # append the output of this loop / list to full results list
         for line in result_list_copy:
             full_results_list.append(line)
 
     # zip fullresults list and gene_list.txt
-    thirdinput = open(genelist, "r+")
-    gene_list = [line.rstrip() for line in thirdinput.readlines()]
     full_results_list = zip(gene_list, full_results_list)
 
     # save matchedresults in outputdir
@@ -129,8 +107,7 @@ def interpretResults():
 
     print('\nHave matched the simulation results with gene codes and saved the results in OUTPUT_script_2/matchedgeneresults.txt.\n')
 
-    deletionlog = "OUTPUT_final/deletionlog.txt"
-    log = open(deletionlog,"a+", newline ='\n')
+    log = deletionLog()
     log.write("\nHave matched the simulation results with gene codes and saved the results in OUTPUT_script_2/matchedgeneresults.txt.\n")
     log.close()
 
@@ -170,17 +147,12 @@ def createNEList():
          neresults_gene_list.append(line)
 
     if os.path.isfile(exclusionlist):
+        # excluded genes as a GeneSet, so each non essential gene is checked once (O(1)) rather than searched for and deleted
+        registry = loadRegistry()
         exclusiongenes = open(exclusionlist, "r+")
-        exclusiongenes_list = [line.rstrip() for line in exclusiongenes.readlines()]
-        for gene in exclusiongenes_list:
-            genelocation = exclusiongenes_list.index(gene)
-            del exclusiongenes_list[genelocation]
-            gene = gene + ' '
-            exclusiongenes_list.insert(genelocation, gene)
-
-        for excludedgene in exclusiongenes_list:
-            genelocation = neresults_gene_list.index(excludedgene)
-            del neresults_gene_list[genelocation]
+        excluded = registry.parse(exclusiongenes.read())
+        exclusiongenes.close()
+        neresults_gene_list = [line for line in neresults_gene_list if line not in excluded]
 
     # save non_essential_genes in output dir
     neresults = open(nonessential,"w+", newline ='\n')
@@ -191,95 +163,30 @@ def createNEList():
     neresults.close()
 
     print('\nHave filtered the results (deletions that still produce dividing cells) and saved in OUTPUT_script_2/nonessential.txt.\n')
-    deletionlog = "OUTPUT_final/deletionlog.txt"
-    log = open(deletionlog,"a+", newline ='\n')
+    log = deletionLog()
     log.write("\nHave filtered the results (deletions that still produce dividing cells) and saved in OUTPUT_script_2/nonessential.txt.\n")
+    log.event('nonessential', genes=len(neresults_gene_list))
     log.close()
 
-def segmentGeneration(segment_n, segment_s, neresults_gene_list):
+def segmentGeneration(code, start, end, neresults_gene_list):
     """ Daughter function of createDivisionSegments()
-        used to select which genes to include in the 26 deletion segments """
+        used to select the genes of a deletion segment, start / end from segments.segmentSlices() """
 
     divisionseg = "OUTPUT_script_2/divisionsegment{}.txt"
 
-    # 26 set segments
     whole = len(neresults_gene_list)
-    hundred = 100
-    zero = 0
-    # math.trunc = round down > prevent overlapping gene knockouts (! may result in genes being missed)
-
-    clonelist = neresults_gene_list
+    percent, letter = parseCode(code)
+    percent = '{:g}'.format(percent)
 
-    ### percentage calculation (from segment_name which is passed into the function)
-    percent = segment_n
-
-    ngenes = (whole/hundred)*percent
-    ngenes = math.trunc(ngenes)
+    ### the segments of a tier cover every gene (segments.py), no gene is missed
+    divisionsegment_list = neresults_gene_list[start:end]
+    ngenes = len(divisionsegment_list)
     inversengenes = whole - ngenes
     print(f"\n{percent}% gene deletion = {ngenes} genes deleted out of {whole} non-essential genes, leaving {inversengenes} not deleted.")
 
-    ### gene selection depending on percentage size and starting gene list from left or right (/top or bottom)
-    if segment_s == 'a' and percent > 49:
-        ### a (left anchored) > arbitary in the case of 100
-        leftstart = zero
-        leftend = whole - inversengenes
-        divisionsegment_list = clonelist[leftstart:leftend]
-    elif segment_s == 'b' and percent > 49:
-        ### b (right anchored)
-        rightstart = zero + inversengenes
-        rightend = whole
-        divisionsegment_list = clonelist[rightstart:rightend]
-    elif segment_s == 'a' and percent < 49 :
-        start = zero
-        end = ngenes + 1
-        divisionsegment_list = clonelist[start:end]
-    elif segment_s == 'b' and percent < 49 :
-        start = ngenes + 1
-        end = ngenes*2 + 2
-        divisionsegment_list = clonelist[start:end]
-    elif segment_s == 'c' and percent == 33:
-        start = ngenes*2 + 2
-        end = whole
-        divisionsegment_list = clonelist[start:end]
-    elif segment_s == 'c' and percent < 33:
-        start = ngenes*2 + 2
-        end = ngenes*3 + 3
-        divisionsegment_list = clonelist[start:end]
-    elif segment_s == 'd' and percent == 25:
-        start = ngenes*3 + 3
-        end = whole
-        divisionsegment_list = clonelist[start:end]
-    elif segment_s == 'd' and percent == 12.5:
-        start = ngenes*3 + 3
-        end = ngenes*4 + 4
-        divisionsegment_list = clonelist[start:end]
-    elif segment_s == 'e' and percent == 12.5:
-        start = ngenes*4 + 4
-        end = ngenes*5 + 5
-        divisionsegment_list = clonelist[start:end]
-    elif segment_s == 'f' and percent == 12.5:
-        start = ngenes*5 + 5
-        end = ngenes*6 + 6
-        divisionsegment_list = clonelist[start:end]
-    elif segment_s == 'g' and percent == 12.5:
-        start = ngenes*6 + 6
-        end = ngenes*7 + 7
-        divisionsegment_list = clonelist[start:end]
-    elif segment_s == 'h' and percent == 12.5:
-        start = ngenes*7 + 7
-        end = whole
-        divisionsegment_list = clonelist[start:end]
-
     ### output to own text file
-    if percent == 100:
-        divisionsegment_name = str(segment_n)
-        divisionsegment = divisionseg.format(divisionsegment_name)
-    elif percent == 12.5:
-        divisionsegment_name = '12_5' + segment_s
-        divisionsegment = divisionseg.format(divisionsegment_name)
-    else:
-        divisionsegment_name = str(segment_n) + segment_s
-        divisionsegment = divisionseg.format(divisionsegment_name)
+    divisionsegment_name = segmentFileName(code)
+    divisionsegment = divisionseg.format(divisionsegment_name)
 
     output_divisionsegment = open(divisionsegment,"w+", newline ='\n')
     output_divisionsegment.truncate()
@@ -289,35 +196,26 @@ def segmentGeneration(segment_n, segment_s, neresults_gene_list):
 
     print(f'\nHave created the {percent}% deletion segment in OUTPUT_script_2/divisionsegment{divisionsegment_name}.txt')
 
-    deletionlog = "OUTPUT_final/deletionlog.txt"
-    log = open(deletionlog,"a+", newline ='\n')
+    log = deletionLog()
     log.write(f"\nHave created the {percent}% deletion segment in OUTPUT_script_2/divisionsegment{divisionsegment_name}.txt\n")
     log.close()
 
     return divisionsegment_list
 
-def outputToLists(segment_n, segment_s, alldivisionsegments_codes, alldivisionsegments_list, temp_list, trigger):
+def outputToLists(code, alldivisionsegments_codes, alldivisionsegments_list, temp_list, trigger):
     """ Daughter function of createDivisionSegments()
-        used to save the 26 deletion segments as seperate files,
+        used to save the deletion segments as seperate files,
         and a combined file on the final segment / YES trigger """
 
     alldivisionsegments_txt = "OUTPUT_script_2/alldivisionsegments.txt"
     alldivisionsegments_codes_txt = "OUTPUT_script_2/alldivisionsegments_codes.txt"
 
-    if segment_n == 100:
-        ### output to alldivisionsegments_list and codes
-        alldivisionsegments_codes.append(str(segment_n) + '\n')
-        alldivisionsegments_list.append(str(segment_n) + '\n')
-        for line in temp_list:
-            alldivisionsegments_list.append(line)
-        alldivisionsegments_list.append('\n')
-    else:
-        ### output to alldivisionsegments_list and codes
-        alldivisionsegments_codes.append(str(segment_n) + segment_s + '\n')
-        alldivisionsegments_list.append(str(segment_n) + segment_s + '\n')
-        for line in temp_list:
-            alldivisionsegments_list.append(line)
-        alldivisionsegments_list.append('\n')
+    ### output to alldivisionsegments_list and codes
+    alldivisionsegments_codes.append(code + '\n')
+    alldivisionsegments_list.append(code + '\n')
+    for line in temp_list:
+        alldivisionsegments_list.append(line)
+    alldivisionsegments_list.append('\n')
 
     if trigger == 'Yes':
         # OUTPUT alldivisionsegments_list to text
@@ -334,9 +232,8 @@ def outputToLists(segment_n, segment_s, alldivisionsegments_codes, alldivisionse
             output_alltxt2.write(line)
         output_alltxt2.close()
 
-        deletionlog = "OUTPUT_final/deletionlog.txt"
-        log = open(deletionlog,"a+", newline ='\n')
-        log.write("\nHave created the 26 deletion segments, see OUTPUT_script_2/alldivisionsegments.txt\n")
+        log = deletionLog()
+        log.write(f"\nHave created the {len(alldivisionsegments_codes)} deletion segments, see OUTPUT_script_2/alldivisionsegments.txt\n")
         log.close()
 
     else:
@@ -345,7 +242,7 @@ def outputToLists(segment_n, segment_s, alldivisionsegments_codes, alldivisionse
     return alldivisionsegments_codes, alldivisionsegments_list
 
 def createDivisionSegments():
-    """ Generates the 26 deletion segments """
+    """ Generates the deletion segments of SCHEDULE """
 
     nonessential = "OUTPUT_script_2/nonessential.txt"
     alldivisionsegments_list = []
@@ -359,146 +256,12 @@ def createDivisionSegments():
          line = line + ' '
          neresults_gene_list.append(line)
 
-    ### The 26 Segments
-
-    ## 100
-    segment_n = 100
-    segment_s = 'a'
-    temp_list = segmentGeneration(segment_n, segment_s, neresults_gene_list)
-    alldivisionsegments_codes, alldivisionsegments_list = outputToLists(segment_n, segment_s, alldivisionsegments_codes, alldivisionsegments_list, temp_list, 'No')
-
-    # 90a
-    segment_n = 90
-    segment_s = 'a'
-    temp_list = segmentGeneration(segment_n, segment_s, neresults_gene_list)
-    alldivisionsegments_codes, alldivisionsegments_list = outputToLists(segment_n, segment_s, alldivisionsegments_codes, alldivisionsegments_list, temp_list, 'No')
-    # 90b
-    segment_n = 90
-    segment_s = 'b'
-    temp_list = segmentGeneration(segment_n, segment_s, neresults_gene_list)
-    alldivisionsegments_codes, alldivisionsegments_list = outputToLists(segment_n, segment_s, alldivisionsegments_codes, alldivisionsegments_list, temp_list, 'No')
-
-    # 80a
-    segment_n = 80
-    segment_s = 'a'
-    temp_list = segmentGeneration(segment_n, segment_s, neresults_gene_list)
-    alldivisionsegments_codes, alldivisionsegments_list = outputToLists(segment_n, segment_s, alldivisionsegments_codes, alldivisionsegments_list, temp_list, 'No')
-    # 80b
-    segment_n = 80
-    segment_s = 'b'
-    temp_list = segmentGeneration(segment_n, segment_s, neresults_gene_list)
-    alldivisionsegments_codes, alldivisionsegments_list = outputToLists(segment_n, segment_s, alldivisionsegments_codes, alldivisionsegments_list, temp_list, 'No')
-
-    # 70a
-    segment_n = 70
-    segment_s = 'a'
-    temp_list = segmentGeneration(segment_n, segment_s, neresults_gene_list)
-    alldivisionsegments_codes, alldivisionsegments_list = outputToLists(segment_n, segment_s, alldivisionsegments_codes, alldivisionsegments_list, temp_list, 'No')
-    # 70b
-    segment_n = 70
-    segment_s = 'b'
-    temp_list = segmentGeneration(segment_n, segment_s, neresults_gene_list)
-    alldivisionsegments_codes, alldivisionsegments_list = outputToLists(segment_n, segment_s, alldivisionsegments_codes, alldivisionsegments_list, temp_list, 'No')
-
-    # 60a
-    segment_n = 60
-    segment_s = 'a'
-    temp_list = segmentGeneration(segment_n, segment_s, neresults_gene_list)
-    alldivisionsegments_codes, alldivisionsegments_list = outputToLists(segment_n, segment_s, alldivisionsegments_codes, alldivisionsegments_list, temp_list, 'No')
-    # 60b
-    segment_n = 60
-    segment_s = 'b'
-    temp_list = segmentGeneration(segment_n, segment_s, neresults_gene_list)
-    alldivisionsegments_codes, alldivisionsegments_list = outputToLists(segment_n, segment_s, alldivisionsegments_codes, alldivisionsegments_list, temp_list, 'No')
-
-    # 50a
-    segment_n = 50
-    segment_s = 'a'
-    temp_list = segmentGeneration(segment_n, segment_s, neresults_gene_list)
-    alldivisionsegments_codes, alldivisionsegments_list = outputToLists(segment_n, segment_s, alldivisionsegments_codes, alldivisionsegments_list, temp_list, 'No')
-    # 50b
-    segment_n = 50
-    segment_s = 'b'
-    temp_list = segmentGeneration(segment_n, segment_s, neresults_gene_list)
-    alldivisionsegments_codes, alldivisionsegments_list = outputToLists(segment_n, segment_s, alldivisionsegments_codes, alldivisionsegments_list, temp_list, 'No')
-
-    # 33a
-    segment_n = 33
-    segment_s = 'a'
-    temp_list = segmentGeneration(segment_n, segment_s, neresults_gene_list)
-    alldivisionsegments_codes, alldivisionsegments_list = outputToLists(segment_n, segment_s, alldivisionsegments_codes, alldivisionsegments_list, temp_list, 'No')
-    # 33b
-    segment_n = 33
-    segment_s = 'b'
-    temp_list = segmentGeneration(segment_n, segment_s, neresults_gene_list)
-    alldivisionsegments_codes, alldivisionsegments_list = outputToLists(segment_n, segment_s, alldivisionsegments_codes, alldivisionsegments_list, temp_list, 'No')
-    # 33c
-    segment_n = 33
-    segment_s = 'c'
-    temp_list = segmentGeneration(segment_n, segment_s, neresults_gene_list)
-    alldivisionsegments_codes, alldivisionsegments_list = outputToLists(segment_n, segment_s, alldivisionsegments_codes, alldivisionsegments_list, temp_list, 'No')
-
-    # 25a
-    segment_n = 25
-    segment_s = 'a'
-    temp_list = segmentGeneration(segment_n, segment_s, neresults_gene_list)
-    alldivisionsegments_codes, alldivisionsegments_list = outputToLists(segment_n, segment_s, alldivisionsegments_codes, alldivisionsegments_list, temp_list, 'No')
-    # 25b
-    segment_n = 25
-    segment_s = 'b'
-    temp_list = segmentGeneration(segment_n, segment_s, neresults_gene_list)
-    alldivisionsegments_codes, alldivisionsegments_list = outputToLists(segment_n, segment_s, alldivisionsegments_codes, alldivisionsegments_list, temp_list, 'No')
-    # 25c
-    segment_n = 25
-    segment_s = 'c'
-    temp_list = segmentGeneration(segment_n, segment_s, neresults_gene_list)
-    alldivisionsegments_codes, alldivisionsegments_list = outputToLists(segment_n, segment_s, alldivisionsegments_codes, alldivisionsegments_list, temp_list, 'No')
-    # 25d
-    segment_n = 25
-    segment_s = 'd'
-    temp_list = segmentGeneration(segment_n, segment_s, neresults_gene_list)
-    alldivisionsegments_codes, alldivisionsegments_list = outputToLists(segment_n, segment_s, alldivisionsegments_codes, alldivisionsegments_list, temp_list, 'No')
-
-    # 12_5a
-    segment_n = 12.5
-    segment_s = 'a'
-    temp_list = segmentGeneration(segment_n, segment_s, neresults_gene_list)
-    alldivisionsegments_codes, alldivisionsegments_list = outputToLists(segment_n, segment_s, alldivisionsegments_codes, alldivisionsegments_list, temp_list, 'No')
-    # 12_5b
-    segment_n = 12.5
-    segment_s = 'b'
-    temp_list = segmentGeneration(segment_n, segment_s, neresults_gene_list)
-    alldivisionsegments_codes, alldivisionsegments_list = outputToLists(segment_n, segment_s, alldivisionsegments_codes, alldivisionsegments_list, temp_list, 'No')
-    # 12_5c
-    segment_n = 12.5
-    segment_s = 'c'
-    temp_list = segmentGeneration(segment_n, segment_s, neresults_gene_list)
-    alldivisionsegments_codes, alldivisionsegments_list = outputToLists(segment_n, segment_s, alldivisionsegments_codes, alldivisionsegments_list, temp_list, 'No')
-    # 12_5d
-    segment_n = 12.5
-    segment_s = 'd'
-    temp_list = segmentGeneration(segment_n, segment_s, neresults_gene_list)
-    alldivisionsegments_codes, alldivisionsegments_list = outputToLists(segment_n, segment_s, alldivisionsegments_codes, alldivisionsegments_list, temp_list, 'No')
-    # 12_5e
-    segment_n = 12.5
-    segment_s = 'e'
-    temp_list = segmentGeneration(segment_n, segment_s, neresults_gene_list)
-    alldivisionsegments_codes, alldivisionsegments_list = outputToLists(segment_n, segment_s, alldivisionsegments_codes, alldivisionsegments_list, temp_list, 'No')
-    # 12_5f
-    segment_n = 12.5
-    segment_s = 'f'
-    temp_list = segmentGeneration(segment_n, segment_s, neresults_gene_list)
-    alldivisionsegments_codes, alldivisionsegments_list = outputToLists(segment_n, segment_s, alldivisionsegments_codes, alldivisionsegments_list, temp_list, 'No')
-    # 12_5g
-    segment_n = 12.5
-    segment_s = 'g'
-    temp_list = segmentGeneration(segment_n, segment_s, neresults_gene_list)
-    alldivisionsegments_codes, alldivisionsegments_list = outputToLists(segment_n, segment_s, alldivisionsegments_codes, alldivisionsegments_list, temp_list, 'No')
-    # 12_5h
-    segment_n = 12.5
-    segment_s = 'h'
-    temp_list = segmentGeneration(segment_n, segment_s, neresults_gene_list)
-    alldivisionsegments_codes, alldivisionsegments_list = outputToLists(segment_n, segment_s, alldivisionsegments_codes, alldivisionsegments_list, temp_list, 'Yes')
+    ### The segments, in schedule order (the default SCHEDULE = the 26 segments, 100% to 12.5%)
+    segments = segmentSlices(len(neresults_gene_list), SCHEDULE)
+    for x, (code, start, end) in enumerate(segments, 1):
+        temp_list = segmentGeneration(code, start, end, neresults_gene_list)
+        trigger = 'Yes' if x == len(segments) else 'No'
+        alldivisionsegments_codes, alldivisionsegments_list = outputToLists(code, alldivisionsegments_codes, alldivisionsegments_list, temp_list, trigger)
 
 def createScripts(job, simname):
     """ Convert template script to bash script using user input, create exp and ko txt files """
@@ -506,27 +269,34 @@ def createScripts(job, simname):
     user_input_txt = "INPUT_script_1/user_input.txt"
     templatescript = "templatescript/TemplateScript.sh"
     divisions = "OUTPUT_script_2/alldivisionsegments.txt"
+    divisions_codes = "OUTPUT_script_2/alldivisionsegments_codes.txt"
     kolist = "OUTPUT_script_2/{}_ko.list"
     explist = "OUTPUT_script_2/{}_exp.list"
     experimentscript = "OUTPUT_script_2/{}.sh"
 
-    #create knock out txt file using the combined 26 segment file
+    # compiled once and user_input.txt read once, for every script of the stage
+    # (the packed template if PACK sims share an array task, INPUT_script_1/backend.txt, see arraypacks.py)
+    pack = packSize()
+    template = loadTemplate(packTemplate(templatescript, pack))
+    user_values = userValues(user_input_txt)
+    # arrays of at most MAXARRAYSIZE sims, THROTTLE at a time (INPUT_script_1/backend.txt), one per job if not set
+    maxarraysize, throttle = arrayLimits()
+
+    #create knock out txt file using the combined segment file
 
     kolist_clone = kolist.format(job)
     ko = open(kolist_clone, 'w+', newline ='\n')
-    kotempscript = open(divisions).read()
-    kotempscript = re.sub(r"\d\d\w\n", "", kotempscript, flags=re.MULTILINE)
-    kotempscript = re.sub(r"\d\d\.\d\w\n", "", kotempscript, flags=re.MULTILINE)
-    kotempscript = re.sub(r"\d\d\_\d\n", "", kotempscript, flags=re.MULTILINE)
-    kotempscript = re.sub(r"\d\d\_\d\d\n", "", kotempscript, flags=re.MULTILINE)
-    kotempscript = re.sub(r"\d\d\_\d\d\d\n", "", kotempscript, flags=re.MULTILINE)
+    # drop the segment code lines (any schedule's codes, see segments.py), keeping the gene lines
+    segmentcodes = set(open(divisions_codes).read().split())
+    kotempscript = ''.join(line for line in open(divisions) if line.rstrip("\n") not in segmentcodes)
     ko.write(kotempscript)
+    # count the knockout lines before the controls (flushed, so a short ko.list is not counted as empty)
+    ko.flush()
+    kocount = sum(1 for line in open(kolist_clone))
     #append control simulations to gene candidates
     ko.write("%s\n" % "")
     ko.write("%s\n" % "'MG_006',")
 
-    kocount = sum(1 for line in open(kolist_clone))
-
     #create exp txt file
 
     explist_clone = explist.format(job)
@@ -538,100 +308,50 @@ def createScripts(job, simname):
         exp.write("%s\n" % "wildtype")
         exp.write("%s\n" % "mutant")
 
-    #create simulation bash script
+    ko.close()
+    exp.close()
+
+    # sim number -> % board manifest next to the ko.list
+    with open(divisions_codes) as codes:
+        boardcodes = [line.strip() for line in codes if line.strip()]
+    writeManifest(kolist_clone, explist_clone, boardcodes)
 
-    user_input_values = open(user_input_txt, "r+")
-    tempscript = open(templatescript).read()
-    experimentscript_clone = experimentscript.format(job)
-    expscript = open(experimentscript_clone, 'w+', newline ='\n')
-
-    value_list = [line.rstrip() for line in user_input_values.readlines()]
-    user_input_values.close()
-    value_list = value_list[0:10]
-
-    ### List of templatescript KEYS that need to change
-    ### Imported from user_input.txt
-    ### NAME
-    name_value = value_list[0]
-    name_value = name_value.split("\t")
-    name_value = name_value[1]
-    tempscript = re.sub(r"NAME", name_value, tempscript, flags=re.MULTILINE)
-    ### EMAIL
-    email_value = value_list[1]
-    email_value = email_value.split("\t")
-    email_value = email_value[1]
-    tempscript = re.sub(r"EMAIL", email_value, tempscript, flags=re.MULTILINE)
-    ### DEPARTMENT
-    department_value = value_list[2]
-    department_value = department_value.split("\t")
-    department_value = department_value[1]
-    tempscript = re.sub(r"DEPARTMENT", department_value, tempscript, flags=re.MULTILINE)
-    ### UNI
-    uni_value = value_list[3]
-    uni_value = uni_value.split("\t")
-    uni_value = uni_value[1]
-    tempscript = re.sub(r"UNI", uni_value, tempscript, flags=re.MULTILINE)
-    ### SUPERPC
-    superpc_value = value_list[4]
-    superpc_value = superpc_value.split("\t")
-    superpc_value = superpc_value[1]
-    tempscript = re.sub(r"SUPERPC", superpc_value, tempscript, flags=re.MULTILINE)
-    ### SUPERQUEUE
-    superqueue_value = value_list[5]
-    superqueue_value = superqueue_value.split("\t")
-    superqueue_value = superqueue_value[1]
-    tempscript = re.sub(r"SUPERQUEUE", superqueue_value, tempscript, flags=re.MULTILINE)
-    ### GROUP
-    GROUP_value = value_list[6]
-    GROUP_value = GROUP_value.split("\t")
-    GROUP_value = GROUP_value[1]
-    tempscript = re.sub(r"GROUP", GROUP_value, tempscript, flags=re.MULTILINE)
-    ### USER
-    USER_value = value_list[7]
-    USER_value = USER_value.split("\t")
-    USER_value = USER_value[1]
-    tempscript = re.sub(r"USER", USER_value, tempscript, flags=re.MULTILINE)
-    ### PROJECTFOLDER
-    projectfolder_value = value_list[8]
-    projectfolder_value = projectfolder_value.split("\t")
-    projectfolder_value = projectfolder_value[1]
-    tempscript = re.sub(r"PROJECTFOLDER", projectfolder_value, tempscript, flags=re.MULTILINE)
+    #create simulation bash script
 
     ### Decided by script
     ### JOB is determined globally, so that users can see folder structure
     job_clone = JOB
-    tempscript = re.sub(r"JOBx", job_clone, tempscript, flags=re.MULTILINE)
 
     ### ENDTIMENAME default is 'e', producing 'e' + 'ndtimes.txt'
     ENDTIMENAME = 'divideko_e'
     endtimename_clone = ENDTIMENAME
-    tempscript = re.sub(r"'e'", endtimename_clone, tempscript, flags=re.MULTILINE)
 
-    ### Calculate: DATE, SIMNUMBER
+    ### Calculate: DATE, ARRAY
     ### DATE
     DATE = "{:%Y-%m-%d}".format(datetime.now())
-    tempscript = re.sub(r"DATE", DATE, tempscript, flags=re.MULTILINE)
-
-    ### SIMNUMBER
-    SIMNUMBER = kocount + 2
-    SIMNUMBER = str(SIMNUMBER)
-    tempscript = re.sub(r"SIMNUMBER", SIMNUMBER, tempscript, flags=re.MULTILINE)
 
-    expscript.write(tempscript)
+    ### ARRAY, knockouts with a known / pending outcome (OUTPUT_final/outcomecache.sqlite) are left out of the array
+    ARRAY = cachedArray(kolist_clone)
 
-    ko.close()
-    exp.close()
-    expscript.close()
+    # one bash script per array: the job, or its chunks if it has more sims than MAXARRAYSIZE (see arraychunks.py)
+    clearRetries('INPUT_script_3/' + endtimename_clone + 'ndtimes.txt')
+    for array in jobArrays(job_clone, endtimename_clone, kolist_clone, explist_clone, ARRAY, 2, 'INPUT_script_3/' + endtimename_clone + 'ndtimes.txt', maxarraysize, throttle):
+        experimentscript_clone = experimentscript.format(array.name)
+        with open(experimentscript_clone, 'w+', newline ='\n') as expscript:
+            ### templatescript placeholders (jobtemplate.py), the user_input.txt values and those decided by the script
+            values = dict(user_values, JOB=array.name, ENDTIMENAME=array.endtimename, DATE=DATE, ARRAY=packedArray(array.kolist, array.array, pack), SIMNUMBER=array.simnumber)
+            expscript.write(template.render(values))
+        # run / submit the job with the backend chosen in INPUT_script_1/backend.txt
+        submitJob(array.name, experimentscript_clone, array.kolist, array.explist, array.array, array.endtimes)
 
     print('\nCreated bash script (*.sh), *_exp.list, and *_ko.list in OUTPUT_script_2.\n\n> See readme / lines 10-32 in bash script for what to do next.\n> See lines 128 - 154 in bash script for directories you need to create locally or on supercomputer.')
     print('\nYour expected folder structure is:')
-    print(f'- projects\n\t- {GROUP_value}\n\t\t- {USER_value}\n\t\t\t- output\n\t\t\t\t- {projectfolder_value}\n\t\t\t\t\t- {job}\n\t\t\t\t\t\t- {simname}\n\t\t\t\t\t\t- wildtype\n\t\t\t\t\t\t- mutant\n\t\t\t\t\t\t- pdfs\n\t\t\t\t\t\t- figs')
+    print(f'- projects\n\t- {user_values["GROUP"]}\n\t\t- {user_values["USER"]}\n\t\t\t- output\n\t\t\t\t- {user_values["PROJECTFOLDER"]}\n\t\t\t\t\t- {job}\n\t\t\t\t\t\t- {simname}\n\t\t\t\t\t\t- wildtype\n\t\t\t\t\t\t- mutant\n\t\t\t\t\t\t- pdfs\n\t\t\t\t\t\t- figs')
 
-    deletionlog = "OUTPUT_final/deletionlog.txt"
-    log = open(deletionlog,"a+", newline ='\n')
+    log = deletionLog()
     log.write("\nCreated bash script (*.sh), *_exp.list, and *_ko.list in OUTPUT_script_2.\n\n> See readme / lines 10-32 in bash script for what to do next.\n> See lines 128 - 154 in bash script for directories you need to create locally or on supercomputer.\n")
     log.write("\nYour expected folder structure is:\n")
-    log.write(f'- projects\n\t- {GROUP_value}\n\t\t- {USER_value}\n\t\t\t- output\n\t\t\t\t- {projectfolder_value}\n\t\t\t\t\t- {job}\n\t\t\t\t\t\t- {simname}\n\t\t\t\t\t\t- wildtype\n\t\t\t\t\t\t- mutant\n\t\t\t\t\t\t- pdfs\n\t\t\t\t\t\t- figs\n\n')
+    log.write(f'- projects\n\t- {user_values["GROUP"]}\n\t\t- {user_values["USER"]}\n\t\t\t- output\n\t\t\t\t- {user_values["PROJECTFOLDER"]}\n\t\t\t\t\t- {job}\n\t\t\t\t\t\t- {simname}\n\t\t\t\t\t\t- wildtype\n\t\t\t\t\t\t- mutant\n\t\t\t\t\t\t- pdfs\n\t\t\t\t\t\t- figs\n\n')
     log.close()
 
 def main():
@@ -19,6 +19,19 @@ from itertools import chain, combinations
 import re
 from datetime import datetime
 import os
+import random
+from geneset import loadRegistry
+from outcomecache import cachedArray, cachedResults
+from manifest import checkManifest, comboNames, writeManifest
+from jobtemplate import loadTemplate, userValues
+from jobbackend import packSize, submitJob
+from arraychunks import arrayLimits, jobArrays
+from arraypacks import packedArray, packTemplate
+from simretry import clearRetries, resubmitCrashedSims, retriedResultLines
+from runlog import deletionLog
+from runstate import RunState, laneIds
+from combofile import readComboFile
+from segments import compatibleSegments, disjointCombinations, segmentFileName, tableMatching
 
 # Global variables
 #JOB = "What is this experiment/run of simulations called? "
@@ -27,6 +40,14 @@ JOB = name + 'conquer'
 SIMNAMESTART = len(name)
 SIMNAMEEND = (len(JOB))
 SIMNAME = JOB[SIMNAMESTART:SIMNAMEEND]
+# powerset order: None = canonical (order of the groups / segments), an integer = reproducible shuffle
+POWERSETSEED = None
+# number of variants (beam width): the largest dividing deletion segments carried forward as lanes red, yellow, blue, ... (runstate.laneIds)
+# more variants = more jobs per round, variants that converge onto the same deletion are merged by script_4X.py
+VARIANTS = 3
+# Stage 3 matching: True = every dividing segment sharing no gene with the variant, False = those of them listed in the table segments.COMPONENTS
+# (the default schedule only, other schedules always match every disjoint segment). Either way only disjoint segments are combined.
+DISJOINTMATCHING = True
 
 def splashscreen():
 	""" Fancy splash screen for Lego scripts """
@@ -38,85 +59,44 @@ def alreadyRunCheck():
 
 	# What round are we on? Input from conquerko = 1, input from gapko = n + 1, should work as the number of files decreases (i.e. red, yellow finish, leaving blue)
 	inputfile = "INPUT_script_3/divideko_endtimes.txt"
-	outputfile = "OUTPUT_script_3/{}conquer_blue_0.sh"
+	outputfile = "OUTPUT_script_3/{}conquer_red_0.sh"
 	outputfile = outputfile.format(name)
 
 	if os.path.isfile(inputfile) and os.path.isfile(outputfile):
 		print(f"You have expected files in your INPUT and OUTPUT folders for this script." )
-		print("\nThis suggests you have already run this script on this input. If you run it again the order of the powersets will randomise." )
-		print("\nIf you are mid simulation this make the interpretation of your results incorrect." )
+		print("\nThis suggests you have already run this script on this input. If you run it again the scripts are regenerated in the same order (unless POWERSETSEED is changed)." )
+		print("\nIf you are mid simulation and the scripts would change, this script stops rather than overwrite the *_manifest.txt your simulations were submitted with." )
 		response = input("\nDo you want to run this script? yes / no\n> " )
 		if response == 'no':
 			exit(0)
 
 def interpretResults():
-	""" Match the simulation results of Stage 2 to the % board, create unsortedsimresults and matchedresults.txt. """
+	""" Match the simulation results of Stage 2 to the % board, create matchedresults.txt. """
 
 	explist = "OUTPUT_script_2/{}divide_exp.list"
 	explist = explist.format(name)
+	kolist = "OUTPUT_script_2/{}divide_ko.list"
+	kolist = kolist.format(name)
 	boardlist = "OUTPUT_script_2/alldivisionsegments_codes.txt"
 	endtimes = "INPUT_script_3/divideko_endtimes.txt"
-	unsortedsimresults = "OUTPUT_script_3/unsortedsimresults.txt"
 	matchedresults = "OUTPUT_script_3/matchedresults.txt"
 	full_results_list = []
 
-	# open endtimes results and solve results being on two lines
-	firstinput = open(endtimes).read()
-	firstinput = re.sub(r"(\d)\n^(\w)", r"\1\t\2", firstinput, flags=re.MULTILINE)
-		
-	firstoutput = open(unsortedsimresults,"w+", newline ='\n')
-	firstoutput.truncate()
-	firstoutput.write(firstinput)
-	firstoutput.close()
-
-	# open unsortedsimresults.txt, create list and a list of equal length, account for intended length, insert sim result in location, append lists together, save as file
-	secondinput = open(unsortedsimresults, "r+")
-	result_list = [line.rstrip() for line in secondinput.readlines()]
+	# simulate the crashed sims again before matching (RETRIES in INPUT_script_1/backend.txt, see simretry.py)
+	missing = resubmitCrashedSims(kolist, explist, endtimes)
+	if missing:
+		print(f"\nThe endtimes.txt of the retried sims are not all in place yet, missing: {missing}\nPlace them in INPUT_script_3 and run this script again." )
+		exit(0)
 
-	# create an equal length list of default 'No_Result'
-	result_list_copy = []
-	for line in result_list:
-		result_list_copy.append('No_Result')
-
-	# add additional lines to account for crashed sims
+	# read endtimes results (one or two lines per sim, in finishing order, from each chunk if the job was split, with those of any retries) and place each at its sim number, 'No_Result' for crashed sims
 	lenexplist = sum(1 for line in open(explist))
-	lenendtimes = sum(1 for line in open(unsortedsimresults))
-	difference = (lenexplist - lenendtimes)
-	for iteration in range(0, difference):
-		result_list_copy.append('No_Result')
-		
+
 	# remove the control sims for results (the last two sims in every *exp.list)
 	wildtype = lenexplist-1
 	mutant = lenexplist
-
-	# copy actual results into prepared list, by deleting and inserting at sorted location (row = sim number (0 indexed))
-	for line in result_list:
-		results = line.split("\t")
-		sim = results[0]
-		sim = int(sim)
-		if sim == mutant:
-			continue
-		elif sim == wildtype:
-			continue
-		else: 
-			#account for 0 index
-			sim = sim-1
-			time = results[1]
-			outcome = results[2:]
-			outcome = '\t'.join(outcome)
-			#print(result_list_copy[sim-1])
-			#print(result_list_copy[sim])
-			#print(result_list_copy[sim+1])
-			del result_list_copy[sim]
-			#print(result_list_copy[sim-1])
-			#print(result_list_copy[sim])
-			#print(result_list_copy[sim+1])
-			new_result = time + '\t' + outcome
-			result_list_copy.insert(sim, new_result)
-			#print(result_list_copy[sim-1])
-			#print(result_list_copy[sim])
-			#print(result_list_copy[sim+1])
-			#input("Press Enter to continue...")
+	result_list_copy = retriedResultLines(endtimes, lenexplist, skip={wildtype, mutant})
+	# store the new results, fill the knockouts that were not simulated (known outcome) from OUTPUT_final/outcomecache.sqlite
+	result_list_copy = cachedResults(kolist, result_list_copy)
 
 	# remove the 'NoResult' for wildtype and mutant sims that were not copied
 	result_list_copy = result_list_copy[:-2]
@@ -128,6 +108,9 @@ def interpretResults():
 	# zip fullresults list and gene_list.txt
 	thirdinput = open(boardlist, "r+")
 	board_list = [line.rstrip() for line in thirdinput.readlines()]
+	# the sims must still be the % boards their manifest recorded when the job was submitted (manifest.py)
+	if os.path.isfile(kolist):
+		checkManifest(kolist, board_list)
 	full_results_list = zip(board_list, full_results_list)
 
 	# save matchedresults in outputdir
@@ -140,8 +123,7 @@ def interpretResults():
 	secondoutput.close()
 
 	print('\nHave matched the simulation results with % boards and saved the results in OUTPUT_script_3/matchedresults.txt.')
-	deletionlog = "OUTPUT_final/deletionlog.txt"
-	log = open(deletionlog,"a+", newline ='\n')
+	log = deletionLog()
 	log.write("\nHave matched the simulation results with % boards and saved the results in OUTPUT_script_3/matchedresults.txt.\n")
 	log.close()
 
@@ -157,19 +139,17 @@ def dividedAndProducedProteinRNA(line):
 		return False
 
 def successCheckAndVariants():
-	'''Check boards for success (i.e division) using matchedresults.txt (ordered largest to smallest when generated) and save top 3 largest deletions.
-		Top 3 are assigned to colours (red, yellow, blue) and used as three variants / avenues of deletion going forward.
+	'''Check boards for success (i.e division) using matchedresults.txt (ordered largest to smallest when generated) and save the VARIANTS (default 3) largest deletions.
+		These are assigned to colours (red, yellow, blue, ...) and used as variants / avenues of deletion going forward.
 		Creates successfulboards.txt + variants.txt.'''
 
 	matchedresults = "OUTPUT_script_3/matchedresults.txt"
 	variants = "OUTPUT_script_3/variants.txt"
 	successfulboards = "OUTPUT_script_3/successfulboards.txt"
 	divisionsegment_path = "OUTPUT_script_2/divisionsegment{}.txt"
-	deletionlog = "OUTPUT_final/deletionlog.txt"
 	
-	# add additional names to names list if you want to increase number of variants
-	# also add additional names in createScripts(), line ~367
-	names = ['red_0', 'yellow_0', 'blue_0']
+	# increase VARIANTS for more variants, createScripts() and script_4X.py follow variants.txt / runstate.json
+	names = [lane + '_0' for lane in laneIds(VARIANTS)]
 
 	boards = open(matchedresults, "r+")
 	board_list = [line.rstrip() for line in boards.readlines()]
@@ -183,17 +163,15 @@ def successCheckAndVariants():
 			line = line.split("\t")
 			line = line[0]
 			success_list.append(line)
-			if counter < 3: 
+			if counter < VARIANTS: 
 				variants_list.append(line)
 				counter = counter + 1
 
 	counter = 0
 	for line in success_list:
-		line = re.sub(r"(\d\d)\W(\d)", r"\1_\2", line)
-		success_division = divisionsegment_path.format(line) 
+		success_division = divisionsegment_path.format(segmentFileName(line))
 		success_division_contents = open(success_division).read()
 		success_division_contents = re.sub(r"\n", r"", success_division_contents)
-		line = re.sub(r"(\d\d)_(\d)", r"\1.\2", line)
 		del success_list[counter]
 		new_line = line + '\t' + success_division_contents + '\n'
 		success_list.insert(counter, new_line)
@@ -210,7 +188,7 @@ def successCheckAndVariants():
 	named_variants = zip(names, variants_list)
 	# save variants in output dir
 	variants_txt = open(variants,"w+", newline ='\n')
-	log = open(deletionlog,"a+", newline ='\n')
+	log = deletionLog()
 	log.write('Largest initial deletion segments:\n')
 	variants_txt.truncate() 
 	# convert zip created list of tuples, line by line into string 
@@ -218,99 +196,85 @@ def successCheckAndVariants():
 	  variants_txt.write('\t'.join(str(s) for s in line) + '\n')
 	  log.write('\t'.join(str(s) for s in line) + '\n')
 	variants_txt.close()
+	log.event('variants', variants=dict(zip(names, variants_list)), dividingboards=len(success_list))
 	log.close()
 
 	successlist = success_list
 
-	print('\nHave filtered the % boards results for successful division and largest 3 division segments, and saved in OUTPUT_script_3/successfulboards.txt + variants.txt.')
-	deletionlog = "OUTPUT_final/deletionlog.txt"
-	log = open(deletionlog,"a+", newline ='\n')
-	log.write("\nHave filtered the % boards results for successful division and largest 3 division segments.\n")
+	print(f'\nHave filtered the % boards results for successful division and largest {VARIANTS} division segments, and saved in OUTPUT_script_3/successfulboards.txt + variants.txt.')
+	log = deletionLog()
+	log.write(f"\nHave filtered the % boards results for successful division and largest {VARIANTS} division segments.\n")
 	log.close()
 
 	return successlist
 
-def powerset(iterable):
+def powerset(iterable, seed=None):
 	''' Daughter function of outputToLists() 
 		Generates a powerset, all possible unique combinations of a set, in this case our top 3 largest deletions (colour variants) and matching deletion segments
 		e.g. [1,2,3]) --> () (1,) (2,) (3,) (1,2) (1,3) (2,3) (1,2,3)
 		From this StackOverflow thread: https://stackoverflow.com/questions/464864/how-to-get-all-possible-combinations-of-a-list-s-elements
 		Which pulls from this python documentation: https://docs.python.org/3/library/itertools.html#itertools-recipes 
+		Order is deterministic: unique elements in the order given, the empty combination first, then by size (as the example).
+		A seed (POWERSETSEED) shuffles the elements reproducibly, the same seed always gives the same order.
 		'''
-	
-	s = list(set(iterable))  # set option = no duplicate elements
+
+	s = list(dict.fromkeys(iterable))  # no duplicate elements, order kept
+	if seed is not None:
+		random.Random(seed).shuffle(s)
 	return chain.from_iterable(combinations(s, r) for r in range(len(s)+1))
 
-def outputToLists(components, boardnames, genecodes, red_yellow_blue):
+def disjointPowerset(iterable, genesets, seed=None):
+	''' Daughter function of outputToLists()
+		powerset() of segments that share no genes (genesets: segment -> GeneSet), generated lazily by segments.disjointCombinations(),
+		combinations of overlapping segments and repeats of the same deleted genes are left out. Same order / seed as powerset(). '''
+
+	s = list(dict.fromkeys(iterable))
+	if seed is not None:
+		random.Random(seed).shuffle(s)
+	return disjointCombinations(s, genesets)
+
+def outputToLists(components, boardnames, genecodes, red_yellow_blue, genesets=None):
 	''' Daughter function of variantCombinations() 
-		Uses powerset() to generate combinations
+		Uses disjointPowerset() given the segments' genesets (as variantCombinations() does) to generate combinations, otherwise powerset()
 		Records the names of % boards in the combinations, and matches with the combined deleted genes
-		Outputs COLOUR_combosandgenes.txt'''
+		Outputs COLOUR_combosandgenes.txt, streamed a combination at a time'''
 
 	combos_genes = "OUTPUT_script_3/{}_combosandgenes.txt"
 	successfulcomponents = []
-	powersetcombos_key = []
-	genesdeleted = []
-	powersetcombos = []
 
 	### This checks the list of segments that have been logic matched to the largest deletion, against a 
 	###	a list of segments that produce a successfully dividing cell. Only those on both lists get kept
+	### board name -> board's gene codes (first occurrence kept, as boardnames.index() did)
+	boardgenes = {}
+	for board, genecode in zip(boardnames, genecodes):
+		boardgenes.setdefault(board, genecode)
 	for component in components:
-		for board in boardnames:
-			if component == board:
-				successfulcomponents.append(component)
-			else:
-				continue
-
-	### see http://book.pythontips.com/en/latest/enumerate.html for use of enumerate
-	### use it here to loop over the powerset of the successful components, skipping the first entry in the powerset (always = 0 components combination)
-	for i, combo in enumerate(powerset(successfulcomponents), 1):
-		# for each combination of matched segments, record the names of the segments, to give a conjoined name for the combination
-		combo = ' '.join(combo)
-		powersetcombos_key.append(combo)
-		
-		# then using the seperate names of the segments 
-		combosplit = combo.split(" ")
-		genesdeleted = []
-		for item in combosplit:
-			
-			# empty strings are considered FALSE normally. 
-			# Flip It - Is the string empty ( item.strip() )? IF NOT makes Yes = TRUE.
-			# == if the item is just an empty string, append a space, and go to next iteration of loop  
-			if not item.strip():
-				genesdeleted.append(" ")
-				continue
-			
-			# use the name of the segment to find the index location (using the boardnames list)
-			# use the index to recall the gene codes of that segment / board
-			else:
-				x = boardnames.index(item)
-				genesdeleted.append(genecodes[x])
-		
-		# record the genes
-		genesdeleted_txt = ''.join(genesdeleted)
-		powersetcombos.append(genesdeleted_txt)
+		if component in boardgenes:
+			successfulcomponents.append(component)
 
-	# combine the recorded names and recorded genes
-	combosandgenes = zip(powersetcombos_key, powersetcombos)
+	### loop over the powerset of the successful components, the first entry in the powerset (always = 0 components combination) a blank line
+	if genesets is None:
+		combos = powerset(successfulcomponents, POWERSETSEED)
+	else:
+		combos = disjointPowerset(successfulcomponents, genesets, POWERSETSEED)
 	combosandgenes_name = combos_genes.format(red_yellow_blue)
-	combosandgenes_txt = open(combosandgenes_name,"w+", newline ='\n')
-	combosandgenes_txt.truncate() 
-	# convert zip created list of tuples, line by line into string 
-	for line in combosandgenes:
-	  combosandgenes_txt.write('\t'.join(str(s) for s in line) + '\n')
-	combosandgenes_txt.close()
+	with open(combosandgenes_name,"w+", newline ='\n') as combosandgenes_txt:
+		# streamed a combination at a time: the conjoined names of the segments, and their gene codes (recalled by segment name)
+		for combo in combos:
+			genesdeleted_txt = ''.join(boardgenes[item] for item in combo) if combo else " "
+			combosandgenes_txt.write(' '.join(combo) + '\t' + genesdeleted_txt + '\n')
 
 	print(f'\nCreated and saved {combosandgenes_name}.')
-	deletionlog = "OUTPUT_final/deletionlog.txt"
-	log = open(deletionlog,"a+", newline ='\n')
+	log = deletionLog()
 	log.write(f"\nCreated and saved {combosandgenes_name}.\n")
 	log.close()
 
 def variantCombinations(successlist):
-	'''The Variants (three largest deletion segments) are matched with all other dividing, non-overlapping segments
-		Using logic outlined below. Removing 100% of genes ends Minesweeper. Removing 90% of the genes ends this script, moving onto the next'''
+	'''The Variants (VARIANTS largest deletion segments) are matched with all other dividing, non-overlapping segments
+		Using logic outlined below (segments.py). Removing 100% of genes ends Minesweeper. Removing 90% of the genes ends this script, moving onto the next'''
 	variants = "OUTPUT_script_3/variants.txt"
+	boardlist = "OUTPUT_script_2/alldivisionsegments_codes.txt"
+	segmentcodes = open(boardlist).read().split()
 	top3 = open(variants, "r+")
 	top3_list = [line.rstrip() for line in top3.readlines()]
 	boardnames = []
@@ -322,6 +286,13 @@ def variantCombinations(successlist):
 		genecode = re.sub(r"\n", r"", genecode)
 		genecodes.append(genecode)
 
+	# dividing segments as GeneSets, to match each variant with the segments it shares no gene with (bitmask intersection)
+	registry = loadRegistry()
+	genesets = {}
+	for boardname, genecode in zip(boardnames, genecodes):
+		genesets.setdefault(boardname, registry.parse(genecode))
+	table = not DISJOINTMATCHING and tableMatching(segmentcodes)
+
 	for line in top3_list:
 		line = line.split("\t")
 		red_yellow_blue = line[0]
@@ -337,8 +308,7 @@ def variantCombinations(successlist):
 			  break
 			finalresults_txt.close()
 
-			deletionlog = "OUTPUT_final/deletionlog.txt"
-			log = open(deletionlog,"a+", newline ='\n')
+			log = deletionLog()
 			log.write("\n\nMinesweeper is finished :) Final results have been written in OUTPUT_final/finalresults.txt. ")
 			log.close()
 
@@ -371,11 +341,15 @@ def variantCombinations(successlist):
 			endtimes_txt.write('1\t11.22\nNon Essential Divided\n')
 			endtimes_txt.write('2\t9.183\nNon Essential Divided\n')
 			endtimes_txt.write('1\t13.89\nDNA/RNA/Protein/Metabolic NoDivision\n')
-			endtimes_path_txt.close()
+			endtimes_txt.close()
+
+			# a single round 0 variant (red) for script_4X.py
+			state = RunState()
+			state.submit('red', 0, 'eights', 'mineconquer_red_0', endtimes)
+			state.save()
 
 			print("This stage has finished. You should run the next stage.\nYou are carrying forward one variant (red), your results have been placed in INPUT_script_4X/comboresults.txt\n")
-			deletionlog = "OUTPUT_final/deletionlog.txt"
-			log = open(deletionlog,"a+", newline ='\n')
+			log = deletionLog()
 			log.write("\n\nThis stage has finished. You should run the next stage.\nYou are carrying forward one variant (red), your results have been placed in INPUT_script_4X/comboresults.txt\n")
 			log.close()
 
@@ -408,113 +382,32 @@ def variantCombinations(successlist):
 			endtimes_txt.write('1\t11.22\nNon Essential Divided\n')
 			endtimes_txt.write('2\t9.183\nNon Essential Divided\n')
 			endtimes_txt.write('1\t13.89\nDNA/RNA/Protein/Metabolic NoDivision\n')
-			endtimes_path_txt.close()
+			endtimes_txt.close()
+
+			# a single round 0 variant (red) for script_4X.py
+			state = RunState()
+			state.submit('red', 0, 'eights', 'mineconquer_red_0', endtimes)
+			state.save()
 
 			print("This stage has finished. You should run the next stage.\nYou are carrying forward one variant (red), your results have been placed in INPUT_script_4X/comboresults.txt\n")
-			deletionlog = "OUTPUT_final/deletionlog.txt"
-			log = open(deletionlog,"a+", newline ='\n')
+			log = deletionLog()
 			log.write("\n\nThis stage has finished. You should run the next stage.\nYou are carrying forward one variant (red), your results have been placed in INPUT_script_4X/comboresults.txt\n")
 			log.close()
 
 			exit()
 		
-		### Logic of matching segments starts here
-		elif boardcode == '80a':
-			components = ['80a', '12.5g', '12.5h']
-			outputToLists(components, boardnames, genecodes, red_yellow_blue)
-
-		elif boardcode == '80b':
-			components = ['80b', '12.5a', '12.5b']
-			outputToLists(components, boardnames, genecodes, red_yellow_blue)
-
-		elif boardcode == '70a':
-			components = ['70a', '12.5f', '12.5g', '12.5h']
-			outputToLists(components, boardnames, genecodes, red_yellow_blue)
-
-		elif boardcode == '70b':
-			components = ['70b', '12.5a', '12.5b', '12.5c']
-			outputToLists(components, boardnames, genecodes, red_yellow_blue)
-
-		elif boardcode == '60a':
-			components = ['60a', '33c', '12.5e', '12.5f', '12.5g', '12.5h']
-			outputToLists(components, boardnames, genecodes, red_yellow_blue)
-
-		elif boardcode == '60b':
-			components = ['60b', '33a', '12.5a', '12.5b', '12.5c', '12.5d']
-			outputToLists(components, boardnames, genecodes, red_yellow_blue)
-
-		elif boardcode == '50a':
-			components = ['50a', '33c', '12.5e', '12.5f', '12.5g', '12.5h']
-			outputToLists(components, boardnames, genecodes, red_yellow_blue)
-
-		elif boardcode == '50b':
-			components = ['50b', '33a', '12.5a', '12.5b', '12.5c', '12.5d']
-			outputToLists(components, boardnames, genecodes, red_yellow_blue)
-
-		elif boardcode == '33a':
-			components = ['33a', '33b', '33c', '12.5d', '12.5e', '12.5f', '12.5g', '12.5h']
-			outputToLists(components, boardnames, genecodes, red_yellow_blue)
-
-		elif boardcode == '33b':
-			components = ['33b', '33a', '33c', '12.5a', '12.5b', '12.5f', '12.5g', '12.5h']
-			outputToLists(components, boardnames, genecodes, red_yellow_blue)
-
-		elif boardcode == '33c':
-			components = ['33c', '33a', '33b', '12.5a', '12.5b', '12.5c', '12.5d', '12.5e']
-			outputToLists(components, boardnames, genecodes, red_yellow_blue)
-
-		elif boardcode == '25a':
-			components = ['25a', '12.5c', '12.5d', '12.5e', '12.5f', '12.5g', '12.5h']
-			outputToLists(components, boardnames, genecodes, red_yellow_blue)
-
-		elif boardcode == '25b':
-			components = ['25b', '12.5a', '12.5b', '12.5e', '12.5f', '12.5g', '12.5h']
-			outputToLists(components, boardnames, genecodes, red_yellow_blue)
-
-		elif boardcode == '25c':
-			components = ['25c', '12.5a', '12.5b', '12.5c', '12.5d', '12.5g', '12.5h']
-			outputToLists(components, boardnames, genecodes, red_yellow_blue)
-
-		elif boardcode == '25d':
-			components = ['25d', '12.5a', '12.5b', '12.5c', '12.5d', '12.5e', '12.5f']
-			outputToLists(components, boardnames, genecodes, red_yellow_blue)
-
-		elif boardcode == '12.5a':
-			components = ['12.5a', '12.5b', '12.5c', '12.5d', '12.5e', '12.5f', '12.5g', '12.5h']
-			outputToLists(components, boardnames, genecodes, red_yellow_blue)
-
-		elif boardcode == '12.5b':
-			components = ['12.5a', '12.5b', '12.5c', '12.5d', '12.5e', '12.5f', '12.5g', '12.5h']
-			outputToLists(components, boardnames, genecodes, red_yellow_blue)
-
-		elif boardcode == '12.5c':
-			components = ['12.5a', '12.5b', '12.5c', '12.5d', '12.5e', '12.5f', '12.5g', '12.5h']
-			outputToLists(components, boardnames, genecodes, red_yellow_blue)
-
-		elif boardcode == '12.5d':
-			components = ['12.5a', '12.5b', '12.5c', '12.5d', '12.5e', '12.5f', '12.5g', '12.5h']
-			outputToLists(components, boardnames, genecodes, red_yellow_blue)
-
-		elif boardcode == '12.5e':
-			components = ['12.5a', '12.5b', '12.5c', '12.5d', '12.5e', '12.5f', '12.5g', '12.5h']
-			outputToLists(components, boardnames, genecodes, red_yellow_blue)
-
-		elif boardcode == '12.5f':
-			components = ['12.5a', '12.5b', '12.5c', '12.5d', '12.5e', '12.5f', '12.5g', '12.5h']
-			outputToLists(components, boardnames, genecodes, red_yellow_blue)
-
-		elif boardcode == '12.5g':
-			components = ['12.5a', '12.5b', '12.5c', '12.5d', '12.5e', '12.5f', '12.5g', '12.5h']
-			outputToLists(components, boardnames, genecodes, red_yellow_blue)
-
-		elif boardcode == '12.5h':
-			components = ['12.5a', '12.5b', '12.5c', '12.5d', '12.5e', '12.5f', '12.5g', '12.5h']
-			outputToLists(components, boardnames, genecodes, red_yellow_blue)
+		### Logic of matching segments: the non-overlapping segments of the schedule (segments.compatibleSegments())
+		else:
+			components = compatibleSegments(boardcode, genesets, table)
+			outputToLists(components, boardnames, genecodes, red_yellow_blue, genesets)
 
 def createScripts(job, simname):
 	''' Convert template script using user input, create exp and ko txt files for Variants(.txt)'''
 
-	names = ['red_0', 'yellow_0', 'blue_0']
+	# one job per variant in variants.txt (fewer than VARIANTS if fewer segments divided)
+	variants = "OUTPUT_script_3/variants.txt"
+	with open(variants) as variants_txt:
+		names = [line.split('\t')[0] for line in variants_txt if line.strip()]
 
 	user_input_txt = "INPUT_script_1/user_input.txt"
 	templatescript = "templatescript/TemplateScript.sh"
@@ -522,6 +415,19 @@ def createScripts(job, simname):
 	kolist = "OUTPUT_script_3/{}_ko.list"
 	explist = "OUTPUT_script_3/{}_exp.list"
 	experimentscript = "OUTPUT_script_3/{}.sh"
+	# round 0 (conquer) jobs of each variant, read by script_4X.py to find the round to interpret
+	state = RunState()
+
+	# compiled once and user_input.txt read once, for every script of the stage
+	# (the packed template if PACK sims share an array task, INPUT_script_1/backend.txt, see arraypacks.py)
+	pack = packSize()
+	template = loadTemplate(packTemplate(templatescript, pack))
+	user_values = userValues(user_input_txt)
+	# arrays of at most MAXARRAYSIZE sims, THROTTLE at a time (INPUT_script_1/backend.txt), one per job if not set
+	maxarraysize, throttle = arrayLimits()
+
+	# ko.list lines are rendered in genes.txt order (geneset.py)
+	registry = loadRegistry()
 
 	for name in names:
 		jobname = job + '_' + name
@@ -530,16 +436,15 @@ def createScripts(job, simname):
 		variantcombos_clone = variantcombos.format(name)
 		kolist_clone = kolist.format(jobname) 
 		ko = open(kolist_clone, 'w+', newline ='\n')
-		kotempscript = open(variantcombos_clone).read()
-		kotempscript = re.sub(r"^[^']*'", "'", kotempscript, flags=re.MULTILINE)
-		# replace blank combo from beginning, just removed with regex
-		kotempscript = " \n" + kotempscript
-		ko.write(kotempscript)
+		# the genes of each combination rendered by its GeneSet (combofile.py), a blank combination as a blank ko line
+		for line in readComboFile(variantcombos_clone).koLines(registry):
+			ko.write(line)
+		# use to create exp file of same length, count the knockout lines before the controls (flushed, so a short ko.list is not counted as empty)
+		ko.flush()
+		kocount = sum(1 for line in open(kolist_clone)) 
 		#append control simulations to gene candidates
 		ko.write("%s\n" % "")
 		ko.write("%s\n" % "'MG_006',")
-		# use to create exp file of same length
-		kocount = sum(1 for line in open(kolist_clone)) 
 
 		#create exp txt file
 		explist_clone = explist.format(jobname)
@@ -551,99 +456,49 @@ def createScripts(job, simname):
 			exp.write("%s\n" % "wildtype")
 			exp.write("%s\n" % "mutant")
 
+		ko.close()
+		# sim number -> combination manifest next to the ko.list
+		writeManifest(kolist_clone, explist_clone, comboNames(variantcombos_clone))
+
 		#create simulation bash script
-		user_input_values = open(user_input_txt, "r+")
-		tempscript = open(templatescript).read()
-		experimentscript_clone = experimentscript.format(jobname)
-		expscript = open(experimentscript_clone, 'w+', newline ='\n')
-
-		value_list = [line.rstrip() for line in user_input_values.readlines()]
-		user_input_values.close()
-		value_list = value_list[0:10]
-
-		### List of templatescript KEYS that need to change
-		### Imported from user_input.txt
-		### NAME
-		name_value = value_list[0]
-		name_value = name_value.split("\t")
-		name_value = name_value[1]
-		tempscript = re.sub(r"NAME", name_value, tempscript, flags=re.MULTILINE)
-		### EMAIL
-		email_value = value_list[1]
-		email_value = email_value.split("\t")
-		email_value = email_value[1]
-		tempscript = re.sub(r"EMAIL", email_value, tempscript, flags=re.MULTILINE)
-		### DEPARTMENT
-		department_value = value_list[2]
-		department_value = department_value.split("\t")
-		department_value = department_value[1]
-		tempscript = re.sub(r"DEPARTMENT", department_value, tempscript, flags=re.MULTILINE)
-		### UNI
-		uni_value = value_list[3]
-		uni_value = uni_value.split("\t")
-		uni_value = uni_value[1]
-		tempscript = re.sub(r"UNI", uni_value, tempscript, flags=re.MULTILINE)
-		### SUPERPC
-		superpc_value = value_list[4]
-		superpc_value = superpc_value.split("\t")
-		superpc_value = superpc_value[1]
-		tempscript = re.sub(r"SUPERPC", superpc_value, tempscript, flags=re.MULTILINE)
-		### SUPERQUEUE
-		superqueue_value = value_list[5]
-		superqueue_value = superqueue_value.split("\t")
-		superqueue_value = superqueue_value[1]
-		tempscript = re.sub(r"SUPERQUEUE", superqueue_value, tempscript, flags=re.MULTILINE)
-		### GROUP
-		GROUP_value = value_list[6]
-		GROUP_value = GROUP_value.split("\t")
-		GROUP_value = GROUP_value[1]
-		tempscript = re.sub(r"GROUP", GROUP_value, tempscript, flags=re.MULTILINE)
-		### USER
-		USER_value = value_list[7]
-		USER_value = USER_value.split("\t")
-		USER_value = USER_value[1]
-		tempscript = re.sub(r"USER", USER_value, tempscript, flags=re.MULTILINE)
-		### PROJECTFOLDER
-		projectfolder_value = value_list[8]
-		projectfolder_value = projectfolder_value.split("\t")
-		projectfolder_value = projectfolder_value[1]
-		tempscript = re.sub(r"PROJECTFOLDER", projectfolder_value, tempscript, flags=re.MULTILINE)
-		
+
 		### Decided by script
 		### JOB is determined globally, so that users can see folder structure
 		job_clone = jobname
-		tempscript = re.sub(r"JOBx", job_clone, tempscript, flags=re.MULTILINE)
 		
 		### ENDTIMENAME default is 'e', producing 'e' + 'ndtimes.txt'
 		ENDTIMENAME = 'conquerko' + '_' + name + '_e'
 		endtimename_clone = ENDTIMENAME
-		tempscript = re.sub(r"'e'", endtimename_clone, tempscript, flags=re.MULTILINE)
 
-		### Calculate: DATE, SIMNUMBER
+		### Calculate: DATE, ARRAY
 		### DATE
 		DATE = "{:%Y-%m-%d}".format(datetime.now())
-		tempscript = re.sub(r"DATE", DATE, tempscript, flags=re.MULTILINE)
 		
-		### SIMNUMBER
-		SIMNUMBER = kocount + 2
-		SIMNUMBER = str(SIMNUMBER)
-		tempscript = re.sub(r"SIMNUMBER", SIMNUMBER, tempscript, flags=re.MULTILINE)
-
-		expscript.write(tempscript)
-
-		ko.close()
-		exp.close()
-		expscript.close()
+		### ARRAY, knockouts with a known / pending outcome (OUTPUT_final/outcomecache.sqlite) are left out of the array
+		ARRAY = cachedArray(kolist_clone)
+
+		# one bash script per array: the job, or its chunks if it has more sims than MAXARRAYSIZE (see arraychunks.py)
+		clearRetries('INPUT_script_4X/' + endtimename_clone + 'ndtimes.txt')
+		for array in jobArrays(job_clone, endtimename_clone, kolist_clone, explist_clone, ARRAY, 2, 'INPUT_script_4X/' + endtimename_clone + 'ndtimes.txt', maxarraysize, throttle):
+			experimentscript_clone = experimentscript.format(array.name)
+			with open(experimentscript_clone, 'w+', newline ='\n') as expscript:
+				### templatescript placeholders (jobtemplate.py), the user_input.txt values and those decided by the script
+				values = dict(user_values, JOB=array.name, ENDTIMENAME=array.endtimename, DATE=DATE, ARRAY=packedArray(array.kolist, array.array, pack), SIMNUMBER=array.simnumber)
+				expscript.write(template.render(values))
+			# run / submit the job with the backend chosen in INPUT_script_1/backend.txt
+			submitJob(array.name, experimentscript_clone, array.kolist, array.explist, array.array, array.endtimes)
+		state.submit(name.split('_')[0], 0, 'eights', jobname, 'INPUT_script_4X/' + endtimename_clone + 'ndtimes.txt')
 		
+	state.save()
+
 	print('\nCreated bash scripts (*.sh), *_exp.lists, and *_ko.lists in OUTPUT_script_3.\n\n> See readme / lines 10-32 in bash script for what to do next.\n> See lines 128 - 154 in bash script for directories you need to create locally or on supercomputer.\n')
 	print('\nOne of your expected folder structures is:\n')
-	print(f'- projects\n\t- {GROUP_value}\n\t\t- {USER_value}\n\t\t\t- output\n\t\t\t\t- {projectfolder_value}\n\t\t\t\t\t- {job}\n\t\t\t\t\t\t- {simname}\n\t\t\t\t\t\t- wildtype\n\t\t\t\t\t\t- mutant\n\t\t\t\t\t\t- pdfs\n\t\t\t\t\t\t- figs\n')
+	print(f'- projects\n\t- {user_values["GROUP"]}\n\t\t- {user_values["USER"]}\n\t\t\t- output\n\t\t\t\t- {user_values["PROJECTFOLDER"]}\n\t\t\t\t\t- {job}\n\t\t\t\t\t\t- {simname}\n\t\t\t\t\t\t- wildtype\n\t\t\t\t\t\t- mutant\n\t\t\t\t\t\t- pdfs\n\t\t\t\t\t\t- figs\n')
 	
-	deletionlog = "OUTPUT_final/deletionlog.txt"
-	log = open(deletionlog,"a+", newline ='\n')
+	log = deletionLog()
 	log.write("\nCreated bash scripts (*.sh), *_exp.lists, and *_ko.lists in OUTPUT_script_3.\n\n> See readme / lines 10-32 in bash script for what to do next.\n> See lines 128 - 154 in bash script for directories you need to create locally or on supercomputer.\n")
 	log.write("\nOne of your expected folder structures is:\n")
-	log.write(f'- projects\n\t- {GROUP_value}\n\t\t- {USER_value}\n\t\t\t- output\n\t\t\t\t- {projectfolder_value}\n\t\t\t\t\t- {job}\n\t\t\t\t\t\t- {simname}\n\t\t\t\t\t\t- wildtype\n\t\t\t\t\t\t- mutant\n\t\t\t\t\t\t- pdfs\n\t\t\t\t\t\t- figs\n\n')
+	log.write(f'- projects\n\t- {user_values["GROUP"]}\n\t\t- {user_values["USER"]}\n\t\t\t- output\n\t\t\t\t- {user_values["PROJECTFOLDER"]}\n\t\t\t\t\t- {job}\n\t\t\t\t\t\t- {simname}\n\t\t\t\t\t\t- wildtype\n\t\t\t\t\t\t- mutant\n\t\t\t\t\t\t- pdfs\n\t\t\t\t\t\t- figs\n\n')
 	log.close()
 
 def main():
@@ -11,6 +11,9 @@ These remaining genes are divided into eight groups, a powerset generated for th
 individually appended to the current largest deletion combination and simulated. 
 If none of these simulations produces a dividing cell, the remaining genes are appended as single knockouts to the current largest deletion 
 combination and simulated. The individual remaining genes that don’t produce a dividing cell are temporarily excluded and a reduced remaining gene list produced.
+With GROUPTESTING the single knockouts are found by group testing instead (grouptesting.py), fewer simulations over a few rounds.
+With EIGHTSSEARCH the powerset is searched in waves instead (latticesearch.py, eightswaves.py), one wave per run of this script,
+the combinations the search rules out are not simulated.
 Expects: Place N conquerko_COLOUR_N_endtimes.txt in INPUT_script_4X folder.
 Output: either bash scripts and exp / ko lists in OUTPUT_script_4X folder OR final results in OUTPUT_final 
 """
@@ -19,10 +22,28 @@ Output: either bash scripts and exp / ko lists in OUTPUT_script_4X folder OR fin
 from sys import exit
 from itertools import chain, combinations
 import re
+import json
 from datetime import datetime
-import math
 import os
-import glob
+import random
+from geneset import loadRegistry, parseGenes
+from outcomecache import arraySpec, cachedArray, cachedResults
+from manifest import checkManifest, writeManifest
+from jobtemplate import loadTemplate, userValues
+from jobbackend import packSize, submitJob
+from arraychunks import arrayLimits, controlSims, jobArrays, jobEndtimes
+from arraypacks import packedArray, packTemplate
+from simretry import clearRetries, resubmitCrashedSims
+from eightswaves import clearWaves, submitWave, uncachedSims, wavedResultLines, waveEndtimes, waveResults
+from latticesearch import LatticeSearch, loadLatticeSearch
+from earlystop import cancelJobs, decided, variantProgress
+from runlog import deletionLog
+from runstate import loadRunState
+from variantpool import runVariants
+from partition import adaptiveGroups, groupCount, partitionSlices
+from evidence import cachedOutcomes, geneRisks
+from grouptesting import GroupTest, POOLNAME, loadGroupTest
+from combofile import readComboFile, writeComboFile
 
 # Global variables
 #JOB = "What is this experiment/run of simulations called? "
@@ -31,195 +52,125 @@ JOB = NAME + 'gapko{}'
 SIMNAMESTART = len(NAME)
 SIMNAMEEND = (len(JOB))-2
 SIMNAME = JOB[SIMNAMESTART:SIMNAMEEND]
+# powerset order: None = canonical (order of the groups / segments), an integer = reproducible shuffle
+POWERSETSEED = None
+# variants processed at the same time, one worker process each: None = one per core, 1 = one after another in this process
+VARIANTWORKERS = None
+# groups of remaining genes per round (partition.py): None = the original eight groups, k = k balanced groups (2^k combinations),
+# ARRAYSIZE = the most balanced groups whose powerset fits in that many combinations (e.g. 64 or 1024), overrides GROUPS
+GROUPS = None
+ARRAYSIZE = None
+# size the groups by essentiality evidence from the outcome cache (evidence.py): risky genes isolated, likely viable genes batched
+ADAPTIVEGROUPS = False
+# appended single kos by group testing (grouptesting.py): remaining genes appended in pools, lethal pools split over the following rounds
+GROUPTESTING = False
+# rounds of this many combinations or more (the powerset of 8 groups) are simulated without the wildtype / mutant controls
+CONTROLLIMIT = 250
+# simulate a combination with exactly the lane's current deletion again, rather than reuse its cached result (outcomecache.py),
+# so one stochastic replicate does not decide the lane's own state for every later round (False reuses it, as before)
+RESIMULATEDELETION = True
+# merge variants that converge onto the same deleted / remaining genes (False keeps them as independent replicates)
+MERGELANES = True
+# decide a round on the endtimes.txt landed so far, once the sims without a result can no longer change it (earlystop.py),
+# run this script again as results land (False waits for every endtimes.txt, as before)
+EARLYSTOP = False
+# search each eights round's powerset in waves (latticesearch.py, eightswaves.py): None = simulate every combination at once (as before),
+# 'largest' = a lattice level per wave, skipping combinations containing one that failed or unable to beat the best dividing one, with a
+# look-ahead, 'level' = the levels only (more sims). Each run of this script submits the next wave, the round is interpreted once the search is exhausted
+EIGHTSSEARCH = None
 
 def splashscreen():
 	""" Fancy splash screen for Lego scripts """
 	pass
 
 def alreadyRunCheck():
-	''' Checks to see if input files are present and output files have been generated, checks with the user'''
-
-	# What round are we on? Input from conquerko = 1, input from gapko = n + 1, should work as the number of files decreases (i.e. red, yellow finish, leaving blue)
-	fileexists = "OUTPUT_script_4X/bashexpkofiles/{}gapko_blue_1.sh"
-	filexistname = fileexists.format(NAME)
-
-	if not os.path.isfile(filexistname):
-		pass
-	if os.path.isfile(filexistname):
-		filen = glob.glob("INPUT_script_4X/*_endtimes.txt")
-		filenumber = len(filen)
-		if filenumber <= 3:
-			roundnumber = 0
-		elif filenumber > 3:
-			files = glob.glob("INPUT_script_4X/*_endtimes.txt")
-			# getctime (creation) vs getmtime (modification), oldest to newest top to bottom
-			files.sort(key=os.path.getmtime)
-			files.reverse()
-			topfile = files[0]
-			roundnumber = topfile[-14]
-			roundnumber = int(roundnumber)
-
-		filex = glob.glob("OUTPUT_script_4X/bashexpkofiles/*.sh")
-		filex.sort(key=os.path.getmtime)
-		filex.reverse()
-		topfile = filex[0]
-		print(topfile)
-		roundnum = topfile[-4]
-		roundnum = int(roundnum)
-
-		roundnumberadded = roundnumber + 1
-
-		if roundnumberadded == roundnum:
-			print(f"The latest endtimes.txt is numbered {roundnumber}, and the latest bash file is numbered {roundnum}." )
-			print("\nThis increment of 1 suggests you have already run this script on this input. If you run it again the order of the powersets will randomise." )
-			print("\nIf you are mid simulation this make the interpretation of your results incorrect." )
-			response = input("\nDo you want to run this script? yes / no\n> " )
-			if response == 'no':
-				exit(0)
+	''' Checks the endtimes.txt of the pending round (OUTPUT_final/runstate.json) are in place, if none are, checks with the user
+		whether to run this script again on the previous round's input'''
+
+	state = loadRunState()
+	pending = state.pending()
+	missing = state.missingEndtimes()
+
+	if not pending:
+		print("\nThere are no pending variants in OUTPUT_final/runstate.json, run script_3.py first (or Minesweeper has finished, see OUTPUT_final)." )
+		exit(0)
+	elif len(missing) == len(state.expectedEndtimes()) and state.history:
+		print(f"The endtimes.txt for round {state.round} are not in place yet ({missing}), and this script has produced the round {state.round} bash files." )
+		print("\nThis suggests you have already run this script on this input. If you run it again the scripts are regenerated in the same order (unless POWERSETSEED is changed)." )
+		print("\nIf you are mid simulation and the scripts would change, this script stops rather than overwrite the *_manifest.txt your simulations were submitted with." )
+		response = input("\nDo you want to run this script? yes / no\n> " )
+		if response == 'no':
+			exit(0)
+		# interpret the previous round again
+		state.rewind()
+		state.save()
+	elif missing and not EARLYSTOP:
+		print(f"\nThe endtimes.txt for round {state.round} are not all in place yet, missing: {missing}\nPlace them in INPUT_script_4X and run this script again." )
+		exit(0)
 
 def interpretResults():
-	""" Match the simulation results of Stage 3 / Stage 4 to the specific powerset combination, create unsortedsimresults and matchedresults.txt. """
-
-	# What round are we on? Input from stage 3 = 1, input from stage 4 = n + 1, should work as the number of files decreases (i.e. red, yellow finish, leaving blue)
-	filen = glob.glob("INPUT_script_4X/*_endtimes.txt")
-	filenumber = len(filen)
-	if filenumber <= 3:
-		previousroundnumber = '0'
-		roundnumber = '1'
-	elif filenumber > 3:
-		files = glob.glob("INPUT_script_4X/*_endtimes.txt")
-		# getctime (creation) vs getmtime (modification), oldest to newest top to bottom
-		files.sort(key=os.path.getmtime)
-		files.reverse()
-		topfile = files[0]
-		roundnumber = topfile[-14]
-		roundnumber = int(roundnumber)
-		roundnumber = roundnumber + 1
-		previousroundnumber = roundnumber - 1
-		previousroundnumber = str(previousroundnumber)
-		roundnumber = str(roundnumber)
-	#print(previousroundnumber)
-	#print(roundnumber)
+	""" Match the simulation results of Stage 3 / Stage 4 to the specific powerset combination, create matchedresults.txt. """
+
+	# round of the pending jobs and their variants (red, yellow, blue, fewer as they finish) from OUTPUT_final/runstate.json
+	state = loadRunState()
+	previousroundnumber = str(state.round)
+	roundnumber = str(state.round + 1)
 	# previous round number used throughout to process the results of the last round > producing dividing_COLOUR_N, matchedresults_COLOUR_N, unsorted.._COLOUR_N
 	# roundnumber used in the creation of the next scripts and {}eightsandgenes.txt
-
-	## have to iterate through names just with indexes not named variables (dividingcounter_list is similar example below)
-
-	#search for round results, should work as number of files decreases
-	filesearch = 'INPUT_script_4X/*' + previousroundnumber + '_endtimes.txt'
-	filesearching = glob.glob(filesearch)
-	filesearchingnumber =  len(filesearching)
-	#print(filesearchingnumber)
-	if filesearchingnumber == 3:
-		names = []
-		names.append('_red_' + previousroundnumber)
-		names.append('_yellow_' + previousroundnumber)
-		names.append('_blue_' + previousroundnumber)
-	if filesearchingnumber < 3:
-		names = []
-		for file in filesearching:
-			filecolourextract1 = file[-18:-15]
-			filecolourextract2 = file[-19:-15]
-			filecolourextract3 = file[-21:-15]
-			if filecolourextract1 == 'red':
-				names.append('_red_' + previousroundnumber)
-			if filecolourextract2 == 'blue':
-				names.append('_blue_' + previousroundnumber)
-			if filecolourextract3 == 'yellow':
-				names.append('_yellow_' + previousroundnumber)
+	names = ['_' + colour + '_' + previousroundnumber for colour in state.pending()]
 	print(names)
 	#input
 	previousroundnumber = int(previousroundnumber)
 	if previousroundnumber == 0:
 		explist_path = "OUTPUT_script_3/{}conquer{}_exp.list"
+		kolist_path = "OUTPUT_script_3/{}conquer{}_ko.list"
 		combolist = "OUTPUT_script_3/{}_combosandgenes.txt"
 		endtimes = "INPUT_script_4X/conquerko{}_endtimes.txt"
 	elif previousroundnumber > 0:
 		explist_path = "OUTPUT_script_4X/bashexpkofiles/{}gapko{}_exp.list"
+		kolist_path = "OUTPUT_script_4X/bashexpkofiles/{}gapko{}_ko.list"
 		combolist = "OUTPUT_script_4X/{}_eightsandgenes.txt" #transition from combosandgenes to eightsandgenes
 		endtimes = "INPUT_script_4X/gapko{}_endtimes.txt"
 	previousroundnumber = str(previousroundnumber)
 
 	#output
-	unsortedsimresults = "OUTPUT_script_4X/unsortedsimresults{}.txt"
 	matchedresults = "OUTPUT_script_4X/matchedresults{}.txt"
-	deletionlog = "OUTPUT_final/deletionlog.txt"
+
+	# with EARLYSTOP, the round decided on the results landed so far if the rest can not change it (see earlystop.py)
+	early = EARLYSTOP and earlyStop(state, names, explist_path, kolist_path, endtimes, previousroundnumber)
+
+	# simulate the crashed sims of every variant again before matching (RETRIES in INPUT_script_1/backend.txt, see simretry.py)
+	# not needed for a round decided early, whatever they produce
+	missing = []
+	for name in ([] if early else names):
+		missing.extend(resubmitCrashedSims(kolist_path.format(NAME, name), explist_path.format(NAME, name), endtimes.format(name)))
+	if missing:
+		print(f"\nThe endtimes.txt of the retried sims for round {previousroundnumber} are not all in place yet, missing: {missing}\nPlace them in INPUT_script_4X and run this script again." )
+		exit(0)
 
 	for name in names:
 		print(name)
 		full_results_list = []
 		nthendtimes = endtimes.format(name)
 
-		# open endtimes results and solve results being on two lines
-		firstinput = open(nthendtimes).read()
-		firstinput = re.sub(r"(\d)\n^(\w)", r"\1\t\2", firstinput, flags=re.MULTILINE)
-		
-		nthunsortedsimresults = unsortedsimresults.format(name)
-		firstoutput = open(nthunsortedsimresults,"w+", newline ='\n')
-		firstoutput.truncate()
-		firstoutput.write(firstinput)
-		firstoutput.close()
-
-		# open unsortedsimresults.txt, create list and a list of equal length, account for intended length, insert sim result in location, 
-		# append lists together, save as file
-		secondinput = open(nthunsortedsimresults, "r+")
-		result_list = [line.rstrip() for line in secondinput.readlines()]
-
-		# create an equal length list of default 'No_Result'
-		result_list_copy = []
-		for line in result_list:
-			result_list_copy.append('No_Result')
-
-		# add additional lines to account for crashed sims
+		# read endtimes results (one or two lines per sim, in finishing order, from each chunk if the job was split, with those of any retries) and place each at its sim number, 'No_Result' for crashed sims
 		explist = explist_path.format(NAME, name)
 		lenexplist = sum(1 for line in open(explist))
-		lenendtimes = sum(1 for line in open(nthunsortedsimresults))
-		difference = (lenexplist - lenendtimes)
-		for iteration in range(0, difference):
-			result_list_copy.append('No_Result')
 
-		# remove the control sims for results (the last two sims in every *exp.list), and the blank combination result (duplicate wildtype) produced by powerset	
+		# remove the control sims for results (the wildtype / mutant sims ending the *exp.list, none in rounds of CONTROLLIMIT or more), and the blank combination result (duplicate wildtype) produced by powerset	
 		duplicatewildtype = 1
-		if lenexplist >= 250:
-			wildtype = 3000
-			mutant = 3005
-		elif lenexplist < 250:
-			wildtype = lenexplist-1
-			mutant = lenexplist
-
-		# copy actual results into prepared list, by deleting and inserting at sorted location (row = sim number (0 indexed))
-		for line in result_list:
-			results = line.split("\t")
-			sim = results[0]
-			sim = int(sim)
-			if sim == duplicatewildtype:
-				continue
-			elif sim == mutant:
-				continue
-			elif sim == wildtype:
-				continue
-			else: 
-				#account for 0 index
-				sim = sim-1
-				time = results[1]
-				outcome = results[2:]
-				outcome = '\t'.join(outcome)
-				#print(result_list_copy[sim-1])
-				#print(result_list_copy[sim])
-				#print(result_list_copy[sim+1])
-				del result_list_copy[sim]
-				#print(result_list_copy[sim-1])
-				#print(result_list_copy[sim])
-				#print(result_list_copy[sim+1])
-				new_result = time + '\t' + outcome
-				result_list_copy.insert(sim, new_result)
-				#print(result_list_copy[sim-1])
-				#print(result_list_copy[sim])
-				#print(result_list_copy[sim+1])
-				#input("Press Enter to continue...")
-
-		# remove the 'NoResult' for wildtype and mutant sims that were not copied
-		result_list_copy = result_list_copy[:-2]
+		controls = controlSims(explist)
+		result_list_copy = wavedResultLines(nthendtimes, lenexplist, skip={duplicatewildtype} | controls, partial=early)
+		# store the new results, fill the knockouts that were not simulated (known outcome) from OUTPUT_final/outcomecache.sqlite
+		result_list_copy = cachedResults(kolist_path.format(NAME, name), result_list_copy)
+		# label the combinations an adaptive eights round did not simulate, Inferred_Viable / Inferred_Lethal / Pruned (EIGHTSSEARCH)
+		search = state.search(name.split('_')[1])
+		if search:
+			lattice = loadLatticeSearch(search['lattice'])
+			result_list_copy = [lattice.label(index) if index in searchedOut(search) else result for index, result in enumerate(result_list_copy)]
+
+		# remove the 'NoResult' for the wildtype and mutant sims that were not copied, if the round had them
+		result_list_copy = result_list_copy[:len(result_list_copy) - len(controls)]
 
 		# append the output of this loop / list to full results list
 		for line in result_list_copy:
@@ -229,40 +180,123 @@ def interpretResults():
 		# as combosandgenes and eightsandgenes are only files that use name as prefix, not insert / suffix, so drop the first _ from _COLOUR_N = COLOUR_N
 		name_variant = name[1:]
 		combolist_path = combolist.format(name_variant)
-		thirdinput = open(combolist_path).read()
-		thirdinput = re.sub(r"(^[^']*)[^\n]*", r"\1", thirdinput, flags=re.MULTILINE)
-		combo_list = thirdinput.split('\n')
-		# make sure combos on same line are joined by spaces, not by tabs - so aren't seperated by split
-		for line in combo_list:
-			line = ' '.join(line)
-		#combo_list = [line.rstrip() for line in thirdinput]
-		full_results_list = zip(combo_list, full_results_list)
-
-		# save matchedresults in outputdir
-		nthmatchedresults = matchedresults.format(name)
-		secondoutput = open(nthmatchedresults,"w+", newline ='\n')
-		secondoutput.truncate()
-		# convert zip created list of tuples, line by line into string 
-		for line in full_results_list:
-		  secondoutput.write('\t'.join(str(s) for s in line) + '\n')
-		secondoutput.close()
-		
-		# there's rogue double tabbing at the beginning of the matched results file - removing it
+		combo_list = readComboFile(combolist_path).names()
+		# the sims must still be the combinations their manifest recorded when the job was submitted (manifest.py)
+		if os.path.isfile(kolist_path.format(NAME, name)):
+			checkManifest(kolist_path.format(NAME, name), combo_list)
+
+		# save matchedresults in outputdir, combination name and result (the blank combination's name as a space)
 		nthmatchedresults = matchedresults.format(name)
-		roguetabtext = open(nthmatchedresults).read()
-		roguetabtext = re.sub(r"\t\t", r"\t", roguetabtext)
-		secondoutput = open(nthmatchedresults,"w+", newline ='\n')
-		secondoutput.truncate()
-		secondoutput.write(roguetabtext)
-		secondoutput.close()
+		with open(nthmatchedresults,"w+", newline ='\n') as secondoutput:
+			for combo, result in zip(combo_list, full_results_list):
+				secondoutput.write((combo or '\t ') + '\t' + result + '\n')
 	
 	print(f'\n\nHave matched the simulation results for {names} and saved the results in OUTPUT_script_4X/matchedresults.txt.')
-	log = open(deletionlog,"a+", newline ='\n')
+	log = deletionLog()
 	log.write(f"\n\nHave matched the simulation results for {names} and saved the results in OUTPUT_script_4X/matchedresults.txt.")
 	log.close()
 
 	return names, roundnumber, previousroundnumber
 
+def earlyStop(state, names, explist_path, kolist_path, endtimes, previousroundnumber):
+	''' Daughter function of interpretResults() (EARLYSTOP)
+		Reports the running best deletion of each variant on the results landed so far. True if the round is decided on them (the jobs
+		still running can be cancelled), False if every endtimes.txt is in place and the user confirms the arrays have finished
+		(interpreted as usual), otherwise stops the script until more results land.
+		'''
+
+	registry = loadRegistry()
+	progress_list = []
+	log = deletionLog()
+	for name in names:
+		explist = explist_path.format(NAME, name)
+		lenexplist = sum(1 for line in open(explist))
+		# as in interpretResults(), without the blank combination (duplicate wildtype) and the controls
+		skip = {1} | controlSims(explist)
+		# and the combinations an adaptive eights round ruled out (EIGHTSSEARCH), they can not change the round
+		search = state.search(name.split('_')[1])
+		if search:
+			skip = skip | {index + 1 for index in searchedOut(search)}
+		result_list = wavedResultLines(endtimes.format(name), lenexplist, skip, partial=True)
+		progress = variantProgress(name, state.phase(name.split('_')[1]), kolist_path.format(NAME, name), result_list, skip, registry, dividedAndProducedProteinRNA)
+		progress_list.append(progress)
+		message = f"\n{name[1:]} has {len(progress.dividing)} dividing so far, its best deletion {progress.best} genes (sim {progress.bestsim}), {len(progress.unknown)} sims without a result, {len(progress.contenders)} of which could change the round."
+		print(message)
+		log.write(message)
+		log.event('earlystop', variant=name.split('_')[1], round=int(previousroundnumber), best=progress.best, dividing=len(progress.dividing), unknown=len(progress.unknown), contenders=len(progress.contenders))
+	log.close()
+
+	if not all(decided(progress) for progress in progress_list):
+		if state.missingEndtimes():
+			print(f"\nRound {previousroundnumber} can not be decided on the results so far, run this script again as more endtimes.txt land in INPUT_script_4X." )
+			exit(0)
+		response = input(f"\nEvery endtimes.txt of round {previousroundnumber} is in place, but some sims have no result. Have the arrays finished (interpret the results as they are)? yes / no\n> " )
+		if response == 'no':
+			exit(0)
+		return False
+
+	unknown = sum(len(progress.unknown) for progress in progress_list)
+	if unknown:
+		jobs = [job for progress in progress_list if progress.unknown for job in cancelJobs(state.variants[progress.name.split('_')[1]]['job'], endtimes.format(progress.name))]
+		message = f"\n\nRound {previousroundnumber} is decided on the results so far, the {unknown} sims without a result can not change it. What is left of its jobs can be cancelled, e.g.\n" + ''.join(f"scancel --name={job}\n" for job in jobs)
+		print(message)
+		log = deletionLog()
+		log.write(message)
+		log.close()
+	return True
+
+def searchWaves():
+	''' Records the landed wave of each pending eights round searched in waves (EIGHTSSEARCH, see eightswaves.py) and submits its next wave.
+		Stops the script until the submitted waves land, returns once every search is exhausted and the round can be interpreted. '''
+
+	state = loadRunState()
+	waiting = []
+	for colour in state.pending():
+		search = state.search(colour)
+		if search is None or search['exhausted']:
+			continue
+		name = '_' + colour + '_' + str(state.round)
+		kolist = "OUTPUT_script_4X/bashexpkofiles/{}gapko{}_ko.list".format(NAME, name)
+		explist = "OUTPUT_script_4X/bashexpkofiles/{}gapko{}_exp.list".format(NAME, name)
+		endtimes = state.endtimes(colour)
+		lattice = loadLatticeSearch(search['lattice'])
+		# a wave run by the local backend is in place once submitted, so the next one is planned straight away
+		while True:
+			missing = [waveendtimes for waveendtimes in jobEndtimes(endtimes) + waveEndtimes(endtimes) if not os.path.isfile(waveendtimes)]
+			if missing:
+				waiting.extend(missing)
+				break
+			lattice.record(search['wave'], [dividedAndProducedProteinRNA(result) for result in waveResults(kolist, endtimes, search['wave'])])
+			search['wave'] = lattice.nextWave()
+			if not search['wave']:
+				search['exhausted'] = True
+				message = f'\n{colour} has finished searching round {state.round} in {lattice.waves} waves, {lattice.simulations()} of {len(lattice.members) - 1} combinations tested.'
+			else:
+				# combinations with a cached result are not simulated again, a wave of them is recorded straight away
+				sims = uncachedSims(kolist, search['wave'])
+				message = f'\n{colour} round {state.round}: wave {lattice.waves} has {len(search["wave"])} combinations, {len(sims)} to simulate.'
+				if sims:
+					wave = submitWave(kolist, explist, endtimes, sims)
+					message = message + f' Submitted as {wave.name}.'
+			search['lattice'] = lattice.state()
+			state.setSearch(colour, search)
+			state.save()
+			print(message)
+			log = deletionLog()
+			log.write(message)
+			log.close()
+			if search['exhausted']:
+				break
+
+	if waiting:
+		print(f"\nThe endtimes.txt of the eights waves for round {state.round} are not all in place yet, missing: {waiting}\nPlace them in INPUT_script_4X and run this script again." )
+		exit(0)
+
+def searchedOut(search):
+	''' Combination indexes (sim - 1) an adaptive eights round did not simulate, the blank combination apart '''
+
+	return {index for index, tested in enumerate(search['lattice']['tested']) if index > 0 and not tested}
+
 def dividedAndProducedProteinRNA(line):
 	linetocheck = line
 	divided = 'Divided'
@@ -280,7 +314,6 @@ def createDividingTxt(names):
 
 	matchedresults = "OUTPUT_script_4X/matchedresults{}.txt"
 	dividingresults = "OUTPUT_script_4X/dividing{}.txt"
-	deletionlog = "OUTPUT_final/deletionlog.txt"
 	dividingcounter_list = []
 
 	for name in names:
@@ -306,7 +339,7 @@ def createDividingTxt(names):
 		neresults.close()
 
 		print(f'\nHave filtered the dividing results and saved in OUTPUT_script_4X/{nthdividingresults}.')
-		log = open(deletionlog,"a+", newline ='\n')
+		log = deletionLog()
 		log.write(f"\nHave filtered the dividing results and saved in OUTPUT_script_4X/{nthdividingresults}.")
 		log.close()
 		dividingcounter_list.append(dividingcounter)
@@ -318,56 +351,126 @@ def remainingGenes(names, dividingcounter_list, previousroundnumber):
 		No division :: Remaining genes = re-record prior round results
 		Division + Single KO Append Flag :: prior round was an appended single KO round, Remaining genes = reduced set that divided (when singly appended)
 		Division + No Flag :: Remaining genes = of those that divided, select smallest number remaining (code starts at line 487) 
+		With GROUPTESTING, a group test round :: Remaining genes = re-record prior round results until every pool is resolved, then the reduced set
 		Passed to endingDecision() with dividingcounter_list to determine next step.
+		Each variant is processed by variantRemainingGenes(), at the same time in worker processes (see variantpool.py).
 		'''
 
+	# phase of each variant's last round (eights / singleko / finalround)
+	state = loadRunState()
+	variants = [(name, dividingcounter_list[x], state.phase(name.split('_')[1]), previousroundnumber) for x, name in enumerate(names)]
+	# the workers write each variant's remaining / deleted genes, nothing is returned
+	list(runVariants(variantRemainingGenes, variants, VARIANTWORKERS))
+
+def variantRemainingGenes(name, counter, phase, previousroundnumber):
+	''' Daughter function of remainingGenes(), one variant (runs in a worker process)
+		Creates remaininggenes_COLOUR_N.txt and deletedgenes_COLOUR_N.txt'''
+
 	dividingcombos = "OUTPUT_script_4X/dividing{}.txt"
 	remaininggenestxt = "OUTPUT_script_4X/remaininggenes{}.txt"
 	deletedgenestxt = "OUTPUT_script_4X/deletedgenes{}.txt"
-	deletionlog = "OUTPUT_final/deletionlog.txt"
 	negenes = "OUTPUT_script_2/nonessential.txt"
-	#format with names (but just red, yellow, blue = name_variant2)
-	singleko_trigger = 'OUTPUT_final/singleko{}.txt'
 
 	previousroundnumber = int(previousroundnumber)
 	if previousroundnumber == 0:
 		matchingcomboandgenes = "OUTPUT_script_3/{}_combosandgenes.txt"
 	elif previousroundnumber > 0:
 		matchingcomboandgenes = "OUTPUT_script_4X/{}_eightsandgenes.txt" #transition from combosandgenes to eightsandgenes
-	previousroundnumber = str(previousroundnumber)
-	
-	for name in names:
-		x = names.index(name)
-		counter = dividingcounter_list[x]
-
-		genecodes = []
-		combonames = []
-		matchedlist = []
-		bestresult = []
-		negenes_list = []
-		negenes_deleted = []
+
+	# gene registry (from INPUT_script_1/genes.txt) used to compare gene strings as GeneSets rather than nested loops
+	registry = loadRegistry()
+
+	genecodes = []
+	combonames = []
+	matchedlist = []
+	bestresult = []
+	negenes_list = []
+	negenes_deleted = []
+
+	if phase == 'grouptest':
+		# a wave of group tested single kos (pools of remaining genes appended to the largest deletion) has been run
+		# the largest deletion is unchanged, copy deleted genes from the prior round (what the pools were appended to)
+		name_variant = name[1:]
+		pastname_components = name_variant.split('_')
+		pastname_full = '_' + pastname_components[0] + '_' + str(int(pastname_components[1]) - 1)
+		for genestxt in (deletedgenestxt, remaininggenestxt):
+			with open(genestxt.format(pastname_full)) as pastgenes_txt:
+				pastgenes_results = pastgenes_txt.read()
+			with open(genestxt.format(name), "w+", newline ='\n') as genes_txt:
+				genes_txt.write(pastgenes_results)
+
+		grouptest = groupTestResults(name)
+		log = deletionLog()
+		if not grouptest.finished():
+			log.write(f"\n\nIn {name_variant} wave {grouptest.waves} of the group tested single kos left {len(grouptest.nextWave())} pools to split, re-recording {name} last round's remaining genes.\n")
+			log.close()
+			return
+
+		# as the appended single kos: reduced remaining genes are those that divided, the rest are temporarily excluded
+		reducedremaininggenes = ["'" + gene + "'," for gene in grouptest.dividing()]
+		nondividingappended = ["'" + gene + "'," for gene in grouptest.lethal()]
+		log.write(f"\n In {name_variant} there were {len(reducedremaininggenes)} genes found that could be appended to largest deletion and still divide, and {len(nondividingappended)} genes that couldn't ({grouptest.simulations} group tested sims in {grouptest.waves} waves).\n")
+		log.write(f"The reduced remaining genes are: {reducedremaininggenes}\n")
+		log.write(f"The temporarily excluded genes (potential conditional essentials) are: {nondividingappended}\n")
+		log.close()
+
+		# none divided, the remaining genes stay as they were (the variant finishes, as after appended single kos)
+		if reducedremaininggenes:
+			with open(remaininggenestxt.format(name), "w+", newline ='\n') as remaininggenes_results:
+				for line in reducedremaininggenes:
+					remaininggenes_results.write(line + ' ')
+		return
+
+	if counter == 0:
+		name_variant = name[1:]
+		pastname_components = name_variant.split('_')
+		pastname_name = pastname_components[0]
+		pastname_number = pastname_components[1]
+		pastname_number = int(pastname_number)
+		if previousroundnumber > 0:
+			pastname_number = pastname_number - 1
+		elif previousroundnumber == 0:
+			pastname_number = pastname_number
+		pastname_number = str(pastname_number)
+		pastname_full = '_' + pastname_name + '_' + pastname_number
+		
+		# As no new division, copy remaining / deleted genes from past file to current file
+		nthremaininggenes = remaininggenestxt.format(pastname_full)
+		remaininggenes_results = open(nthremaininggenes).read()
+		copypastremaininggenes = remaininggenestxt.format(name)
+		copypastremaininggenestxt = open(copypastremaininggenes,"w+", newline ='\n')
+		copypastremaininggenestxt.write(remaininggenes_results)
+		copypastremaininggenestxt.close()
+		
+		# deletedgenes_results = past results, copy past deleted genes = copying past results into current results
+		nthdeletedgenes = deletedgenestxt.format(pastname_full)
+		deletedgenes_results = open(nthdeletedgenes).read()
+		copypastdeletedgenes = deletedgenestxt.format(name)
+		copypastdeletedgenestxt = open(copypastdeletedgenes,"w+", newline ='\n')
+		copypastdeletedgenestxt.write(deletedgenes_results)
+		copypastdeletedgenestxt.close()
+
+		log = deletionLog()
+		log.write(f"\n\nNo dividing in-silico cells were produced in this {name} round, re-recording {name} last round's results.\n")
+		log.close()
+
+		return
+
+	elif counter > 0:
+		singleko = phase == 'singleko'
+		name_variant = name[1:]
 		
-		if counter == 0:
-			name_variant = name[1:]
+		if singleko:
+			# single gene knockouts appended to the largest deletion, have been run, and produced division
+			# this happened because the prior eights simulation round produced no division
+			# so create deleted genes from prior deleted genes (which were passed from eights to singleko to here) (i.e. what the single kos were appended to)
 			pastname_components = name_variant.split('_')
 			pastname_name = pastname_components[0]
 			pastname_number = pastname_components[1]
 			pastname_number = int(pastname_number)
-			if previousroundnumber > 0:
-				pastname_number = pastname_number - 1
-			elif previousroundnumber == 0:
-				pastname_number = pastname_number
+			pastname_number = pastname_number - 1
 			pastname_number = str(pastname_number)
 			pastname_full = '_' + pastname_name + '_' + pastname_number
-			
-			# As no new division, copy remaining / deleted genes from past file to current file
-			nthremaininggenes = remaininggenestxt.format(pastname_full)
-			remaininggenes_results = open(nthremaininggenes).read()
-			copypastremaininggenes = remaininggenestxt.format(name)
-			copypastremaininggenestxt = open(copypastremaininggenes,"w+", newline ='\n')
-			copypastremaininggenestxt.write(remaininggenes_results)
-			copypastremaininggenestxt.close()
-			
 			# deletedgenes_results = past results, copy past deleted genes = copying past results into current results
 			nthdeletedgenes = deletedgenestxt.format(pastname_full)
 			deletedgenes_results = open(nthdeletedgenes).read()
@@ -375,216 +478,179 @@ def remainingGenes(names, dividingcounter_list, previousroundnumber):
 			copypastdeletedgenestxt = open(copypastdeletedgenes,"w+", newline ='\n')
 			copypastdeletedgenestxt.write(deletedgenes_results)
 			copypastdeletedgenestxt.close()
-
-			log = open(deletionlog,"a+", newline ='\n')
-			log.write(f"\n\nNo dividing in-silico cells were produced in this {name} round, re-recording {name} last round's results.\n")
+			
+			# and create a reduced set of remaining genes (i.e. combining the appended single kos) 
+			# temporarily exclude genes that did not divide when appended singly to largest deletion
+			# load last rounds (singlekos) eights and combos
+			# split to genecodes and code names
+			# match dividing sims to genecodes via code names
+
+			matchingcombosandgenestxt = matchingcomboandgenes.format(name_variant) 
+			combofile = readComboFile(matchingcombosandgenestxt)
+			
+			# open combosandgenes / eightsandgenes (get combination name and gene codes, expanded from the compact file)
+			# combination name -> gene codes, first occurrence kept (as combonames.index() did)
+			for combo in combofile.names():
+				if not combo:
+					continue
+				combonames.append(combo)
+				genecodes.append(combofile.genes(combo).rstrip())
+			combolookup = {}
+			for combo, genecode in zip(combonames, genecodes):
+				combolookup.setdefault(combo, genecode)
+			
+			# open dividing_COLOUR_N (get combination names that divided)
+			dividingtxt = dividingcombos.format(name)
+			dividingallcolumns = open(dividingtxt, "r+")
+			dividingallcolumns_list = [line.rstrip() for line in dividingallcolumns.readlines()]
+			
+			# match only combination names that divided, with gene codes, via lists produced from combosandgenes/eightsandgenes
+			for line in dividingallcolumns_list:
+				results = line.split("\t")
+				combostring = results[0]
+				genestring = combolookup[combostring]
+				matchedresult = combostring + '\t' + genestring + '\n'
+				matchedlist.append(matchedresult)
+			
+			# produce list of genes that did divide when appended to largest deletion
+			# the appended single gene ko is the last gene code on each line
+			reducedremaininggenes = []
+			for line in matchedlist:
+				line = line.split("\t")
+				genestring = line[1]
+				# re.sub the last gene code (i.e. the appended single gene ko)
+				genestring = re.sub(r".*('\w\w\w\w\w\w',\n)", r"\1", genestring)
+				generesult = re.sub(r"\n", "", genestring)
+				reducedremaininggenes.append(generesult)
+
+			# create a list of genes that did not divide when appended to largest deletion
+			# (compare the appended genes as a GeneSet, rather than scanning the full gene strings for each gene)
+			reducedremaininggenes_set = registry.geneSet(reducedremaininggenes)
+			appendedgenes = []
+			for genecode in genecodes:
+				genecode_genes = parseGenes(genecode)
+				if genecode_genes:
+					appendedgenes.append("'" + genecode_genes[-1] + "',")
+			nondividingappended = [item for item in appendedgenes if item not in reducedremaininggenes_set]
+			nondividingappendedn = len(nondividingappended)
+			remaininggenesn = len(reducedremaininggenes)
+			negenes_deletedn = sum(1 for line in open(nthdeletedgenes)) 
+
+			log = deletionLog()
+			log.write(f"\n In {name_variant} there were {remaininggenesn} genes found that could be appended to largest deletion and still divide, and {nondividingappendedn} genes that couldn't.\n")
+			log.write(f"The reduced remaining genes are: {reducedremaininggenes}\n")
+			log.write(f"The temporarily excluded genes (potential conditional essentials) are: {nondividingappended}\n")
 			log.close()
 
-			continue
+			remaininggenes = reducedremaininggenes
+
+			nthremaininggenes = remaininggenestxt.format(name)
+			remaininggenes_results = open(nthremaininggenes,"w+", newline ='\n')
+			remaininggenes_results.truncate() 
+			for line in remaininggenes:
+				line = line + ' '
+				remaininggenes_results.write(line)
+			remaininggenes_results.close()
+
+			return
 
-		elif counter > 0:
-			name_variant2 = name[1:-2]
-			nthsingleko_trigger = singleko_trigger.format(name_variant2)
-			name_variant = name[1:]
+		elif not singleko:
+			# best deletion is selected, written to new deleted gene list
+			# remaining genes is generated by comparing non essential genes with the new deleted gene list
+			matchingcombosandgenestxt = matchingcomboandgenes.format(name_variant) 
+			combofile = readComboFile(matchingcombosandgenestxt)
 			
-			if os.path.isfile(nthsingleko_trigger):
-				# single gene knockouts appended to the largest deletion, have been run, and produced division
-				# this happened because the prior eights simulation round produced no division
-				# so create deleted genes from prior deleted genes (which were passed from eights to singleko to here) (i.e. what the single kos were appended to)
-				pastname_components = name_variant.split('_')
-				pastname_name = pastname_components[0]
-				pastname_number = pastname_components[1]
-				pastname_number = int(pastname_number)
-				pastname_number = pastname_number - 1
-				pastname_number = str(pastname_number)
-				pastname_full = '_' + pastname_name + '_' + pastname_number
-				# deletedgenes_results = past results, copy past deleted genes = copying past results into current results
-				nthdeletedgenes = deletedgenestxt.format(pastname_full)
-				deletedgenes_results = open(nthdeletedgenes).read()
-				copypastdeletedgenes = deletedgenestxt.format(name)
-				copypastdeletedgenestxt = open(copypastdeletedgenes,"w+", newline ='\n')
-				copypastdeletedgenestxt.write(deletedgenes_results)
-				copypastdeletedgenestxt.close()
-				
-				# and create a reduced set of remaining genes (i.e. combining the appended single kos) 
-				# temporarily exclude genes that did not divide when appended singly to largest deletion
-				# load last rounds (singlekos) eights and combos
-				# split to genecodes and code names
-				# match dividing sims to genecodes via code names
-
-				matchingcombosandgenestxt = matchingcomboandgenes.format(name_variant) 
-				matchingcombosandgenesallcolumns = open(matchingcombosandgenestxt, "r+")
-				matchingcombosandgenesallcolumns_list = [line.rstrip() for line in matchingcombosandgenesallcolumns.readlines()]
-				
-				# open combosandgenes / eightsandgenes (get combination name and gene codes)
-				for line in matchingcombosandgenesallcolumns_list:
-					if not line.strip():
-						continue
-					else:
-						combo, genecode = line.split("\t")
-						combonames.append(combo)
-						genecode = re.sub(r"\n", r"", genecode)
-						genecodes.append(genecode)
-				
-				# open dividing_COLOUR_N (get combination names that divided)
-				dividingtxt = dividingcombos.format(name)
-				dividingallcolumns = open(dividingtxt, "r+")
-				dividingallcolumns_list = [line.rstrip() for line in dividingallcolumns.readlines()]
-				
-				# match only combination names that divided, with gene codes, via lists produced from combosandgenes/eightsandgenes
-				for line in dividingallcolumns_list:
-					results = line.split("\t")
-					combostring = results[0]
-					genelocation = combonames.index(combostring)
-					genestring = genecodes[genelocation]
-					matchedresult = combostring + '\t' + genestring + '\n'
-					matchedlist.append(matchedresult)
-				
-				# produce list of genes that did divide when appended to largest deletion
-				reducedremaininggenes = []
-				for line in matchedlist:
-					line = line.split("\t")
-					genestring = line[1]
-					# re.sub the last gene code (i.e. the appended single gene ko)
-					genestring = re.sub(r".*('\w\w\w\w\w\w',\n)", r"\1", genestring)
-					generesult = re.sub(r"\n", "", genestring)
-					reducedremaininggenes.append(generesult)
-
-				# create a list of genes that did not divide when appended to largest deletion
-				nondividingappended = [item for item in genecodes if item not in reducedremaininggenes]
-				nondividingappendedn = len(nondividingappended)
-				remaininggenesn = len(reducedremaininggenes)
-				negenes_deletedn = sum(1 for line in open(nthdeletedgenes)) 
-
-				log = open(deletionlog,"a+", newline ='\n')
-				log.write(f"\n In {name_variant} there were {remaininggenesn} genes found that could be appended to largest deletion and still divide, and {nondividingappended} genes that couldn't.\n")
-				log.write(f"The reduced remaining genes are: {remaininggenes}\n")
-				log.write(f"The temporarily excluded genes (potential conditional essentials) are: {nondividingappended}\n")
-				log.close()
-
-				remaininggenes = reducedremaininggenes
-
-				nthremaininggenes = remaininggenestxt.format(name)
-				remaininggenes_results = open(nthremaininggenes,"w+", newline ='\n')
-				remaininggenes_results.truncate() 
-				for line in remaininggenes:
-					line = line + ' '
-					remaininggenes_results.write(line)
-				remaininggenes_results.close()
-
-				continue
-
-			elif not os.path.isfile(nthsingleko_trigger):
-				# best deletion is selected, written to new deleted gene list
-				# remaining genes is generated by comparing non essential genes with the new deleted gene list
-				matchingcombosandgenestxt = matchingcomboandgenes.format(name_variant) 
-				matchingcombosandgenesallcolumns = open(matchingcombosandgenestxt, "r+")
-				matchingcombosandgenesallcolumns_list = [line.rstrip() for line in matchingcombosandgenesallcolumns.readlines()]
-				
-				# open combosandgenes / eightsandgenes (get combination name and gene codes)
-				for line in matchingcombosandgenesallcolumns_list:
-					if not line.strip():
-						continue
-					else:
-						combo, genecode = line.split("\t")
-						combonames.append(combo)
-						genecode = re.sub(r"\n", r"", genecode)
-						genecodes.append(genecode)
-				
-				# open dividing_COLOUR_N (get combination names that divided)
-				dividingtxt = dividingcombos.format(name)
-				dividingallcolumns = open(dividingtxt, "r+")
-				dividingallcolumns_list = [line.rstrip() for line in dividingallcolumns.readlines()]
-				
-				# match only combination names that divided, with gene codes, via lists produced from combosandgenes/eightsandgenes
-				for line in dividingallcolumns_list:
-					results = line.split("\t")
-					combostring = results[0]
-					genelocation = combonames.index(combostring)
-					genestring = genecodes[genelocation]
-					matchedresult = combostring + '\t' + genestring + '\n'
-					matchedlist.append(matchedresult)
-				
-				# get best (i.e. most genes deleted) out of matched list
-				longestlength = 0
-				for line in matchedlist:
-					line = line.split("\t")
-					combostring = line[0]
-					combostring = re.sub(r"\n", r"", combostring)
-					genestring = line[1]
-					genestring = re.sub(r"\n", r"", genestring)
-					templist = genestring.split(' ')
-					# covert list to set then list = list(set(t)) 
-					# this removes order, but order should come from remaining genes anyway / negenes.txt
-					templist = list(set(templist)) 
-					lencount = len(templist)
-					genestring = ' '.join(templist)
-					if lencount > longestlength:
-						bestresult = combostring + '\t' + genestring + '\n'
-						longestlength = lencount
-				
-				# compare best result vs OUTPUT_script_1/gene_list.txt
-				negenes_txt = open(negenes, "r+")
-				full_negenes_list = [line.rstrip() for line in negenes_txt.readlines()]
-				for line in full_negenes_list:
-					line = line.split("\t")
-					line = line[0]
-					line = re.sub(r"\n", r"", line)
-					negenes_list.append(line)
-				bestgeneresult = bestresult.split("\t") 
-				bestgeneresult = bestgeneresult[1]
-				bestgeneresult = re.sub(r"\n", "", bestgeneresult)
-				bestresult_list = bestgeneresult.split(' ')
-				
-				for gene in negenes_list:
-					for unorderedgene in bestresult_list:
-						if gene == unorderedgene:
-							negenes_deleted.append(gene)
-				
-				remaininggenes = [item for item in negenes_list if item not in negenes_deleted]
-				remaininggenesn = len(remaininggenes)
-				negenes_deletedn = len(negenes_deleted)
-
-				log = open(deletionlog,"a+", newline ='\n')
-				log.write(f"\n\nA {name} combination deleted {negenes_deletedn} genes, leaving {remaininggenesn} remaining genes.\n")
-				#log.write(f"The largest number of genes deleted was by combination: {combostring}\n")
-				# cannot get to work > i.e. Blue_0 prints 12.5h 25b 12.5b (sim 26), but the genes are from 25b 12.5g 12.5f (sim 18)
-				log.write(f"The genes deleted: {negenes_deleted}\n")
-				log.write(f"The remaining genes are: {remaininggenes}\n")
-				log.close()
-
-				nthremaininggenes = remaininggenestxt.format(name)
-				remaininggenes_results = open(nthremaininggenes,"w+", newline ='\n')
-				remaininggenes_results.truncate() 
-				for line in remaininggenes:
-					line = line + ' '
-					remaininggenes_results.write(line)
-				remaininggenes_results.close()
-
-				nthdeletedgenes = deletedgenestxt.format(name)
-				deletedgenes_results = open(nthdeletedgenes,"w+", newline ='\n')
-				deletedgenes_results.truncate() 
-				for line in negenes_deleted:
-					line = line + ' '
-					deletedgenes_results.write(line)
-				deletedgenes_results.close()
-	
-def powerset(iterable):
+			# open dividing_COLOUR_N (get combination names that divided)
+			dividingtxt = dividingcombos.format(name)
+			dividingallcolumns = open(dividingtxt, "r+")
+			dividingallcolumns_list = [line.rstrip() for line in dividingallcolumns.readlines()]
+			
+			# match only combination names that divided, with gene codes (only those expanded from the compact combosandgenes/eightsandgenes)
+			for line in dividingallcolumns_list:
+				results = line.split("\t")
+				combostring = results[0]
+				genestring = combofile.genes(combostring).rstrip()
+				matchedresult = combostring + '\t' + genestring + '\n'
+				matchedlist.append(matchedresult)
+			
+			# get best (i.e. most genes deleted) out of matched list
+			# the GeneSet removes duplicate genes, order comes from remaining genes anyway / negenes.txt
+			longestlength = 0
+			for line in matchedlist:
+				line = line.split("\t")
+				combostring = line[0]
+				combostring = re.sub(r"\n", r"", combostring)
+				genestring = line[1]
+				geneset = registry.parse(genestring)
+				lencount = len(geneset)
+				if lencount > longestlength:
+					bestresult = geneset
+					longestlength = lencount
+			
+			# compare best result vs OUTPUT_script_1/gene_list.txt
+			negenes_txt = open(negenes, "r+")
+			full_negenes_list = [line.rstrip() for line in negenes_txt.readlines()]
+			for line in full_negenes_list:
+				line = line.split("\t")
+				line = line[0]
+				line = re.sub(r"\n", r"", line)
+				negenes_list.append(line)
+			
+			# single pass over negenes, with an O(1) membership test against the best result
+			for gene in negenes_list:
+				if gene in bestresult:
+					negenes_deleted.append(gene)
+			
+			negenes_deleted_set = registry.geneSet(negenes_deleted)
+			remaininggenes = [item for item in negenes_list if item not in negenes_deleted_set]
+			remaininggenesn = len(remaininggenes)
+			negenes_deletedn = len(negenes_deleted)
+
+			log = deletionLog()
+			log.write(f"\n\nA {name} combination deleted {negenes_deletedn} genes, leaving {remaininggenesn} remaining genes.\n")
+			#log.write(f"The largest number of genes deleted was by combination: {combostring}\n")
+			# cannot get to work > i.e. Blue_0 prints 12.5h 25b 12.5b (sim 26), but the genes are from 25b 12.5g 12.5f (sim 18)
+			log.write(f"The genes deleted: {negenes_deleted}\n")
+			log.write(f"The remaining genes are: {remaininggenes}\n")
+			log.event('deletion', variant=name.split('_')[1], round=previousroundnumber, deleted=negenes_deletedn, remaining=remaininggenesn)
+			log.close()
+
+			nthremaininggenes = remaininggenestxt.format(name)
+			remaininggenes_results = open(nthremaininggenes,"w+", newline ='\n')
+			remaininggenes_results.truncate() 
+			for line in remaininggenes:
+				line = line + ' '
+				remaininggenes_results.write(line)
+			remaininggenes_results.close()
+
+			nthdeletedgenes = deletedgenestxt.format(name)
+			deletedgenes_results = open(nthdeletedgenes,"w+", newline ='\n')
+			deletedgenes_results.truncate() 
+			for line in negenes_deleted:
+				line = line + ' '
+				deletedgenes_results.write(line)
+			deletedgenes_results.close()
+
+def powerset(iterable, seed=None):
 	''' Daughter function of outputToLists() 
 		Generates a powerset, all possible unique combinations of a set, in this case our top 3 largest deletions (colour variants) and matching deletion segments
 		e.g. [1,2,3]) --> () (1,) (2,) (3,) (1,2) (1,3) (2,3) (1,2,3)
 		From this StackOverflow thread: https://stackoverflow.com/questions/464864/how-to-get-all-possible-combinations-of-a-list-s-elements
 		Which pulls from this python documentation: https://docs.python.org/3/library/itertools.html#itertools-recipes 
+		Order is deterministic: unique elements in the order given, the empty combination first, then by size (as the example).
+		A seed (POWERSETSEED) shuffles the elements reproducibly, the same seed always gives the same order.
 		'''
 
-	s = list(set(iterable))  
+	s = list(dict.fromkeys(iterable))  # no duplicate elements, order kept
+	if seed is not None:
+		random.Random(seed).shuffle(s)
 	return chain.from_iterable(combinations(s, r) for r in range(len(s)+1))
 
 def outputToLists(eightsnames_list, deletedgenes, name_variant, roundnumbername):
 	''' Daughter function of eightPanelGroupingsGeneration() 
 		Uses powerset() to generate combinations
 		Records the names of 8 groups in the combinations, and matches with the genes within group
-		Outputs COLOUR_eightsandgenes.txt (complete powerset)
+		Outputs COLOUR_eightsandgenes.txt (complete powerset, compact: see combofile.py), streamed a combination at a time (each group's genes read once)
 	'''
 
 	# Have to code around naming change that occurs here (number change, and _ (underscore) to handle): 
@@ -594,78 +660,30 @@ def outputToLists(eightsnames_list, deletedgenes, name_variant, roundnumbername)
 	# not insert / suffix, drop the first _ from _COLOUR_N = COLOUR_N using name_variant
 	
 	# produce power sets of eightsnames
-	# use to generate deletion lines by opening eightssegment (containing genes) with associated eightsnames
+	# use to generate deletion lines from the genes of each eightssegment (read once) with associated eightsnames
 	eightssegment = "OUTPUT_script_4X/eightssegments/{}remaining_{}.txt" #name_variant, eightsname
 	eightsandgenes = "OUTPUT_script_4X/{}_eightsandgenes.txt" #roundnumbername
 	deletedgenestxt = "OUTPUT_script_4X/deletedgenes{}.txt"
-	deletionlog = "OUTPUT_final/deletionlog.txt"
-	powersetcombos_key = []
-	genesdeleted = []
-	deletedgenes_list = []
-	powersetcombos = []
-
-	### see http://book.pythontips.com/en/latest/enumerate.html for use of enumerate
-	### use it here to loop over the powerset of the eight groups, skipping the first entry in the powerset (always = 0 components combination)
-	for i, combo in enumerate(powerset(eightsnames_list), 1):
-		# for each combination of 8 groups, record the names of the groups, to give a conjoined name for the combination
-		combo = ' '.join(combo)
-		powersetcombos_key.append(combo)
-		
-		# then using the seperate names of the groups
-		combosplit = combo.split(" ")
-		genesdeleted = []
-		for item in combosplit:
-
-			# empty strings are considered FALSE normally. 
-			# Flip It - Is the string empty ( item.strip() )? IF NOT makes Yes = TRUE.
-			# == if the item is just an empty string, append a space, and go to next iteration of loop 
-			if not item.strip():
-				genesdeleted.append(" ")
-				continue
-			
-			#look up genes from eightssegment, using eightsname
-			else:
-				eightssegment_name = eightssegment.format(name_variant, item)
-				eightssegmenttxt = open(eightssegment_name).read()
-				genesdeleted.append(eightssegmenttxt)
-		
-		genesdeleted_txt = ''.join(genesdeleted)
-		powersetcombos.append(genesdeleted_txt)
 
 	name = '_' + name_variant
 	nthdeletedgenes = deletedgenestxt.format(name)
 	with open(nthdeletedgenes, 'r') as deletedgenes_txt:
 		deletedgenes_txtall = deletedgenes_txt.read().replace('\n', '')
-	linecount = 1
-
-	for line in powersetcombos:
-		if linecount == 1:
-			deletedgenes_list.append('')
-			linecount = linecount + 1
-		elif linecount > 1:
-			for line in deletedgenes_txtall:
-				deletedgenes_list.append(deletedgenes_txtall)
-	
+
+	#look up genes from eightssegment, using eightsname
+	groupgenes = {}
+	for item in eightsnames_list:
+		with open(eightssegment.format(name_variant, item)) as eightssegmenttxt:
+			groupgenes[item] = eightssegmenttxt.read()
+
 	# PRODUCE eightsandgenes using roundnumbername RATHER than name_variant
-	# CHANGE to eightsandgenes
-	eightsandgenes_list = zip(powersetcombos_key, deletedgenes_list, powersetcombos)
+	# compact (combofile.py): the genes already deleted and the genes of each group stored once, then one line of group names per
+	# combination, the first entry in the powerset (always = 0 components combination) a blank line
 	eightsandgenes_name = eightsandgenes.format(roundnumbername)
-	eightsandgenes_txt = open(eightsandgenes_name,"w+", newline ='\n')
-	eightsandgenes_txt.truncate() 
-	# convert zip created list of tuples, line by line into string 
-	for line in eightsandgenes_list:
-		eightsandgenes_txt.write('\t'.join(str(s) for s in line) + '\n')
-	eightsandgenes_txt.close()
-	
-	tempscript = open(eightsandgenes_name).read()
-	tempscript = re.sub(r",'", ", '", tempscript, flags=re.MULTILINE)
-	tempscript = re.sub(r",[\s]*'", ", '", tempscript, flags=re.MULTILINE)
-	eightsandgenes_txt = open(eightsandgenes_name, 'w+', newline ='\n')
-	eightsandgenes_txt.truncate()
-	eightsandgenes_txt.write(tempscript)
+	writeComboFile(eightsandgenes_name, deletedgenes_txtall, groupgenes.items(), powerset(eightsnames_list, POWERSETSEED))
 	
 	print(f'\nCreated and saved {eightsandgenes_name}.')
-	log = open(deletionlog,"a+", newline ='\n')
+	log = deletionLog()
 	log.write(f"\nCreated and saved {eightsandgenes_name}.")
 	log.close()
 
@@ -682,898 +700,45 @@ def eightsegmentwrite(name_variant, eights_name, eightsegment_list):
 	output_eightsegment.close()
 
 def eightPanelGroupingsGeneration(remaininggenes, deletedgenes, name, roundnumbername): 
-	''' Daughter function of endingDecision() 
-		Depending on the number of remaining genes, different code is executed:
+	''' Daughter function of variantDecision() 
+		Divides the remaining genes into groups (partition.py), by default the original eight groups:
 		15 genes or greater :: works out the number of genes in each of the 8 groups (minimum 2, apart from final/eighth group) and allocates them
-		14 genes to 8 genes :: hardcoded number of genes selected, maintaining 8 groups by transitioning the minimum number of genes per group from 2 to 1
-		7 genes to 1 genes :: number of groups equal to number of genes, with each group containing one hardcoded gene
-		Calls eightsegmentwrite() to save each of the eight groups of genes individually
+			(8 balanced groups if that would leave the eighth group empty, e.g. 24 genes)
+		14 genes to 8 genes :: maintaining 8 groups by transitioning the minimum number of genes per group from 2 to 1
+		7 genes to 1 genes :: number of groups equal to number of genes, with each group containing one gene
+		With GROUPS / ARRAYSIZE set, that many balanced groups instead (2^groups combinations per round)
+		With ADAPTIVEGROUPS, groups sized by the essentiality evidence of earlier rounds instead (least risky genes first)
+		Calls eightsegmentwrite() to save each of the groups of genes individually
 		Calls outputToLists() to save complete powerset.
-
-		This is a long function, collapse the if / elseif statements if using something like Sublime to read the code.
 	'''
 
 	eightssegment = "OUTPUT_script_4X/eightssegments/{}remaining_{}.txt" #name_variant, eightsname
-	deletionlog = "OUTPUT_final/deletionlog.txt"
 	clonelist = remaininggenes
 	name_variant = name[1:] 
 	roundnumbername_variant = roundnumbername[1:]
-	name_variant2 = name[1:-2]
-
-	whole = len(remaininggenes) # math.trunc used to round down > prevent overlapping gene knockouts 
-
-	### Decision based on number of remaining genes
-	if whole >= 15:
-		percent = 12.5
-		hundred = 100
-		zero = 0
-		ngenes = (whole/hundred)*percent
-		ngenes = math.trunc(ngenes)
-		nofgroups = 8
-		groupcounter = 1
-		# number of groups and their names in a list for def(outputToLists)
-		eightsname_list = ['1', '2', '3', '4', '5', '6', '7', '8']
-
-		for x in range(1, nofgroups + 1):
-			if groupcounter == nofgroups:
-				eights_name = str(x)
-				eights_start = ngenes*(x-1) + (x-1)  
-				eights_end = whole
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				break
-			elif x == 1:
-				eights_name = str(x)
-				eights_start = zero
-				eights_end = ngenes + 1
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 2:
-				eights_name = str(x)
-				eights_start = ngenes + 1
-				eights_end = ngenes*2 + 2
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 3:
-				eights_name = str(x)
-				eights_start = ngenes*2 + 2
-				eights_end = ngenes*3 + 3 
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 4:
-				eights_name = str(x)
-				eights_start = ngenes*3 + 3 
-				eights_end = ngenes*4 + 4 
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 5:
-				eights_name = str(x)
-				eights_start = ngenes*4 + 4 
-				eights_end = ngenes*5 + 5
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 6:
-				eights_name = str(x)
-				eights_start = ngenes*5 + 5
-				eights_end = ngenes*6 + 6
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 7:
-				eights_name = str(x)
-				eights_start = ngenes*6 + 6 
-				eights_end = ngenes*7 + 7
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-	
-	##############################################
-
-	elif whole == 14:
-		zero = 0
-		nofgroups = 8
-		groupcounter = 1
-		# number of groups and their names in a list for def(outputToLists)
-		eightsname_list = ['1', '2', '3', '4', '5', '6', '7', '8']
-
-		for x in range(1, nofgroups + 1):
-			if groupcounter == nofgroups:
-				eights_name = str(x)
-				eights_start = 13  
-				eights_end = whole
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				break
-			elif x == 1:
-				eights_name = str(x)
-				eights_start = zero
-				eights_end = 2
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 2:
-				eights_name = str(x)
-				eights_start = 2
-				eights_end = 4
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 3:
-				eights_name = str(x)
-				eights_start = 4
-				eights_end = 6 
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 4:
-				eights_name = str(x)
-				eights_start = 6 
-				eights_end = 8
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 5:
-				eights_name = str(x)
-				eights_start = 8
-				eights_end = 10
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 6:
-				eights_name = str(x)
-				eights_start = 10
-				eights_end = 12
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 7:
-				eights_name = str(x)
-				eights_start = 12
-				eights_end = 13
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-
-	elif whole == 13:
-		zero = 0
-		nofgroups = 8
-		groupcounter = 1
-		# number of groups and their names in a list for def(outputToLists)
-		eightsname_list = ['1', '2', '3', '4', '5', '6', '7', '8']
-
-		for x in range(1, nofgroups + 1):
-			if groupcounter == nofgroups:
-				eights_name = str(x)
-				eights_start = 12  
-				eights_end = whole
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				break
-			elif x == 1:
-				eights_name = str(x)
-				eights_start = zero
-				eights_end = 2
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 2:
-				eights_name = str(x)
-				eights_start = 2
-				eights_end = 4
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 3:
-				eights_name = str(x)
-				eights_start = 4
-				eights_end = 6 
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 4:
-				eights_name = str(x)
-				eights_start = 6 
-				eights_end = 8
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 5:
-				eights_name = str(x)
-				eights_start = 8
-				eights_end = 10
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 6:
-				eights_name = str(x)
-				eights_start = 10
-				eights_end = 11
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 7:
-				eights_name = str(x)
-				eights_start = 11
-				eights_end = 12
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-
-	elif whole == 12:
-		zero = 0
-		nofgroups = 8
-		groupcounter = 1
-		# number of groups and their names in a list for def(outputToLists)
-		eightsname_list = ['1', '2', '3', '4', '5', '6', '7', '8']
-
-		for x in range(1, nofgroups + 1):
-			if groupcounter == nofgroups:
-				eights_name = str(x)
-				eights_start = 11  
-				eights_end = whole
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				break
-			elif x == 1:
-				eights_name = str(x)
-				eights_start = zero
-				eights_end = 2
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 2:
-				eights_name = str(x)
-				eights_start = 2
-				eights_end = 4
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 3:
-				eights_name = str(x)
-				eights_start = 4
-				eights_end = 6 
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 4:
-				eights_name = str(x)
-				eights_start = 6 
-				eights_end = 8
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 5:
-				eights_name = str(x)
-				eights_start = 8
-				eights_end = 9
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 6:
-				eights_name = str(x)
-				eights_start = 9
-				eights_end = 10
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 7:
-				eights_name = str(x)
-				eights_start = 10
-				eights_end = 11
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-
-	elif whole == 11:
-		zero = 0
-		nofgroups = 8
-		groupcounter = 1
-		# number of groups and their names in a list for def(outputToLists)
-		eightsname_list = ['1', '2', '3', '4', '5', '6', '7', '8']
-
-		for x in range(1, nofgroups + 1):
-			if groupcounter == nofgroups:
-				eights_name = str(x)
-				eights_start = 10  
-				eights_end = whole
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				break
-			elif x == 1:
-				eights_name = str(x)
-				eights_start = zero
-				eights_end = 2
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 2:
-				eights_name = str(x)
-				eights_start = 2
-				eights_end = 4
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 3:
-				eights_name = str(x)
-				eights_start = 4
-				eights_end = 6 
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 4:
-				eights_name = str(x)
-				eights_start = 6 
-				eights_end = 7
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 5:
-				eights_name = str(x)
-				eights_start = 7
-				eights_end = 8
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 6:
-				eights_name = str(x)
-				eights_start = 8
-				eights_end = 9
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 7:
-				eights_name = str(x)
-				eights_start = 9
-				eights_end = 10
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-
-	elif whole == 10:
-		zero = 0
-		nofgroups = 8
-		groupcounter = 1
-		# number of groups and their names in a list for def(outputToLists)
-		eightsname_list = ['1', '2', '3', '4', '5', '6', '7', '8']
-
-		for x in range(1, nofgroups + 1):
-			if groupcounter == nofgroups:
-				eights_name = str(x)
-				eights_start = 9  
-				eights_end = whole
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				break
-			elif x == 1:
-				eights_name = str(x)
-				eights_start = zero
-				eights_end = 2
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 2:
-				eights_name = str(x)
-				eights_start = 2
-				eights_end = 4
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 3:
-				eights_name = str(x)
-				eights_start = 4
-				eights_end = 5 
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 4:
-				eights_name = str(x)
-				eights_start = 5 
-				eights_end = 6
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 5:
-				eights_name = str(x)
-				eights_start = 6
-				eights_end = 7
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 6:
-				eights_name = str(x)
-				eights_start = 7
-				eights_end = 8
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 7:
-				eights_name = str(x)
-				eights_start = 8
-				eights_end = 9
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-
-	elif whole == 9:
-		zero = 0
-		nofgroups = 8
-		groupcounter = 1
-		# number of groups and their names in a list for def(outputToLists)
-		eightsname_list = ['1', '2', '3', '4', '5', '6', '7', '8']
-
-		for x in range(1, nofgroups + 1):
-			if groupcounter == nofgroups:
-				eights_name = str(x)
-				eights_start = 8  
-				eights_end = whole
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				break
-			elif x == 1:
-				eights_name = str(x)
-				eights_start = zero
-				eights_end = 2
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 2:
-				eights_name = str(x)
-				eights_start = 2
-				eights_end = 3
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 3:
-				eights_name = str(x)
-				eights_start = 3
-				eights_end = 4 
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 4:
-				eights_name = str(x)
-				eights_start = 4 
-				eights_end = 5
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 5:
-				eights_name = str(x)
-				eights_start = 5
-				eights_end = 6
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 6:
-				eights_name = str(x)
-				eights_start = 6
-				eights_end = 7
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 7:
-				eights_name = str(x)
-				eights_start = 7
-				eights_end = 8
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-
-	elif whole == 8:
-		zero = 0
-		nofgroups = 8
-		groupcounter = 1
-		# number of groups and their names in a list for def(outputToLists)
-		eightsname_list = ['1', '2', '3', '4', '5', '6', '7', '8']
-
-		for x in range(1, nofgroups + 1):
-			if groupcounter == nofgroups:
-				eights_name = str(x)
-				eights_start = 7  
-				eights_end = whole
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				break
-			elif x == 1:
-				eights_name = str(x)
-				eights_start = zero
-				eights_end = 1
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 2:
-				eights_name = str(x)
-				eights_start = 1
-				eights_end = 2
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 3:
-				eights_name = str(x)
-				eights_start = 2
-				eights_end = 3 
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 4:
-				eights_name = str(x)
-				eights_start = 3 
-				eights_end = 4
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 5:
-				eights_name = str(x)
-				eights_start = 4
-				eights_end = 5
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 6:
-				eights_name = str(x)
-				eights_start = 5
-				eights_end = 6
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 7:
-				eights_name = str(x)
-				eights_start = 6
-				eights_end = 7
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-
-	##############################################
-
-	elif whole == 7:
-		zero = 0
-		nofgroups = whole
-		groupcounter = 1
-		# number of groups and their names in a list for def(outputToLists)
-		eightsname_list = ['1', '2', '3', '4', '5', '6', '7']
-
-		for x in range(1, nofgroups + 1):
-			if groupcounter == nofgroups:
-				eights_name = str(x)
-				eights_start = 6  
-				eights_end = whole
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				break
-			elif x == 1:
-				eights_name = str(x)
-				eights_start = zero
-				eights_end = 1
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 2:
-				eights_name = str(x)
-				eights_start = 1
-				eights_end = 2
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 3:
-				eights_name = str(x)
-				eights_start = 2
-				eights_end = 3 
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 4:
-				eights_name = str(x)
-				eights_start = 3 
-				eights_end = 4
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 5:
-				eights_name = str(x)
-				eights_start = 4
-				eights_end = 5
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 6:
-				eights_name = str(x)
-				eights_start = 5
-				eights_end = 6
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-
-	elif whole == 6:
-		zero = 0
-		nofgroups = whole
-		groupcounter = 1
-		# number of groups and their names in a list for def(outputToLists)
-		eightsname_list = ['1', '2', '3', '4', '5', '6']
-
-		for x in range(1, nofgroups + 1):
-			if groupcounter == nofgroups:
-				eights_name = str(x)
-				eights_start = 5  
-				eights_end = whole
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				break
-			elif x == 1:
-				eights_name = str(x)
-				eights_start = zero
-				eights_end = 1
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 2:
-				eights_name = str(x)
-				eights_start = 1
-				eights_end = 2
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 3:
-				eights_name = str(x)
-				eights_start = 2
-				eights_end = 3 
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 4:
-				eights_name = str(x)
-				eights_start = 3 
-				eights_end = 4
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 5:
-				eights_name = str(x)
-				eights_start = 4
-				eights_end = 5
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-
-	elif whole == 5:
-		zero = 0
-		nofgroups = whole
-		groupcounter = 1
-		# number of groups and their names in a list for def(outputToLists)
-		eightsname_list = ['1', '2', '3', '4', '5']
-
-		for x in range(1, nofgroups + 1):
-			if groupcounter == nofgroups:
-				eights_name = str(x)
-				eights_start = 4  
-				eights_end = whole
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				break
-			elif x == 1:
-				eights_name = str(x)
-				eights_start = zero
-				eights_end = 1
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 2:
-				eights_name = str(x)
-				eights_start = 1
-				eights_end = 2
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 3:
-				eights_name = str(x)
-				eights_start = 2
-				eights_end = 3 
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 4:
-				eights_name = str(x)
-				eights_start = 3 
-				eights_end = 4
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-
-	elif whole == 4:
-		zero = 0
-		nofgroups = whole
-		groupcounter = 1
-		# number of groups and their names in a list for def(outputToLists)
-		eightsname_list = ['1', '2', '3', '4']
-
-		for x in range(1, nofgroups + 1):
-			if groupcounter == nofgroups:
-				eights_name = str(x)
-				eights_start = 3  
-				eights_end = whole
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				break
-			elif x == 1:
-				eights_name = str(x)
-				eights_start = zero
-				eights_end = 1
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 2:
-				eights_name = str(x)
-				eights_start = 1
-				eights_end = 2
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 3:
-				eights_name = str(x)
-				eights_start = 2
-				eights_end = 3 
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-
-	elif whole == 3:
-		zero = 0
-		nofgroups = whole
-		groupcounter = 1
-		# number of groups and their names in a list for def(outputToLists)
-		eightsname_list = ['1', '2', '3']
-
-		for x in range(1, nofgroups + 1):
-			if groupcounter == nofgroups:
-				eights_name = str(x)
-				eights_start = 2  
-				eights_end = whole
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				break
-			elif x == 1:
-				eights_name = str(x)
-				eights_start = zero
-				eights_end = 1
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-			elif x == 2:
-				eights_name = str(x)
-				eights_start = 1
-				eights_end = 2
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-
-	elif whole == 2:
-		zero = 0
-		nofgroups = whole
-		groupcounter = 1
-		# number of groups and their names in a list for def(outputToLists)
-		eightsname_list = ['1', '2']
-
-		for x in range(1, nofgroups + 1):
-			if groupcounter == nofgroups:
-				eights_name = str(x)
-				eights_start = 1  
-				eights_end = whole
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				break
-			elif x == 1:
-				eights_name = str(x)
-				eights_start = zero
-				eights_end = 1
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				groupcounter = groupcounter + 1
-				continue
-
-	elif whole == 1:
-		zero = 0
-		nofgroups = whole
-		groupcounter = 1
-		# number of groups and their names in a list for def(outputToLists)
-		eightsname_list = ['1']
-
-		for x in range(1, nofgroups + 1):
-			if groupcounter == nofgroups:
-				eights_name = str(x)
-				eights_start = 1  
-				eights_end = whole
-				eightsegment_list = clonelist[eights_start:eights_end]
-				eightsegmentwrite(name_variant, eights_name, eightsegment_list)
-				break
 
-	##############################################
-				
-	lastcreated = eightssegment.format(name_variant, eights_name)
-	print(f'\n\nLast created 1/8ths deletion segments of remaining genes = {lastcreated}.')
-	log = open(deletionlog,"a+", newline ='\n')
-	log.write(f"\n\nLast created 1/8ths deletion segments of remaining genes = {lastcreated}.")
-	log.close()
+	whole = len(remaininggenes)
+	if ADAPTIVEGROUPS:
+		# risk of each remaining gene from the knockouts simulated so far (OUTPUT_final/outcomecache.sqlite)
+		registry = loadRegistry()
+		risks = geneRisks(registry.parse(''.join(remaininggenes)), registry.parse(''.join(deletedgenes)), cachedOutcomes(registry))
+		groups = adaptiveGroups(clonelist, [risks[parseGenes(gene)[0]] for gene in clonelist], groupCount(GROUPS, ARRAYSIZE))
+	else:
+		groups = [clonelist[eights_start:eights_end] for eights_start, eights_end in partitionSlices(whole, GROUPS, ARRAYSIZE)]
+	# number of groups and their names in a list for def(outputToLists)
+	eightsname_list = []
+
+	for x, eightsegment_list in enumerate(groups, 1):
+		eights_name = str(x)
+		eightsegmentwrite(name_variant, eights_name, eightsegment_list)
+		eightsname_list.append(eights_name)
+
+	if eightsname_list:
+		lastcreated = eightssegment.format(name_variant, eightsname_list[-1])
+		print(f'\n\nLast created 1/8ths deletion segments of remaining genes = {lastcreated}.')
+		log = deletionLog()
+		log.write(f"\n\nLast created 1/8ths deletion segments of remaining genes = {lastcreated}.")
+		log.close()
 
 	outputToLists(eightsname_list, deletedgenes, name_variant, roundnumbername_variant)
 
@@ -1586,80 +751,82 @@ def runappendsingleKOS(remaininggenes_list, deletedgenes_list, name, roundnumber
 
 	eightsandgenes = "OUTPUT_script_4X/{}_eightsandgenes.txt" #roundnumbername
 	deletedgenestxt = "OUTPUT_script_4X/deletedgenes{}.txt"
-	deletionlog = "OUTPUT_final/deletionlog.txt"
 	deletedgenes = []
 	remaininggenes = []
 	codename = []
 
-	# produce deleted genes as a text block per line (not single gene per line aka from the list) (with starting line set to blank to lineup with powerset format)
+	# deleted genes, stored once (combofile.py)
 	nthdeletedgenes = deletedgenestxt.format(name)
 	with open(nthdeletedgenes, 'r') as deletedgenes_txt:
 		deletedgenes_txtall = deletedgenes_txt.read().replace('\n', '')
-	
-	remaininggenes_list_len = len(remaininggenes_list) + 1
-
-	linecount = 1
-	for line in range(0, remaininggenes_list_len):
-		if linecount == 1:
-			deletedgenes.append('')
-			linecount = linecount + 1
-		elif linecount > 1:
-			for line in deletedgenes_txtall:
-				deletedgenes.append(deletedgenes_txtall)
-
-	# produce remaining genes list (with starting line set to blank to lineup with powerset format)
-	linecount = 1
-	linenumber = 0
-	for line in range(0, remaininggenes_list_len):
-		if linecount == 1:
-			remaininggenes.append('')
-			linecount = linecount + 1
-		elif linecount > 1:
-			gene = remaininggenes_list[linenumber]
-			remaininggenes.append(gene)
-			linenumber = linenumber + 1
-
-	# produce names for each line
-	linecount = 1
-	linenumber = 0
-	for line in remaininggenes:
-		if linecount == 1:
-			remaininggenes.append('')
-			linecount = linecount + 1
-		elif linecount > 1:
-			gene = remaininggenes[linenumber]
-			gene = re.sub(r"'", "", gene)
-			gene = re.sub(r",", "", gene)
-			codename.append(gene)
-			linenumber = linenumber + 1
+
+	# one group per remaining gene, named by its gene code, each a single gene combination
+	# (with starting line set to blank to lineup with powerset format)
+	singlekos = []
+	for gene in remaininggenes_list:
+		codename = re.sub(r"'", "", gene)
+		codename = re.sub(r",", "", codename)
+		singlekos.append((codename, gene))
 
 	# PRODUCE eightsandgenes using roundnumbername RATHER than name_variant
-	# CHANGE to eightsandgenes
 	roundnumbername_variant = roundnumbername[1:]
-	eightsandgenes_list = zip(codename, deletedgenes, remaininggenes)
 	eightsandgenes_name = eightsandgenes.format(roundnumbername_variant)
-	eightsandgenes_txt = open(eightsandgenes_name,"w+", newline ='\n')
-	eightsandgenes_txt.truncate() 
-	# convert zip created list of tuples, line by line into string 
-	for line in eightsandgenes_list:
-		eightsandgenes_txt.write('\t'.join(str(s) for s in line) + '\n')
-	eightsandgenes_txt.close()
-	
-	tempscript = open(eightsandgenes_name).read()
-	tempscript = re.sub(r",'", ", '", tempscript, flags=re.MULTILINE)
-	tempscript = re.sub(r",[\s]*'", ", '", tempscript, flags=re.MULTILINE)
-	eightsandgenes_txt = open(eightsandgenes_name, 'w+', newline ='\n')
-	eightsandgenes_txt.truncate()
-	eightsandgenes_txt.write(tempscript)
+	writeComboFile(eightsandgenes_name, deletedgenes_txtall, singlekos, [()] + [(codename,) for codename, gene in singlekos])
 	
 	print(f'\nCreated and saved a (singlekos) version of an eightsandgenes: {eightsandgenes_name}.')
-	log = open(deletionlog,"a+", newline ='\n')
+	log = deletionLog()
 	log.write(f"\nCreated and saved a (singlekos) version of an eightsandgenes: {eightsandgenes_name}.")
 	log.close()
 
-def createScripts(roundnumbername, job, simname):
+def groupTestResults(name):
+	''' Daughter function of variantRemainingGenes() / variantDecision()
+		The group test of a variant's last round (grouptest_COLOUR_N.json), with the results of its wave of pools (dividing_COLOUR_N.txt) recorded
+	'''
+
+	grouptestjson = "OUTPUT_script_4X/grouptest{}.json"
+	dividingcombos = "OUTPUT_script_4X/dividing{}.txt"
+
+	with open(grouptestjson.format(name)) as grouptest_json:
+		grouptest = loadGroupTest(json.load(grouptest_json))
+	with open(dividingcombos.format(name)) as dividing_txt:
+		dividing = {line.split('\t')[0] for line in dividing_txt if line.strip()}
+	pools = grouptest.nextWave()
+	grouptest.record(pools, [POOLNAME.format(x) in dividing for x, pool in enumerate(pools, 1)])
+	return grouptest
+
+def rungrouptestedsingleKOS(grouptest, name, roundnumbername):
+	''' Daughter function of variantDecision()
+		group tested version of runappendsingleKOS(): the next wave of pools of remaining genes, each appended to the largest deletion
+		Ouputs a grouptest version of COLOUR_eightsandgenes.txt, and the group test (grouptest_COLOUR_N.json) its results are recorded in
+	'''
+
+	eightsandgenes = "OUTPUT_script_4X/{}_eightsandgenes.txt" #roundnumbername
+	deletedgenestxt = "OUTPUT_script_4X/deletedgenes{}.txt"
+	grouptestjson = "OUTPUT_script_4X/grouptest{}.json"
+
+	nthdeletedgenes = deletedgenestxt.format(name)
+	with open(nthdeletedgenes, 'r') as deletedgenes_txt:
+		deletedgenes_txtall = deletedgenes_txt.read().replace('\n', '')
+
+	# one group per pool, starting line set to blank to lineup with powerset format, then one line per pool
+	pools = [(POOLNAME.format(x), ''.join("'" + gene + "'," for gene in pool)) for x, pool in enumerate(grouptest.nextWave(), 1)]
+
+	roundnumbername_variant = roundnumbername[1:]
+	eightsandgenes_name = eightsandgenes.format(roundnumbername_variant)
+	writeComboFile(eightsandgenes_name, deletedgenes_txtall, pools, [()] + [(pool,) for pool, genes in pools])
+
+	with open(grouptestjson.format(roundnumbername), 'w+', newline ='\n') as grouptest_json:
+		json.dump(grouptest.state(), grouptest_json, indent=1)
+
+	print(f'\nCreated and saved a (grouptest) version of an eightsandgenes: {eightsandgenes_name}, {len(pools)} pools.')
+	log = deletionLog()
+	log.write(f"\nCreated and saved a (grouptest) version of an eightsandgenes: {eightsandgenes_name}, {len(pools)} pools.")
+	log.close()
+
+def createScripts(roundnumbername, job, simname, search=None):
 	''' Daughter function of endingDecision() 
-		Convert template script using user input, create exp and ko txt files for COLOUR_eightsandgenes.txt'''
+		Convert template script using user input, create exp and ko txt files for COLOUR_eightsandgenes.txt
+		With search (an EIGHTSSEARCH order) only the first wave of the powerset is simulated, returns the search to keep in the run state'''
 
 	user_input_txt = "INPUT_script_1/user_input.txt"
 	templatescript = "templatescript/TemplateScript.sh"
@@ -1667,7 +834,14 @@ def createScripts(roundnumbername, job, simname):
 	kolist = "OUTPUT_script_4X/bashexpkofiles/{}_ko.list"
 	explist = "OUTPUT_script_4X/bashexpkofiles/{}_exp.list"
 	experimentscript = "OUTPUT_script_4X/bashexpkofiles/{}.sh"
-	deletionlog = "OUTPUT_final/deletionlog.txt"
+
+	# compiled once and user_input.txt read once, for every script of the stage
+	# (the packed template if PACK sims share an array task, INPUT_script_1/backend.txt, see arraypacks.py)
+	pack = packSize()
+	template = loadTemplate(packTemplate(templatescript, pack))
+	user_values = userValues(user_input_txt)
+	# arrays of at most MAXARRAYSIZE sims, THROTTLE at a time (INPUT_script_1/backend.txt), one per job if not set
+	maxarraysize, throttle = arrayLimits()
 
 	jobname = job.format(roundnumbername)
 	roundnumbername_variant = roundnumbername[1:]
@@ -1676,17 +850,22 @@ def createScripts(roundnumbername, job, simname):
 	eightsandgenes_clone = eightsandgenes.format(roundnumbername_variant)
 	kolist_clone = kolist.format(jobname) 
 	ko = open(kolist_clone, 'w+', newline ='\n')
-	kotempscript = open(eightsandgenes_clone).read()
-	kotempscript = re.sub(r"^[^']*'", "'", kotempscript, flags=re.MULTILINE)
-	# replace blank combo from beginning, just removed with regex
-	kotempscript = " \n" + kotempscript
-	ko.write(kotempscript)
+	# expanded from the compact eightsandgenes a line at a time: the genes of each combination, a blank combination as a blank ko line
+	combofile = readComboFile(eightsandgenes_clone)
+	for line in combofile.koLines(loadRegistry()):
+		ko.write(line)
 	
+	# count the lines written so far, not only those already flushed from the buffer (small pool / single ko rounds)
+	ko.flush()
 	kocount = sum(1 for line in open(kolist_clone)) 
-	#IN this script don't append control simulations to gene candidates if powerset of 8
-	if kocount < 250:
+	#IN this script don't append control simulations to gene candidates if powerset of 8 (CONTROLLIMIT)
+	if kocount < CONTROLLIMIT:
+		controls = 2
 		ko.write("%s\n" % "")
 		ko.write("%s\n" % "'MG_006',")
+	else:
+		controls = 0
+	ko.close()
 
 	#create exp txt file
 	explist_clone = explist.format(jobname)
@@ -1695,295 +874,294 @@ def createScripts(roundnumbername, job, simname):
 	for gene in range(0,stopper):
 		exp.write("%s\n" % simname) #gapko
 	
-	if kocount < 250:
+	if controls:
 		#append control simulations to gene candidates
 		exp.write("%s\n" % "wildtype")
 		exp.write("%s\n" % "mutant")
+	exp.close()
+
+	# sim number -> combination manifest next to the ko.list
+	writeManifest(kolist_clone, explist_clone, combofile.names())
 
 	#create simulation bash script
-	user_input_values = open(user_input_txt, "r+")
-	tempscript = open(templatescript).read()
-	experimentscript_clone = experimentscript.format(jobname)
-	expscript = open(experimentscript_clone, 'w+', newline ='\n')
-
-	value_list = [line.rstrip() for line in user_input_values.readlines()]
-	user_input_values.close()
-	value_list = value_list[0:10]
-
-	### List of templatescript KEYS that need to change
-	### Imported from user_input.txt
-	### NAME
-	name_value = value_list[0]
-	name_value = name_value.split("\t")
-	name_value = name_value[1]
-	tempscript = re.sub(r"NAME", name_value, tempscript, flags=re.MULTILINE)
-	### EMAIL
-	email_value = value_list[1]
-	email_value = email_value.split("\t")
-	email_value = email_value[1]
-	tempscript = re.sub(r"EMAIL", email_value, tempscript, flags=re.MULTILINE)
-	### DEPARTMENT
-	department_value = value_list[2]
-	department_value = department_value.split("\t")
-	department_value = department_value[1]
-	tempscript = re.sub(r"DEPARTMENT", department_value, tempscript, flags=re.MULTILINE)
-	### UNI
-	uni_value = value_list[3]
-	uni_value = uni_value.split("\t")
-	uni_value = uni_value[1]
-	tempscript = re.sub(r"UNI", uni_value, tempscript, flags=re.MULTILINE)
-	### SUPERPC
-	superpc_value = value_list[4]
-	superpc_value = superpc_value.split("\t")
-	superpc_value = superpc_value[1]
-	tempscript = re.sub(r"SUPERPC", superpc_value, tempscript, flags=re.MULTILINE)
-	### SUPERQUEUE
-	superqueue_value = value_list[5]
-	superqueue_value = superqueue_value.split("\t")
-	superqueue_value = superqueue_value[1]
-	tempscript = re.sub(r"SUPERQUEUE", superqueue_value, tempscript, flags=re.MULTILINE)
-	### GROUP
-	GROUP_value = value_list[6]
-	GROUP_value = GROUP_value.split("\t")
-	GROUP_value = GROUP_value[1]
-	tempscript = re.sub(r"GROUP", GROUP_value, tempscript, flags=re.MULTILINE)
-	### USER
-	USER_value = value_list[7]
-	USER_value = USER_value.split("\t")
-	USER_value = USER_value[1]
-	tempscript = re.sub(r"USER", USER_value, tempscript, flags=re.MULTILINE)
-	### PROJECTFOLDER
-	projectfolder_value = value_list[8]
-	projectfolder_value = projectfolder_value.split("\t")
-	projectfolder_value = projectfolder_value[1]
-	tempscript = re.sub(r"PROJECTFOLDER", projectfolder_value, tempscript, flags=re.MULTILINE)
-	
+
 	### Decided by script
 	### JOB is determined globally, so that users can see folder structure
 	job_clone = jobname
-	tempscript = re.sub(r"JOBx", job_clone, tempscript, flags=re.MULTILINE)
 	
 	### ENDTIMENAME default is 'e', producing 'e' + 'ndtimes.txt'
 	ENDTIMENAME = 'gapko' + roundnumbername + '_e'
 	endtimename_clone = ENDTIMENAME
-	tempscript = re.sub(r"'e'", endtimename_clone, tempscript, flags=re.MULTILINE)
 
-	### Calculate: DATE, SIMNUMBER
+	### Calculate: DATE, ARRAY
 	### DATE
 	DATE = "{:%Y-%m-%d}".format(datetime.now())
-	tempscript = re.sub(r"DATE", DATE, tempscript, flags=re.MULTILINE)
 	
-	### SIMNUMBER
-	if kocount < 250:
-		SIMNUMBER = kocount + 2
-	elif kocount >= 250:
-		SIMNUMBER = kocount
-	SIMNUMBER = str(SIMNUMBER)
-	tempscript = re.sub(r"SIMNUMBER", SIMNUMBER, tempscript, flags=re.MULTILINE)
-
-	expscript.write(tempscript)
-
-	ko.close()
-	exp.close()
-	expscript.close()
+	### ARRAY, knockouts with a known / pending outcome (OUTPUT_final/outcomecache.sqlite) are left out of the array
+	### the current deletion the combinations are appended to (the compact eightsandgenes base) is not taken from the cache (RESIMULATEDELETION)
+	resimulate = combofile.base if RESIMULATEDELETION else None
+	### searched in waves (EIGHTSSEARCH), the array is the first wave's combinations without a cached result and the controls
+	lattice = None
+	if search:
+		registry = loadRegistry()
+		lattice = LatticeSearch([(name, registry.parse(combofile.genes(name))) for name in combofile.names()], search)
+		wave = lattice.nextWave()
+		ARRAY = arraySpec(uncachedSims(kolist_clone, wave) + list(range(kocount + 1, kocount + controls + 1)) or [1])
+	else:
+		ARRAY = cachedArray(kolist_clone, controls, resimulate)
+
+	# one bash script per array: the job, or its chunks if it has more sims than MAXARRAYSIZE (see arraychunks.py)
+	clearRetries('INPUT_script_4X/' + endtimename_clone + 'ndtimes.txt')
+	clearWaves('INPUT_script_4X/' + endtimename_clone + 'ndtimes.txt')
+	for array in jobArrays(job_clone, endtimename_clone, kolist_clone, explist_clone, ARRAY, controls, 'INPUT_script_4X/' + endtimename_clone + 'ndtimes.txt', maxarraysize, throttle):
+		experimentscript_clone = experimentscript.format(array.name)
+		with open(experimentscript_clone, 'w+', newline ='\n') as expscript:
+			### templatescript placeholders (jobtemplate.py), the user_input.txt values and those decided by the script
+			values = dict(user_values, JOB=array.name, ENDTIMENAME=array.endtimename, DATE=DATE, ARRAY=packedArray(array.kolist, array.array, pack), SIMNUMBER=array.simnumber)
+			expscript.write(template.render(values))
+		# run / submit the job with the backend chosen in INPUT_script_1/backend.txt
+		submitJob(array.name, experimentscript_clone, array.kolist, array.explist, array.array, array.endtimes)
 		
 	print('\nCreated bash script (*.sh), *_exp.lists, and *_ko.lists in OUTPUT_script_4X/bashexpkofiles/\nYou only need /gapko, /pdfs, and /figs internal folders.\n')
-	log = open(deletionlog,"a+", newline ='\n')
+	log = deletionLog()
 	log.write(f"\nCreated bash script (*.sh), *_exp.lists, and *_ko.lists in OUTPUT_script_4X/bashexpkofiles/\nYou only need /gapko, /pdfs, and /figs internal folders.\n")
 	log.close()
 	#print('\nOne of your expected folder structures is:')
-	#print(f'- projects\n\t- {GROUP_value}\n\t\t- {USER_value}\n\t\t\t- output\n\t\t\t\t- {projectfolder_value}\n\t\t\t\t\t- {job}\n\t\t\t\t\t\t- {simname}\n\t\t\t\t\t\t- wildtype\n\t\t\t\t\t\t- mutant\n\t\t\t\t\t\t- pdfs\n\t\t\t\t\t\t- figs')
+	#print(f'- projects\n\t- {user_values["GROUP"]}\n\t\t- {user_values["USER"]}\n\t\t\t- output\n\t\t\t\t- {user_values["PROJECTFOLDER"]}\n\t\t\t\t\t- {job}\n\t\t\t\t\t\t- {simname}\n\t\t\t\t\t\t- wildtype\n\t\t\t\t\t\t- mutant\n\t\t\t\t\t\t- pdfs\n\t\t\t\t\t\t- figs')
+
+	if lattice is not None:
+		return {'lattice': lattice.state(), 'wave': wave, 'exhausted': False}
+	return None
 	
 def endingDecision(names, dividingcounter_list, JOB, SIMNAME, previousroundnumber, roundnumber):
 	''' Given the outcome of createDividingTxt() and remainingGenes() determine next step for remaining variants (e.g. Red, Yellow, Blue).
 		Four Options per variant:
-		If remaining genes =< 8 in last simulation round, triggering final round, record final results (if all three variants complete = end of Minesweeper)
+		If remaining genes =< 8 in last simulation round, triggering final round, record final results (if all variants complete = end of Minesweeper)
 		If conducted singlegene kos for remaining genes, individually appended to largest deletion, in last simulation round
 			and none divided, record final results
 		If conducted a normal eight group powerset deletion in last simulation round, and none divided, start an appended single kos round
 		If conducted a normal eights group powerset deletion in last simulation round, and some divided, 
 			continue to another round / final round of eights (depending on n of remaining genes)
+		With GROUPTESTING, the appended single kos are group tested (pools, see grouptesting.py): lethal pools are split in halves
+			over the following rounds, then the variant carries on as after appended single kos
 
-		Call eightPanelGroupingsGeneration(), runandcombinesingleKOs(), createScripts() as needed to:
+		Calls variantDecision() per variant, at the same time in worker processes (see variantpool.py), then createScripts() in variant order
+		(createScripts() shares the outcome cache between variants, so which variant simulates a shared knockout stays the same every run).
 		Outputs results in OUTPUT_final and next simulation round files in /bashexpkofiles folder
 		'''
 
-	remaininggenestxt = "OUTPUT_script_4X/remaininggenes{}.txt"
-	deletedgenestxt = "OUTPUT_script_4X/deletedgenes{}.txt"
-	#format with names (but just red, yellow, blue = name_variant2)
-	singleko_trigger = 'OUTPUT_final/singleko{}.txt'
-	finalround_trigger = 'OUTPUT_final/finalround{}.txt'
-	finaloutput = 'OUTPUT_final/{}_finalresult.txt'
-	deletionlog = "OUTPUT_final/deletionlog.txt"
+	# phase of each variant's last round, updated with the jobs of the next round (OUTPUT_final/runstate.json)
+	state = loadRunState()
+	state.startRound(int(roundnumber))
 
-	# name == previousroundnumber_name
-	roundnumber_names = []
-
-	for name in names:
-		colourextract1 = name[1:-2]
-		colourextract2 = name[1:-2]
-		colourextract3 = name[1:-2]
-		if colourextract1 == 'red':
-			roundnumber_names.append('_red_' + roundnumber)
-		elif colourextract2 == 'yellow':
-			roundnumber_names.append('_yellow_' + roundnumber)
-		elif colourextract3 == 'blue':
-			roundnumber_names.append('_blue_' + roundnumber)
+	# variants that converged onto an earlier variant are merged into it, and not simulated again
+	converged = {}
+	if MERGELANES:
+		converged = convergedVariants(names, dividingcounter_list, state)
 
+	# name == previousroundnumber_name, roundnumbername == roundnumber_name
+	variants = []
 	for name in names:
 		x = names.index(name)
-		counter = dividingcounter_list[x]
-
-		name_variant2 = name[1:-2]
-		### use name_variant2 > as colour only for triggers
-		nthsingleko_trigger = singleko_trigger.format(name_variant2)
-		nthfinalround_trigger = finalround_trigger.format(name_variant2)
-		nthfinaloutput = finaloutput.format(name_variant2)
-		
-		#get final results from remaininggenes / deleted genes
-		remaininggenes_list = []
-		nthremaininggenes = remaininggenestxt.format(name)
-		remaininggenes_txt = open(nthremaininggenes, "r+")
-		for line in remaininggenes_txt:
-			linecomponents = line.split(' ')
-			for components in linecomponents:
-				remaininggenes_list.append(components)
-		remaininggenes_list = list(filter(None, remaininggenes_list))
-
-		deletedgenes_list = []
-		nthdeletedgenes = deletedgenestxt.format(name)
-		deletedgenes_txt = open(nthdeletedgenes, "r+")
-		for line in deletedgenes_txt:
-			linecomponents = line.split(' ')
-			for components in linecomponents:
-				deletedgenes_list.append(components)
-		deletedgenes_list = list(filter(None, deletedgenes_list))
-
-		#remaininggenesn = len(remaininggenes_list)
-		#print(f"Name: {name} Counter: {counter} remaininggenes: {remaininggenes_list} n of remaininggenes: {remaininggenesn}")
-
-		## if reached remaining genes =< 8 in last simulation round, triggering final round, record final results
-		if os.path.isfile(nthfinalround_trigger):
-			finaloutputtxt = open(nthfinaloutput,"w+", newline ='\n')
-			finaloutputtxt.write(f"{name_variant2} deleted {deletedgenes_list}\n")
-			finaloutputtxt.write(f"{name_variant2} did not delete {remaininggenes_list}\n")
-			finaloutputtxt.close()
-
-			print(f'\n\n{name_variant2} has finished its final round. See OUTPUT_final/{name_variant2}_finalresult.txt for result.')
-			log = open(deletionlog,"a+", newline ='\n')
-			log.write(f"\n\n{name_variant2} has finished its final round. See OUTPUT_final/{name_variant2}_finalresult.txt for result.")
-			log.close()
-
-			continue
-
-		## if conducted singlegene kos for remaining genes individually appended to largest deletion in last simulation round, and non divided, record final results
-		elif os.path.isfile(nthsingleko_trigger) and counter == 0:
-			finaloutputtxt = open(nthfinaloutput,"w+", newline ='\n')
-			finaloutputtxt.write(f"{name_variant2} deleted {deletedgenes_list}\n")
-			finaloutputtxt.write(f"{name_variant2} deleted {remaininggenes_list}\n")
-			finaloutputtxt.close()
-
-			print(f'\n\n{name_variant2} has completed appended single ko sims, and with no dividing, has finished its final round.\nSee OUTPUT_final/{name_variant2}_finalresult.txt for result.\n')
-			log = open(deletionlog,"a+", newline ='\n')
-			log.write(f"\n\n{name_variant2} has completed appended single ko sims, and with no dividing, has finished its final round.\nSee OUTPUT_final/{name_variant2}_finalresult.txt for result.\n")
+		name_variant2 = name.split('_')[1]
+		if name in converged:
+			into = converged[name].split('_')[1]
+			state.merge(name_variant2, into)
+			print(f'\n{name_variant2} has the same deleted and remaining genes as {into}, so it is merged into {into} (not simulated again).')
+			log = deletionLog()
+			log.write(f"\n{name_variant2} has the same deleted and remaining genes as {into}, so it is merged into {into} (not simulated again).")
+			log.event('merged', variant=name_variant2, round=int(previousroundnumber), into=into)
 			log.close()
-
 			continue
+		variants.append((name, dividingcounter_list[x], state.phase(name_variant2), '_' + name_variant2 + '_' + roundnumber))
 
-		## if conducted a normal eight group powerset deletion in last simulation round, and none divided, start an appended single kos round
-		## also write a single ko trigger to interpret the results differently in the following round
-		elif not os.path.isfile(nthsingleko_trigger) and counter == 0:
-			singleko_triggertxt = open(nthsingleko_trigger,"w+", newline ='\n')
-			singleko_triggertxt.write("\n")
-			singleko_triggertxt.close()
-
-			### use roundnumbername > as future
-			roundnumbername = roundnumber_names[x]
-			#### use name > as past / current results
-			runappendsingleKOS(remaininggenes_list, deletedgenes_list, name, roundnumbername)
+	decisions = runVariants(variantDecision, variants, VARIANTWORKERS)
+	for (name, counter, phase, roundnumbername), (decision, deletedgenesn, remaininggenesn) in zip(variants, decisions):
+		name_variant2 = name.split('_')[1]
 
+		## final results recorded (final round, or appended single kos with no dividing)
+		if decision == 'final':
+			state.finish(name_variant2)
+			if phase == 'finalround':
+				message = f'\n\n{name_variant2} has finished its final round. See OUTPUT_final/{name_variant2}_finalresult.txt for result.'
+			else:
+				message = f'\n\n{name_variant2} has completed appended single ko sims, and with no dividing, has finished its final round.\nSee OUTPUT_final/{name_variant2}_finalresult.txt for result.\n'
+			# variants merged into this one finish with its result
+			for merged in state.merged(name_variant2):
+				mergedFinalResult(name_variant2, merged)
+				message = message + f'\n{merged} was merged into {name_variant2}, see OUTPUT_final/{merged}_finalresult.txt.'
+
+		## next round's eightsandgenes.txt created, the phase records how its results are interpreted in the following round
+		else:
 			### use roundnumbername > as future
 			#!!!! gets input from {}eightsandgenes.txt / {}singlekopowersets.txt OR list returned from prior function?
-			createScripts(roundnumbername, JOB, SIMNAME)
-			
-			print(f'\n{name_variant2} produced 0 divisions and has more than 8 genes remaining, so progressing to appended single ko sims.\n')
-			log = open(deletionlog,"a+", newline ='\n')
-			log.write(f"\n{name_variant2} produced 0 divisions and has more than 8 genes remaining, so progressing to appended single ko sims.\n")
-			log.close()
+			# eights rounds searched in waves (EIGHTSSEARCH) keep their search with the variant, until searchWaves() exhausts it
+			search = createScripts(roundnumbername, JOB, SIMNAME, EIGHTSSEARCH if decision in ('eights', 'finalround') else None)
+			state.submit(name_variant2, int(roundnumber), decision, JOB.format(roundnumbername), 'INPUT_script_4X/gapko' + roundnumbername + '_endtimes.txt')
+			if search:
+				state.setSearch(name_variant2, search)
+			if decision == 'singleko':
+				message = f'\n{name_variant2} produced 0 divisions and has more than {groupCount(GROUPS, ARRAYSIZE)} genes remaining, so progressing to appended single ko sims.\n'
+			elif decision == 'grouptest' and phase == 'grouptest':
+				message = f'\n{name_variant2} has lethal pools of group tested single kos left, so splitting them in the next round.'
+			elif decision == 'grouptest':
+				message = f'\n{name_variant2} produced 0 divisions and has more than {groupCount(GROUPS, ARRAYSIZE)} genes remaining, so progressing to group tested single ko sims.\n'
+			elif decision == 'finalround':
+				message = f'\n{name_variant2} has less than {groupCount(GROUPS, ARRAYSIZE)} genes remaining, so progressing to final round.'
+			else:
+				message = f'\n{name_variant2} has more than {groupCount(GROUPS, ARRAYSIZE)} genes remaining, so continuing onto next round.'
 
-			continue
+		print(message)
+		log = deletionLog()
+		log.write(message)
+		log.event('decision', variant=name_variant2, round=int(previousroundnumber), decision=decision, dividing=counter, deleted=deletedgenesn, remaining=remaininggenesn)
+		log.close()
+
+	state.save()
 
-		# if conducted a normal eights deletion in last simulation round, and some divided, continue to another round / final round of eights (depending on n of remaining genes)
-		elif counter > 0:
-			remaininggenesn = len(remaininggenes_list)
-			if remaininggenesn <= 8:
-				#write finalround trigger into folder
-				finalround_triggertxt = open(nthfinalround_trigger,"w+", newline ='\n')
-				finalround_triggertxt.write("\n")
-				finalround_triggertxt.close()
-				
-				#delete singleko_trigger if exists
-				if os.path.isfile(nthsingleko_trigger):
-					os.remove(nthsingleko_trigger)
-				
-				### use roundnumbername > as future
-				roundnumbername = roundnumber_names[x]
-				#### use name > as past / current results
-				eightPanelGroupingsGeneration(remaininggenes_list, deletedgenes_list, name, roundnumbername)
-
-				### use roundnumbername > as future
-				#!!!! gets input from {}eightsandgenes.txt / {}singlekopowersets.txt OR list returned from prior function?
-				createScripts(roundnumbername, JOB, SIMNAME)
-				
-				print(f'\n{name_variant2} has less than 8 genes remaining, so progressing to final round.')
-				log = open(deletionlog,"a+", newline ='\n')
-				log.write(f"\n{name_variant2} has less than 8 genes remaining, so progressing to final round.")
-				log.close()
-
-				continue	
-
-			elif remaininggenesn > 8:
-				#delete singleko_trigger if exists
-				if os.path.isfile(nthsingleko_trigger):
-					os.remove(nthsingleko_trigger)
-
-				### use roundnumbername > as future
-				roundnumbername = roundnumber_names[x]
-				#### use name > as past / current results
-				eightPanelGroupingsGeneration(remaininggenes_list, deletedgenes_list, name, roundnumbername)
-
-				### use roundnumbername > as future
-				#!!!! gets input from {}eightsandgenes.txt / {}singlekopowersets.txt OR list returned from prior function?
-				createScripts(roundnumbername, JOB, SIMNAME)
-				
-				print(f'\n{name_variant2} has more than 8 genes remaining, so continuing onto next round.')
-				log = open(deletionlog,"a+", newline ='\n')
-				log.write(f"\n{name_variant2} has more than 8 genes remaining, so continuing onto next round.")
-				log.close()
-
-				continue
-
-	# Completion message
-	finalyellow = finaloutput.format('yellow')
-	finalred = finaloutput.format('red')
-	finalblue = finaloutput.format('blue')
-	if os.path.isfile(finalyellow) and os.path.isfile(finalred) and os.path.isfile(finalblue):
+	# Completion message, once every variant has finished
+	if not state.pending():
 		print(f'\n\nMinesweeper has finished :) see OUTPUT_final for results.')
-		log = open(deletionlog,"a+", newline ='\n')
+		log = deletionLog()
 		log.write(f"\n\nMinesweeper has finished :) see OUTPUT_final for results.")
+		log.event('finished')
 		log.close()
 
+def convergedVariants(names, dividingcounter_list, state):
+	''' Daughter function of endingDecision()
+		Variants with the same deleted and remaining genes, and the same next step, as an earlier variant: {name: earlier name}
+		'''
+
+	remaininggenestxt = "OUTPUT_script_4X/remaininggenes{}.txt"
+	deletedgenestxt = "OUTPUT_script_4X/deletedgenes{}.txt"
+	registry = loadRegistry()
+	converged = {}
+	firsts = {}
+
+	for name in names:
+		x = names.index(name)
+		with open(deletedgenestxt.format(name)) as deletedgenes_txt:
+			deleted = registry.parse(deletedgenes_txt.read())
+		with open(remaininggenestxt.format(name)) as remaininggenes_txt:
+			remaining = registry.parse(remaininggenes_txt.read())
+		key = (state.phase(name.split('_')[1]), dividingcounter_list[x] == 0, deleted.mask, remaining.mask)
+		if key in firsts:
+			converged[name] = firsts[key]
+		else:
+			firsts[key] = name
+
+	return converged
+
+def mergedFinalResult(name_variant2, merged):
+	''' Daughter function of endingDecision()
+		The final result of a variant, written again for a variant merged into it'''
+
+	finaloutput = 'OUTPUT_final/{}_finalresult.txt'
+
+	with open(finaloutput.format(name_variant2)) as finaloutputtxt:
+		finalresult = finaloutputtxt.readlines()
+	with open(finaloutput.format(merged), "w+", newline ='\n') as mergedoutputtxt:
+		for line in finalresult:
+			mergedoutputtxt.write(merged + line[len(name_variant2):])
+
+def variantDecision(name, counter, phase, roundnumbername):
+	''' Daughter function of endingDecision(), one variant (runs in a worker process)
+		Records the final result, or calls runappendsingleKOS() / eightPanelGroupingsGeneration() for the next round.
+		Returns the decision (final, singleko, finalround or eights) and the number of deleted / remaining genes.
+		'''
+
+	remaininggenestxt = "OUTPUT_script_4X/remaininggenes{}.txt"
+	deletedgenestxt = "OUTPUT_script_4X/deletedgenes{}.txt"
+	finaloutput = 'OUTPUT_final/{}_finalresult.txt'
+
+	name_variant2 = name.split('_')[1]
+	nthfinaloutput = finaloutput.format(name_variant2)
+	
+	#get final results from remaininggenes / deleted genes
+	remaininggenes_list = []
+	nthremaininggenes = remaininggenestxt.format(name)
+	remaininggenes_txt = open(nthremaininggenes, "r+")
+	for line in remaininggenes_txt:
+		linecomponents = line.split(' ')
+		for components in linecomponents:
+			remaininggenes_list.append(components)
+	remaininggenes_list = list(filter(None, remaininggenes_list))
+
+	deletedgenes_list = []
+	nthdeletedgenes = deletedgenestxt.format(name)
+	deletedgenes_txt = open(nthdeletedgenes, "r+")
+	for line in deletedgenes_txt:
+		linecomponents = line.split(' ')
+		for components in linecomponents:
+			deletedgenes_list.append(components)
+	deletedgenes_list = list(filter(None, deletedgenes_list))
+
+	## group tested single kos: the number of genes that divided when appended, once every pool is resolved
+	grouptest = None
+	if phase == 'grouptest':
+		grouptest = groupTestResults(name)
+		if grouptest.finished():
+			phase = 'singleko'
+			counter = len(grouptest.dividing())
+
+	## if conducted group tested single kos in last simulation round, and pools are left to split, the next wave of pools
+	if grouptest is not None and not grouptest.finished():
+		rungrouptestedsingleKOS(grouptest, name, roundnumbername)
+		decision = 'grouptest'
+
+	## if reached remaining genes =< 8 in last simulation round, triggering final round, record final results
+	elif phase == 'finalround':
+		finaloutputtxt = open(nthfinaloutput,"w+", newline ='\n')
+		finaloutputtxt.write(f"{name_variant2} deleted {deletedgenes_list}\n")
+		finaloutputtxt.write(f"{name_variant2} did not delete {remaininggenes_list}\n")
+		finaloutputtxt.close()
+		decision = 'final'
+
+	## if conducted singlegene kos for remaining genes individually appended to largest deletion in last simulation round, and non divided, record final results
+	elif phase == 'singleko' and counter == 0:
+		finaloutputtxt = open(nthfinaloutput,"w+", newline ='\n')
+		finaloutputtxt.write(f"{name_variant2} deleted {deletedgenes_list}\n")
+		finaloutputtxt.write(f"{name_variant2} deleted {remaininggenes_list}\n")
+		finaloutputtxt.close()
+		decision = 'final'
+
+	## if conducted a normal eight group powerset deletion in last simulation round, and none divided, start an appended single kos round
+	elif phase != 'singleko' and counter == 0:
+		#### use name > as past / current results
+		if GROUPTESTING:
+			# each single group of the last round failed, so expect at least one conditionally essential gene per group
+			grouptest = GroupTest(parseGenes(' '.join(remaininggenes_list)), groupCount(GROUPS, ARRAYSIZE))
+			rungrouptestedsingleKOS(grouptest, name, roundnumbername)
+			decision = 'grouptest'
+		else:
+			runappendsingleKOS(remaininggenes_list, deletedgenes_list, name, roundnumbername)
+			decision = 'singleko'
+
+	# if conducted a normal eights deletion in last simulation round, and some divided, continue to another round / final round of eights (depending on n of remaining genes)
+	elif counter > 0:
+		#### use name > as past / current results
+		eightPanelGroupingsGeneration(remaininggenes_list, deletedgenes_list, name, roundnumbername)
+		if len(remaininggenes_list) <= groupCount(GROUPS, ARRAYSIZE):
+			decision = 'finalround'
+		else:
+			decision = 'eights'
+
+	return decision, len(deletedgenes_list), len(remaininggenes_list)
+
 def main():
 	splashscreen()
 	# use previousroundnumber
 	alreadyRunCheck()
+	searchWaves()
 	names, roundnumber, previousroundnumber = interpretResults()
 	dividingcounter_list = createDividingTxt(names)
 	remainingGenes(names, dividingcounter_list, previousroundnumber)
 	endingDecision(names, dividingcounter_list, JOB, SIMNAME, previousroundnumber, roundnumber)
-	#Called by endingDecision: eightPanelGroupingsGeneration()
-	#Called by endingDecision: runandcombinesingleKOs()
+	#Called by endingDecision: variantDecision() > eightPanelGroupingsGeneration()
+	#Called by endingDecision: variantDecision() > runandcombinesingleKOs()
 	# use roundnumber > as producing new scripts
 	#Called by endingDecision: createScripts()
 
-main()
+# variants are processed in worker processes (variantpool.py), which import this script
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+
+# Affiliation: Life Sciences, University of Bristol
+# Last Updated: 2026-10-18
+
+"""
+Deletion segments of Stage 2 (script_2.createDivisionSegments(), engine.py), generated from a schedule of (percent, layout) tiers:
+	anchored - segment a from the start of the non essential gene list and segment b from its end (100% is a alone),
+	           b holds trunc(percent% of the genes) and a the genes b leaves out (never fewer), so together they cover every gene
+	tiled    - round(100 / percent) consecutive segments a, b, c, ... covering every gene once: the original sizes (trunc(percent% of the
+	           genes) + 1, the last segment taking the rest) while every segment gets a gene, otherwise sizes differing by at most one gene
+SCHEDULE is the original 26 segments. A coarser or finer sweep is another schedule, e.g. for a small genome / cluster budget
+[(100, 'anchored'), (75, 'anchored'), (50, 'anchored'), (25, 'tiled')], or for a large one down to (6.25, 'tiled').
+Segment codes are the percent and the letter (100, 90a, 12.5h, as in alldivisionsegments_codes.txt), file names replace the . (12_5h).
+Stage 3 matches each variant with the segments listed by compatibleSegments(): every dividing segment sharing no gene with the variant,
+a GeneSet bitmask intersection, or (script_3.DISJOINTMATCHING = False, SCHEDULE only) those of them listed in the table COMPONENTS.
+Either way the combinations are those of disjoint segments only (disjointCombinations()).
+"""
+
+# Imports
+import math
+from partition import balancedSlices
+
+# Global variables
+SCHEDULE = [(100, 'anchored'), (90, 'anchored'), (80, 'anchored'), (70, 'anchored'), (60, 'anchored'), (50, 'anchored'),
+	(33, 'tiled'), (25, 'tiled'), (12.5, 'tiled')]
+LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+# Stage 3 fallback matching for SCHEDULE (script_3.DISJOINTMATCHING = False): each variant and the segments whose percent ranges it does
+# not overlap, the segments compatibleSegments() computes from the gene sets up to the few genes the tiled sizes shift a tile boundary by
+COMPONENTS = {
+	'80a': ['80a', '12.5h'],
+	'80b': ['80b', '12.5a'],
+	'70a': ['70a', '25d', '12.5g', '12.5h'],
+	'70b': ['70b', '25a', '12.5a', '12.5b'],
+	'60a': ['60a', '33c', '25d', '12.5f', '12.5g', '12.5h'],
+	'60b': ['60b', '33a', '25a', '12.5a', '12.5b', '12.5c'],
+	'50a': ['50a', '50b', '33c', '25c', '25d', '12.5e', '12.5f', '12.5g', '12.5h'],
+	'50b': ['50b', '50a', '33a', '25a', '25b', '12.5a', '12.5b', '12.5c', '12.5d'],
+	'33a': ['33a', '60b', '50b', '33b', '33c', '25c', '25d', '12.5d', '12.5e', '12.5f', '12.5g', '12.5h'],
+	'33b': ['33b', '33a', '33c', '25a', '25d', '12.5a', '12.5b', '12.5g', '12.5h'],
+	'33c': ['33c', '60a', '50a', '33a', '33b', '25a', '25b', '12.5a', '12.5b', '12.5c', '12.5d', '12.5e'],
+	'25a': ['25a', '70b', '60b', '50b', '33b', '33c', '25b', '25c', '25d', '12.5c', '12.5d', '12.5e', '12.5f', '12.5g', '12.5h'],
+	'25b': ['25b', '50b', '33c', '25a', '25c', '25d', '12.5a', '12.5b', '12.5e', '12.5f', '12.5g', '12.5h'],
+	'25c': ['25c', '50a', '33a', '25a', '25b', '25d', '12.5a', '12.5b', '12.5c', '12.5d', '12.5g', '12.5h'],
+	'25d': ['25d', '70a', '60a', '50a', '33a', '33b', '25a', '25b', '25c', '12.5a', '12.5b', '12.5c', '12.5d', '12.5e', '12.5f'],
+	'12.5a': ['12.5a', '80b', '70b', '60b', '50b', '33b', '33c', '25b', '25c', '25d', '12.5b', '12.5c', '12.5d', '12.5e', '12.5f', '12.5g', '12.5h'],
+	'12.5b': ['12.5b', '70b', '60b', '50b', '33b', '33c', '25b', '25c', '25d', '12.5a', '12.5c', '12.5d', '12.5e', '12.5f', '12.5g', '12.5h'],
+	'12.5c': ['12.5c', '60b', '50b', '33c', '25a', '25c', '25d', '12.5a', '12.5b', '12.5d', '12.5e', '12.5f', '12.5g', '12.5h'],
+	'12.5d': ['12.5d', '50b', '33a', '33c', '25a', '25c', '25d', '12.5a', '12.5b', '12.5c', '12.5e', '12.5f', '12.5g', '12.5h'],
+	'12.5e': ['12.5e', '50a', '33a', '33c', '25a', '25b', '25d', '12.5a', '12.5b', '12.5c', '12.5d', '12.5f', '12.5g', '12.5h'],
+	'12.5f': ['12.5f', '60a', '50a', '33a', '25a', '25b', '25d', '12.5a', '12.5b', '12.5c', '12.5d', '12.5e', '12.5g', '12.5h'],
+	'12.5g': ['12.5g', '70a', '60a', '50a', '33a', '33b', '25a', '25b', '25c', '12.5a', '12.5b', '12.5c', '12.5d', '12.5e', '12.5f', '12.5h'],
+	'12.5h': ['12.5h', '80a', '70a', '60a', '50a', '33a', '33b', '25a', '25b', '25c', '12.5a', '12.5b', '12.5c', '12.5d', '12.5e', '12.5f', '12.5g'],
+	}
+
+def segmentCode(percent, letter):
+	''' Board code as used in alldivisionsegments_codes.txt, e.g. 100, 90a, 12.5h '''
+
+	if percent == 100:
+		return '100'
+	return '{:g}'.format(percent) + letter
+
+def segmentFileName(code):
+	''' Name of a segment in OUTPUT_script_2/divisionsegment{}.txt, e.g. 12_5h '''
+
+	return code.replace('.', '_')
+
+def segmentLetters(percent, layout):
+	''' Letters of the segments of a tier of the schedule '''
+
+	if not 0 < percent <= 100:
+		raise ValueError(f"Segment percentages are between 0 and 100, not {percent}")
+	if layout == 'anchored':
+		if percent == 100:
+			return 'a'
+		if percent < 50:
+			raise ValueError(f"An anchored tier needs 50% or more of the genes (so a and b cover them all), not {percent}%, use 'tiled'")
+		return 'ab'
+	if layout == 'tiled':
+		parts = max(1, round(100 / percent))
+		if parts > len(LETTERS):
+			raise ValueError(f"A tiled tier has at most {len(LETTERS)} segments, not {parts} ({percent}%)")
+		return LETTERS[:parts]
+	raise ValueError(f"Unknown segment layout {layout!r}, expected 'anchored' or 'tiled'")
+
+def tierSlices(percent, layout, whole):
+	''' Start / end of each segment of a tier of the schedule, in letter order '''
+
+	letters = segmentLetters(percent, layout)
+	ngenes = math.trunc((whole/100)*percent)
+	if layout == 'anchored':
+		return [(0, max(ngenes, whole - ngenes)), (whole - ngenes, whole)][:len(letters)]
+	parts = len(letters)
+	if (ngenes + 1)*(parts - 1) < whole:
+		slices = [((ngenes + 1)*x, (ngenes + 1)*(x + 1)) for x in range(0, parts - 1)]
+		slices.append(((ngenes + 1)*(parts - 1), whole))
+		return slices
+	# fewer genes than the original sizes fill, the trailing segments of a tier with more segments than genes are empty
+	slices = balancedSlices(whole, parts)
+	return slices + [(whole, whole)] * (parts - len(slices))
+
+def segmentSlices(whole, schedule=SCHEDULE):
+	''' (code, start, end) of every deletion segment of whole non essential genes, in schedule order '''
+
+	slices = []
+	for percent, layout in schedule:
+		for letter, (start, end) in zip(segmentLetters(percent, layout), tierSlices(percent, layout, whole)):
+			slices.append((segmentCode(percent, letter), start, end))
+	return slices
+
+def scheduleCodes(schedule=SCHEDULE):
+	''' Codes of every deletion segment of a schedule, in order '''
+
+	return [segmentCode(percent, letter) for percent, layout in schedule for letter in segmentLetters(percent, layout)]
+
+def parseCode(code):
+	''' (percent, letter) of a segment code, e.g. 12.5h -> (12.5, 'h'), 100 -> (100, 'a') '''
+
+	if code[-1].isalpha():
+		return float(code[:-1]), code[-1]
+	return float(code), 'a'
+
+def tableMatching(codes):
+	''' True if the table (COMPONENTS) covers the segments, i.e. codes (every segment, in order) come from SCHEDULE '''
+
+	return set(codes) == set(scheduleCodes())
+
+def compatibleSegments(code, boards, table=False):
+	''' Segments a variant is matched with in Stage 3 (the variant included), boards being the dividing segments {code: GeneSet}:
+		every dividing segment that shares no gene with the variant, or with table those of them the table (COMPONENTS) lists. '''
+
+	variant = boards[code]
+	compatible = [code] + [other for other, geneset in boards.items() if other != code and variant.isdisjoint(geneset)]
+	if not table:
+		return compatible
+	return [component for component in COMPONENTS.get(code, [code]) if component in compatible]
+
+def disjointCombinations(components, boards):
+	''' Combinations of components whose segments share no gene (boards {code: GeneSet}), generated lazily in powerset order
+		(the empty combination, then by size). Overlapping combinations are never built, only extended from disjoint ones,
+		and a combination deleting the same genes as an earlier one (e.g. 25c = 12.5e + 12.5f) is skipped. '''
+
+	components = list(dict.fromkeys(components))
+	masks = [boards[component].mask for component in components]
+	seen = set()
+
+	def extend(combo, mask, start, size):
+		if len(combo) == size:
+			if mask not in seen:
+				seen.add(mask)
+				yield combo
+			return
+		for x in range(start, len(components) - (size - len(combo)) + 1):
+			if not masks[x] & mask:
+				yield from extend(combo + (components[x],), mask | masks[x], x + 1, size)
+
+	for size in range(0, len(components) + 1):
+		found = len(seen)
+		yield from extend((), 0, 0, size)
+		if len(seen) == found:
+			# no disjoint combination of this size, so none larger
+			break
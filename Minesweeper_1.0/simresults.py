@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+
+# Affiliation: Life Sciences, University of Bristol
+# Last Updated: 2026-10-18
+
+"""
+Streaming parser for the *_endtimes.txt simulation results used by Stage 2, Stage 3 and Stage 4X.
+Endtimes records come in two formats, a single line (sim, end time, outcome separated by tabs) or two lines (sim and end time, then the outcome),
+and are in the order the sims finished, not by sim number. Sims that crashed have no record.
+readEndtimes() reads the file once and yields one SimResult per record, placeResults() puts them in a preallocated list by sim number,
+so no intermediate (unsortedsimresults) file and no per record list insertion is needed.
+"""
+
+# Imports
+from collections import namedtuple
+
+# Global variables
+NO_RESULT = 'No_Result'
+
+class SimResult(namedtuple('SimResult', ['sim', 'time', 'outcome', 'protein', 'rna', 'timetext'])):
+	''' One simulation record: sim number (1 indexed), end time, outcome text and whether protein / RNA were scored UP.
+		timetext keeps the end time as written, so results are reproduced exactly in matchedresults files. '''
+
+	__slots__ = ()
+
+	@property
+	def divided(self):
+		return self.outcome.endswith('Divided')
+
+	def resultLine(self):
+		''' The result in matchedresults format, e.g. 10.59	Non Essential Protein UP RNA UP Divided '''
+
+		return self.timetext + '\t' + self.outcome
+
+def simResult(sim, timetext, outcome):
+	try:
+		time = float(timetext)
+	except ValueError:
+		time = None
+	return SimResult(int(sim), time, outcome, 'Protein UP' in outcome, 'RNA UP' in outcome, timetext)
+
+def readEndtimes(endtimes):
+	''' Yield a SimResult for every record of an endtimes.txt, in file order.
+		Two line records (sim and time, then outcome) are joined, a sim and time without an outcome gets an empty outcome. '''
+
+	pending = None
+	with open(endtimes) as endtimes_txt:
+		for line in endtimes_txt:
+			values = line.rstrip().split('\t')
+			if not values[0]:
+				continue
+			if pending is not None:
+				if not values[0].isdigit():
+					# second line of a two line record
+					yield simResult(pending[0], pending[1], '\t'.join(values))
+					pending = None
+					continue
+				yield simResult(pending[0], pending[1], '')
+				pending = None
+			if not values[0].isdigit() or len(values) < 2:
+				continue
+			if len(values) == 2:
+				pending = values
+				continue
+			yield simResult(values[0], values[1], '\t'.join(values[2:]))
+	if pending is not None:
+		yield simResult(pending[0], pending[1], '')
+
+def placeResults(records, length, skip=()):
+	''' Result lines placed by sim number (row = sim number - 1) in a list of length, 'No_Result' for missing / crashed sims.
+		Sims in skip (e.g. the wildtype and mutant controls) and sims outside the list are left out. '''
+
+	result_list = [NO_RESULT] * length
+	for record in records:
+		if record.sim in skip or not 0 < record.sim <= length:
+			continue
+		result_list[record.sim - 1] = record.resultLine()
+	return result_list
+
+def resultLines(endtimes, length, skip=()):
+	''' readEndtimes() + placeResults(), the results of one endtimes.txt in sim number order '''
+
+	return placeResults(readEndtimes(endtimes), length, skip)
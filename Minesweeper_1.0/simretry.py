@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+
+# Affiliation: Life Sciences, University of Bristol
+# Last Updated: 2026-10-18
+
+"""
+Retries of crashed sims. A sim of a job that has no record in its endtimes.txt (crashed, or lost with its task) is read as 'No_Result'
+and counts as a failure, so before interpretResults() matches a job's results, the sims that were simulated (in its --array, see
+outcomecache.py) and have no result are simulated again in a retry job holding only them. Set in INPUT_script_1/backend.txt (see jobbackend.py):
+	RETRIES		retry jobs per job, default 0 (crashed sims are left as 'No_Result', as before)
+A retry job is a job of its own next to the job's files (ko.list, exp.list, bash script, endtimes.txt, e.g. minegapko_red_3_retry1,
+gapko_red_3_retry1_endtimes.txt), its sims numbered from 1, split / packed like any job (arraychunks.py, arraypacks.py).
+The retry map (e.g. INPUT_script_4X/gapko_red_3_retries.txt, next to the job's endtimes.txt) records the job sims of each retry:
+	retry number, retry job, retry endtimes.txt, job sims (space separated)
+retriedResultLines() reads the job's results with those of its retries placed at their job sims, so interpretResults() sees one array.
+A retry submitted to Slurm is waited for like the job (the script stops, run it again once the retry endtimes.txt are in place),
+with the local backend it has run by the time it is submitted and the results are matched straight away.
+"""
+
+# Imports
+import os
+import re
+from collections import namedtuple
+from datetime import datetime
+from jobbackend import packSize, readBackendValues, submitJob
+from jobtemplate import TEMPLATESCRIPT, loadTemplate, userValues
+from outcomecache import NO_RESULT, OutcomeCache, arraySpec, jobName, readKoList
+from arraychunks import arrayLimits, jobArrays, jobEndtimes, jobResultLines
+from arraypacks import packedArray, packTemplate
+from runlog import deletionLog, jobFields
+
+# Global variables
+RETRIES_SUFFIX = 'retries.txt'
+# retry jobs / endtimes names, e.g. minegapko_red_3 -> minegapko_red_3_retry1, gapko_red_3_e -> gapko_red_3_retry1_e
+RETRYLABEL = '_retry{}'
+RETRYENDTIMES = re.compile(r"_retry\d+_endtimes\.txt$")
+
+# A line of a retry map, sims the job sims of the retry's sims 1, 2, ...
+Retry = namedtuple('Retry', ['number', 'name', 'endtimes', 'sims'])
+
+def retryLimit(values=None):
+	''' Retry jobs per job, RETRIES in backend.txt (default 0) '''
+
+	if values is None:
+		values = readBackendValues()
+	retries = values.get('RETRIES', '')
+	if retries and not retries.isdigit():
+		raise ValueError(f"RETRIES in backend.txt is a number of retry jobs (0 or more), not {retries}")
+	return int(retries) if retries else 0
+
+def retryMapPath(endtimes):
+	''' e.g. INPUT_script_4X/gapko_red_3_endtimes.txt -> INPUT_script_4X/gapko_red_3_retries.txt '''
+
+	return endtimes[:-len('endtimes.txt')] + RETRIES_SUFFIX
+
+def readRetryMap(endtimes):
+	''' Retries of the job whose results are endtimes, [] if it had none '''
+
+	retrymap = retryMapPath(endtimes)
+	if not os.path.isfile(retrymap):
+		return []
+	retries = []
+	with open(retrymap) as retries_txt:
+		for line in retries_txt:
+			values = line.rstrip('\n').split('\t')
+			if len(values) == 4 and values[0].isdigit():
+				retries.append(Retry(int(values[0]), values[1], values[2], [int(sim) for sim in values[3].split()]))
+	return retries
+
+def clearRetries(endtimes):
+	''' createScripts() helper: forget the retries of an earlier run of the job '''
+
+	retrymap = retryMapPath(endtimes)
+	if os.path.isfile(retrymap):
+		os.remove(retrymap)
+
+def retryEndtimes(endtimes):
+	''' endtimes.txt files of the job's retries (of their chunks for retries split into several arrays) '''
+
+	return [retryendtimes for retry in readRetryMap(endtimes) for retryendtimes in jobEndtimes(retry.endtimes)]
+
+def placeJobResults(result_list, jobs, skip=(), partial=False):
+	''' Place the results of jobs holding some of a job's sims (retries, eights waves: .endtimes, .sims the job sims of their sims 1, 2, ...)
+		at their job sims in result_list, those in place, or with partial those landed so far '''
+
+	length = len(result_list)
+	for job in jobs:
+		if not partial and not all(os.path.isfile(jobendtimes) for jobendtimes in jobEndtimes(job.endtimes)):
+			continue
+		for sim, result in zip(job.sims, jobResultLines(job.endtimes, len(job.sims), partial=partial)):
+			if result != NO_RESULT and sim not in skip and 0 < sim <= length:
+				result_list[sim - 1] = result
+	return result_list
+
+def retriedResultLines(endtimes, length, skip=(), partial=False):
+	''' jobResultLines() of a job, with the results of its retries (those in place, or with partial those landed so far) placed at their job sims '''
+
+	return placeJobResults(jobResultLines(endtimes, length, skip, partial), readRetryMap(endtimes), skip, partial)
+
+def crashedSims(kolist, endtimes):
+	''' Sims of a job that were simulated (pending in OUTPUT_final/outcomecache.sqlite until interpreted) and have no result '''
+
+	with OutcomeCache() as cache:
+		simulated = cache.pendingSims(jobName(kolist))
+	result_list = retriedResultLines(endtimes, len(readKoList(kolist)))
+	return [sim for sim in simulated if sim <= len(result_list) and result_list[sim - 1] == NO_RESULT]
+
+def submitSims(label, kolist, explist, endtimes, sims):
+	''' Write and submit a job holding sims of a job (ko.list, exp.list, bash scripts), named after the job with label (e.g. _retry1),
+		its sims numbered from 1. Returns (job name, endtimes.txt). '''
+
+	name = jobName(kolist) + label
+	endtimename = os.path.basename(endtimes)[:-len('_endtimes.txt')] + label + '_e'
+	simsendtimes = os.path.join(os.path.dirname(endtimes), endtimename + 'ndtimes.txt').replace('\\', '/')
+	folder = os.path.dirname(kolist)
+	simskolist = os.path.join(folder, name + '_ko.list')
+	simsexplist = os.path.join(folder, name + '_exp.list')
+	kolines = readKoList(kolist)
+	explines = readKoList(explist)
+	with open(simskolist, 'w+', newline ='\n') as ko:
+		for sim in sims:
+			ko.write(kolines[sim - 1] + '\n')
+	with open(simsexplist, 'w+', newline ='\n') as exp:
+		for sim in sims:
+			exp.write(explines[sim - 1] + '\n')
+
+	pack = packSize()
+	template = loadTemplate(packTemplate(TEMPLATESCRIPT, pack))
+	user_values = userValues()
+	maxarraysize, throttle = arrayLimits()
+	DATE = "{:%Y-%m-%d}".format(datetime.now())
+	for array in jobArrays(name, endtimename, simskolist, simsexplist, arraySpec(range(1, len(sims) + 1)), 0, simsendtimes, maxarraysize, throttle):
+		script = os.path.join(folder, array.name + '.sh')
+		with open(script, 'w+', newline ='\n') as expscript:
+			values = dict(user_values, JOB=array.name, ENDTIMENAME=array.endtimename, DATE=DATE, ARRAY=packedArray(array.kolist, array.array, pack), SIMNUMBER=array.simnumber)
+			expscript.write(template.render(values))
+		submitJob(array.name, script, array.kolist, array.explist, array.array, array.endtimes)
+	return name, simsendtimes
+
+def submitRetry(number, kolist, explist, endtimes, sims):
+	''' Write and submit the retry job of sims (ko.list, exp.list, bash scripts, a line of the retry map), its Retry '''
+
+	# the map line first, so a retry run by the local backend is read back with the job
+	name = jobName(kolist) + RETRYLABEL.format(number)
+	retryendtimes = os.path.join(os.path.dirname(endtimes), os.path.basename(endtimes)[:-len('_endtimes.txt')] + RETRYLABEL.format(number) + '_endtimes.txt').replace('\\', '/')
+	retry = Retry(number, name, retryendtimes, sims)
+	with open(retryMapPath(endtimes), 'a', newline ='\n') as retries_txt:
+		retries_txt.write('{}\t{}\t{}\t{}\n'.format(number, name, retryendtimes, ' '.join(str(sim) for sim in sims)))
+	submitSims(RETRYLABEL.format(number), kolist, explist, endtimes, sims)
+	return retry
+
+def resubmitCrashedSims(kolist, explist, endtimes, limit=None):
+	''' interpretResults() helper: submit a retry job for the crashed sims of a job, up to RETRIES retries.
+		The endtimes.txt of its latest retry not in place yet (run the script again once they are), [] once its results are complete. '''
+
+	if limit is None:
+		limit = retryLimit()
+	if not limit or not os.path.isfile(kolist):
+		return []
+	# a retry run by the local backend is in place once submitted, so the next one is planned straight away
+	while True:
+		retries = readRetryMap(endtimes)
+		if retries:
+			missing = [retryendtimes for retryendtimes in jobEndtimes(retries[-1].endtimes) if not os.path.isfile(retryendtimes)]
+			if missing:
+				return missing
+		if len(retries) >= limit:
+			return []
+		sims = crashedSims(kolist, endtimes)
+		if not sims:
+			return []
+		retry = submitRetry(len(retries) + 1, kolist, explist, endtimes, sims)
+		message = f'\nResubmitted the {len(sims)} crashed sims of {jobName(kolist)} as {retry.name} (retry {retry.number} of {limit}).\n'
+		print(message)
+		log = deletionLog()
+		log.event('retry', sims=len(sims), retry=retry.number, **jobFields(jobName(kolist)))
+		log.write(message)
+		log.close()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+
+# Affiliation: Life Sciences, University of Bristol
+# Last Updated: 2026-10-18
+
+"""
+Surrogate whole-cell simulator: scores knockout sets against a configurable essentiality ground truth instead of running
+the MATLAB whole-cell model, so the four stages (and engine.py) can be run and benchmarked offline.
+The ground truth is read from INPUT_script_1/groundtruth.txt (tab separated, like user_input.txt, genes in ko.list format):
+	ESSENTIAL	'MG_001', 'MG_003', ...		knocking out any of these: NoDivision
+	LETHALSET	'MG_039', 'MG_109',		synthetic lethal set, knocking out all of them: NoDivision (one line per set)
+	NOPROTEIN	'MG_041', ...			the cell divides, but with Protein DOWN
+	NORNA		'MG_052', ...			the cell divides, but with RNA DOWN
+	FAILURERATE	0.01				chance that any simulation fails to divide (stochastic failure)
+	SEED		0				seed of the stochastic failures and end times
+Every gene group is a GeneSet bitmask, and a batch of knockout sets (a job, or a pack of the local backend) is scored at once:
+the batch is byte sliced (BatchMasks), so each ground truth check runs over the whole batch a byte of its gene mask at a time.
+The stochastic failures and end times of a batch come from one random stream, seeded by SEED, the batch's sim numbers and its
+knockout sets: re-running a job (or a pack) gives the same records, and a knockout set simulated again in another batch
+(e.g. a lane's current deletion, or a retry) is an independent replicate.
+As a local backend simulator (INPUT_script_1/backend.txt): SIMULATOR	python surrogate.py {genes} {sim}
+or packed (PACK sims per run, see jobbackend.py): SIMULATOR	python surrogate.py --batch {batch} {results}
+"""
+
+# Imports
+import os
+import random
+import sys
+from functools import lru_cache
+from geneset import loadRegistry, parseGenes
+from simresults import simResult
+
+# Global variables
+GROUNDTRUTH_TXT = "INPUT_script_1/groundtruth.txt"
+# end time (hours) of simulations that do not divide, the length of a whole-cell model simulation
+NODIVISION_TIME = 13.89
+DIVISION_TIMES = (7.3, 11.5)
+
+class SurrogateSimulator:
+	''' Scores knockout sets (GeneSets, or ko.list lines) against an essentiality ground truth.
+		Also a simulate(jobname, combos) callable for MinesweeperEngine, the sim number being the position in the job. '''
+
+	def __init__(self, registry, essential=(), lethalsets=(), noprotein=(), norna=(), failurerate=0.0, seed=0):
+		self.registry = registry
+		self.essential = registry.geneSet(essential).mask
+		self.lethalsets = [registry.geneSet(genes).mask for genes in lethalsets]
+		self.noprotein = registry.geneSet(noprotein).mask
+		self.norna = registry.geneSet(norna).mask
+		self.failurerate = failurerate
+		self.seed = seed
+		self.simulations = 0
+
+	def lethal(self, mask):
+		''' Whether the knockout set fails to divide in every simulation '''
+
+		return bool(self.batchLethal(BatchMasks([mask])))
+
+	def batchLethal(self, batch):
+		''' Flags of the knockout sets of a batch holding an essential gene or a whole synthetic lethal set '''
+
+		lethal = batch.holdsAny(self.essential)
+		for lethalset in self.lethalsets:
+			lethal = lethal | batch.holdsAll(lethalset)
+		return lethal
+
+	def simulate(self, genes, sim=1):
+		''' SimResult of one knockout set (GeneSet or ko.list line) '''
+
+		return self.score([genes], sims=[sim])[0]
+
+	def score(self, genesets, firstsim=1, sims=None):
+		''' SimResults of a batch of knockout sets (GeneSets or ko.list lines), numbered from firstsim (e.g. a whole ko.list) or by sims.
+			The ground truth is checked for the whole batch at once (BatchMasks), the stochastic failures and end times are drawn from one
+			random stream seeded by SEED, the sim numbers and the knockout sets of the batch. '''
+
+		masks = [(self.registry.parse(genes) if isinstance(genes, str) else genes).mask for genes in genesets]
+		if sims is None:
+			sims = list(range(firstsim, firstsim + len(masks)))
+		self.simulations = self.simulations + len(masks)
+		batch = BatchMasks(masks)
+		lethal = batch.flags(self.batchLethal(batch))
+		noprotein = batch.flags(batch.holdsAny(self.noprotein))
+		norna = batch.flags(batch.holdsAny(self.norna))
+		chance = random.Random(b''.join(value.to_bytes(8, 'little', signed=True) for value in [self.seed] + sims) + batch.bytes)
+		records = []
+		for x, sim in enumerate(sims):
+			essentiality = 'DNA/RNA/Protein/Metabolic' if lethal[x] else 'Non Essential'
+			protein = 'DOWN' if noprotein[x] else 'UP'
+			rna = 'DOWN' if norna[x] else 'UP'
+			failed = chance.random() < self.failurerate
+			endtime = round(chance.uniform(*DIVISION_TIMES), 3)
+			if lethal[x] or failed:
+				records.append(simResult(sim, str(NODIVISION_TIME), '{} Protein {} RNA {} NoDivision'.format(essentiality, protein, rna)))
+			else:
+				records.append(simResult(sim, str(endtime), '{} Protein {} RNA {} Divided'.format(essentiality, protein, rna)))
+		return records
+
+	def __call__(self, jobname, combos):
+		return [record.resultLine() for record in self.score(geneset for combo, geneset in combos)]
+
+class BatchMasks:
+	''' A batch of knockout set bitmasks, byte sliced: byte k of every set is one bytes slice, so a set of genes is tested against
+		the whole batch a byte of its mask at a time (bytes.translate maps each set's byte to 1 if it passes, 0 if not), and the tests
+		of the bytes are combined as integers holding a flag byte per set. Only the bytes of the mask that hold genes are read. '''
+
+	def __init__(self, masks):
+		self.count = len(masks)
+		self.width = max(masks, default=0).bit_length() // 8 + 1
+		self.bytes = b''.join(mask.to_bytes(self.width, 'little') for mask in masks)
+		self.ones = int.from_bytes(b'\x01' * self.count, 'little')
+
+	def maskBytes(self, mask):
+		''' (position, byte) of the non zero bytes of a gene mask '''
+
+		return [(k, byte) for k, byte in enumerate(mask.to_bytes(mask.bit_length() // 8 + 1, 'little')) if byte]
+
+	def passing(self, k, table):
+		''' Flag byte per set: table applied to byte k of every set '''
+
+		return int.from_bytes(self.bytes[k::self.width].translate(table), 'little')
+
+	def holdsAny(self, mask):
+		''' Flags of the knockout sets holding any gene of mask '''
+
+		flags = 0
+		for k, byte in self.maskBytes(mask):
+			if k < self.width:
+				flags = flags | self.passing(k, anyTable(byte))
+		return flags
+
+	def holdsAll(self, mask):
+		''' Flags of the knockout sets holding every gene of mask '''
+
+		flags = self.ones
+		for k, byte in self.maskBytes(mask):
+			if k >= self.width:
+				return 0
+			flags = flags & self.passing(k, allTable(byte))
+		return flags
+
+	def flags(self, value):
+		''' Flags as booleans, one per knockout set '''
+
+		return [byte == 1 for byte in value.to_bytes(self.count, 'little')]
+
+@lru_cache(maxsize=None)
+def anyTable(byte):
+	''' bytes.translate table: 1 for the bytes sharing a bit with byte '''
+
+	return bytes(1 if value & byte else 0 for value in range(256))
+
+@lru_cache(maxsize=None)
+def allTable(byte):
+	''' bytes.translate table: 1 for the bytes holding every bit of byte '''
+
+	return bytes(1 if value & byte == byte else 0 for value in range(256))
+
+def readGroundTruth(groundtruth_txt=GROUNDTRUTH_TXT):
+	''' {KEY: [values, one per line]} from groundtruth.txt '''
+
+	values = {}
+	with open(groundtruth_txt) as groundtruth:
+		for line in groundtruth:
+			key, tab, value = line.strip().partition('\t')
+			if tab:
+				values.setdefault(key.strip().upper(), []).append(value.strip())
+	return values
+
+def loadSurrogate(groundtruth_txt=GROUNDTRUTH_TXT, registry=None):
+	''' SurrogateSimulator from groundtruth.txt '''
+
+	if registry is None:
+		registry = loadRegistry()
+	values = readGroundTruth(groundtruth_txt)
+	def genes(key):
+		return [gene for line in values.get(key, []) for gene in parseGenes(line)]
+	return SurrogateSimulator(registry,
+		essential=genes('ESSENTIAL'),
+		lethalsets=[parseGenes(line) for line in values.get('LETHALSET', [])],
+		noprotein=genes('NOPROTEIN'),
+		norna=genes('NORNA'),
+		failurerate=float(values.get('FAILURERATE', ['0'])[-1]),
+		seed=int(values.get('SEED', ['0'])[-1]))
+
+def runBatch(surrogate, batch_txt, results):
+	''' Simulate every line of a pack (sim, experiment, genes, seed), writing each sim's end time and outcome to results/<sim>.txt '''
+
+	lines = []
+	with open(batch_txt) as batch:
+		for line in batch:
+			values = line.rstrip('\n').split('\t')
+			if len(values) >= 3 and values[0].isdigit():
+				lines.append((int(values[0]), values[2]))
+	# the pack is scored as one batch
+	for record in surrogate.score([genes for sim, genes in lines], sims=[sim for sim, genes in lines]):
+		with open(os.path.join(results, '{}.txt'.format(record.sim)), 'w+', newline ='\n') as result:
+			result.write(record.resultLine() + '\n')
+
+def main():
+	''' python surrogate.py GENES [SIM] : print the end time and outcome of one ko.list line (local backend simulator)
+		python surrogate.py --batch BATCH RESULTS : simulate a pack of ko.list lines (local backend simulator with PACK) '''
+
+	groundtruth_txt = os.environ.get('GROUNDTRUTH', GROUNDTRUTH_TXT)
+	if len(sys.argv) > 3 and sys.argv[1] == '--batch':
+		runBatch(loadSurrogate(groundtruth_txt), sys.argv[2], sys.argv[3])
+		return
+	genes = sys.argv[1] if len(sys.argv) > 1 else ''
+	sim = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+	record = loadSurrogate(groundtruth_txt).simulate(genes, sim)
+	print(record.resultLine())
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,176 @@
+#!/bin/bash -login
+# Title: @JOB@
+# Author: @NAME@, @EMAIL@
+# Affiliation: @DEPARTMENT@, @UNI@ 
+# Run Using: @SUPERPC@ Supercomputer and @SUPERQUEUE@ Queue System
+# Last Updated: @DATE@
+
+#############################################################################################################################################################
+
+### Create and Run a BlueGem Script (SEE end of script for BlueGem DirTree):
+# Packed script: each array task simulates the sims on its line of the packs list one after another, in one MATLAB session.
+# MAKE SURE EOL = Unix, for bash script (*.sh), *_exp.list, and *_ko.list
+
+#CREATE folders (locally and transfer OR) on BlueGem:
+# OutDir, inside OutDir: /figs, /pdfs folders. Create the /experiment folders from exp.list. Create simulation folders for the number of simulations in /OutDir/Experiment.
+# Create folders from the cmd line: 
+# for num in {1..200}; do
+#     mkdir $num
+# done
+
+#CHANGE: 
+# ~Rarely~ background fig name (if different from default 'WildTypeBackground.fig')
+# --time below to the time of one simulation times the sims per task (PACK in backend.txt)
+
+#CHECK: 
+# MGGRunner.m (our custom runner) is in /runners folder (/WholeCellmaster/WholeCellmaster/src/+edu/+stanford/+covert/+cell/+sim/+runners/)
+
+#UPLOAD: 
+# script to script directory
+# ko.list and packs.list to ko.list folder
+# exp.list to exp.list folder
+
+#ACTIONS: 
+# Make script executable: chmod u+x _name_ 
+# Run Script on BlueGem: sbatch _name_ 
+# Check progress: squeue -u @USER@ 
+# Check errors/progress: vi slurm_jobnumber_.out (SHIFT-G for end of file, :q! to quit file)
+
+#############################################################################################################################################################
+
+### Constant Slurm Variables
+echo 'Task ID is:'
+echo ${SLURM_ARRAY_TASK_ID}
+echo 'Job ID is:'
+echo ${SLURM_ARRAY_JOB_ID}
+#SBATCH --time=0-30:00:00 # Max Time of Job
+#SBATCH -n 1 # Number of Nodes
+#SBATCH -p cpu # BlueGem CPU Queue 
+#SBATCH -A Flex1 # Umbrella Project Name
+
+### Changeable Slurm Variables
+# Number of Tasks (lines of the packs list)
+#SBATCH --array=@ARRAY@ 	
+# Name of Job
+#SBATCH --job-name=@JOB@
+# Location of Log Output
+#SBATCH --output=/projects/@GROUP@/@USER@/output/@PROJECTFOLDER@/@JOB@/slurm-%A_%a.out
+
+#############################################################################################################################################################
+
+### Declarations
+# WholeCell-master directory on BlueGem that contains analysis files
+Master=/home/@USER@/WholeCell-master/WholeCell-master
+
+# Directory to contain simulation output
+OutDir=/projects/@GROUP@/@USER@/output/@PROJECTFOLDER@/@JOB@
+
+# Variables passed to analysis
+# Fetch the Experiment names and Gene Knock Outs from the exp and KO list files, for each Sim of the task
+experiment_list=/home/@USER@/BlueGem/ExpLists/@JOB@_exp.list
+ko_list=/home/@USER@/BlueGem/KOLists/@JOB@_ko.list
+Umbrella=@JOB@
+CustomEndTimeName=@ENDTIMENAME@
+# Fetch the Sims of this task from the packs list file
+pack_list=/home/@USER@/BlueGem/KOLists/@JOB@_packs.list
+
+Sims=$(awk NR==${SLURM_ARRAY_TASK_ID} ${pack_list})
+
+# Appropiate Background Figure
+BackgroundFig='WildTypeBackground.fig'
+
+#############################################################################################################################################################
+
+### Simulation and Analysis Section
+# One MATLAB command for every Sim of the task: Diary on, Run Simulation using MGGRunner and its KO list (SeedInc = Sim number, as in the
+# unpacked script) logging the output in the Sim's Output Directory, Diary off, then if the simulation produced output, runGraphs and compareGraphs
+# (its record in the endtimes file, as in the unpacked script). A simulation that fails does not stop the following Sims.
+Commands=""
+for Sim in ${Sims}; do
+	Experiment=$(awk NR==${Sim} ${experiment_list})
+	Gene=$(awk NR==${Sim} ${ko_list})
+	SimDir=${OutDir}/${Experiment}/${Sim}
+
+	# Backup Command: ensures Simulation Directory exists. Folders should have been created previously.
+	mkdir -p ${SimDir}
+
+	Commands="${Commands}try;cd('${Master}');diary('${SimDir}/diary.out');runSimulation('runner','MGGRunner','logToDisk',true,'outDir','${SimDir}','seedIncrement','${Sim}','koList',{{${Gene}}});catch err;disp(getReport(err));end;diary off;"
+	Commands="${Commands}if exist('${SimDir}/state-0.mat','file');try;cd('${SimDir}');runGraphs('${Experiment}','${Sim}','${Umbrella}','${CustomEndTimeName}');compareGraphs('${Experiment}','${Sim}','${BackgroundFig}');catch err;disp(getReport(err));end;end;"
+done
+
+# Change directory to WholeCell-master 
+cd ${Master}
+
+# Load the matlab module 
+module load apps/matlab-r2013a
+
+# Set matlab options to a variable 
+options="-nodesktop -noFigureWindows -singleCompThread"
+
+# Run the simulations and analysis with matlab options, in one session
+# Add Master Directory to Path, then the Commands of every Sim
+matlab $options -r "addpath('${Master}');setWarnings();setPath();${Commands}exit;"
+
+#############################################################################################################################################################
+
+# Post End of Analysis in BlueGem								
+# Move pdfs and figs to accessible folders for downloading with FileZilla
+# find /projects/@GROUP@/@USER@/output/@PROJECTFOLDER@/@JOB@ -type f -iname "*.pdf" -exec mv -t /projects/@GROUP@/@USER@/output/@PROJECTFOLDER@/@JOB@/pdfs {} +
+# find /projects/@GROUP@/@USER@/output/@PROJECTFOLDER@/@JOB@ -type f -iname "*.fig" -exec mv -t /projects/@GROUP@/@USER@/output/@PROJECTFOLDER@/@JOB@/figs {} +
+
+#############################################################################################################################################################
+
+### BlueGem Directory Tree
+
+#BlueGem
+#|
+#- home
+#	- WholeCell-master
+#		- WholeCell-master
+#			-WholeCell model files downloaded from Covert Lab Github
+#			-runGraphs.m , compareGraphs.m, WildTypeBackground.fig
+#	- BlueGem
+#		- BlueGemScripts
+#			-script.sh
+#		- KOLists
+#			-ko.list
+#		- ExpLists
+#			-exp.list
+#- projects
+#	- @GROUP@
+#		- @USER@
+#			- output
+#				- @PROJECTFOLDER@
+#					- @JOB@
+#						- 'simname' = see *_exp.list
+#						- wildtype
+#						- mutant
+#						- pdfs
+#						- figs
+
+#############################################################################################################################################################
+
+### Creating KO List
+# (\w\w\w\w\w\w)
+# '\1',
+
+# 1. Copy your column of genes from a spreadsheet
+# 	1a. Remove EOL Line Symbols using \n\r and nothing, in Extended Mode
+# 2. Put ' ', around the Genes
+# 	CTRL-H in Notepad++
+# 	Find What: (\w\w\w\w\w\w) (e.g. searching for nnn = (\w\w\w) )
+#	Replace With: '\1',
+#	Tick Regular Expression option
+#	Hit Replace_All
+# 3. Put all the Genes on one line. 
+#	CTRL-A in Notepad++
+#	CTRL-J
+# 4. Remove all blank spaces from the line. 
+#	CTRL-H in Notepad++
+#	Find What:         (just enter a single space on this line)
+#	Replace With:      (put nothing in this box)
+#	Hit Replace_All
+# 5. Repeat the Simulations line as Needed
+#	CTRL-A in Notepad++
+#	CTRL-C 
+#	CTRL-V
\ No newline at end of file
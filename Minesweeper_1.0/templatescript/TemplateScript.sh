@@ -1,9 +1,9 @@
 #!/bin/bash -login
-# Title: JOBx
-# Author: NAME, EMAIL
-# Affiliation: DEPARTMENT, UNI 
-# Run Using: SUPERPC Supercomputer and SUPERQUEUE Queue System
-# Last Updated: DATE
+# Title: @JOB@
+# Author: @NAME@, @EMAIL@
+# Affiliation: @DEPARTMENT@, @UNI@ 
+# Run Using: @SUPERPC@ Supercomputer and @SUPERQUEUE@ Queue System
+# Last Updated: @DATE@
 
 #############################################################################################################################################################
 
@@ -31,7 +31,7 @@
 #ACTIONS: 
 # Make script executable: chmod u+x _name_ 
 # Run Script on BlueGem: sbatch _name_ 
-# Check progress: squeue -u _USERNAM_ 
+# Check progress: squeue -u @USER@ 
 # Check errors/progress: vi slurm_jobnumber_.out (SHIFT-G for end of file, :q! to quit file)
 
 #############################################################################################################################################################
@@ -48,30 +48,30 @@ echo ${SLURM_ARRAY_JOB_ID}
 
 ### Changeable Slurm Variables
 # Number of Sims 
-#SBATCH --array=1-SIMNUMBER 	
+#SBATCH --array=@ARRAY@ 	
 # Name of Job
-#SBATCH --job-name=JOBx
+#SBATCH --job-name=@JOB@
 # Location of Log Output
-#SBATCH --output=/projects/GROUP/USER/output/PROJECTFOLDER/JOBx/slurm-%A_%a.out
+#SBATCH --output=/projects/@GROUP@/@USER@/output/@PROJECTFOLDER@/@JOB@/slurm-%A_%a.out
 
 #############################################################################################################################################################
 
 ### Declarations
 # WholeCell-master directory on BlueGem that contains analysis files
-Master=/home/USER/WholeCell-master/WholeCell-master
+Master=/home/@USER@/WholeCell-master/WholeCell-master
 
 # Directory to contain simulation output
-OutDir=/projects/GROUP/USER/output/PROJECTFOLDER/JOBx
+OutDir=/projects/@GROUP@/@USER@/output/@PROJECTFOLDER@/@JOB@
 
 # Variables passed to analysis
 # Fetch the Experiment name from the Exp list file
-experiment_list=/home/USER/BlueGem/ExpLists/JOBx_exp.list
-Umbrella=JOBx
+experiment_list=/home/@USER@/BlueGem/ExpLists/@JOB@_exp.list
+Umbrella=@JOB@
 Experiment=$(awk NR==${SLURM_ARRAY_TASK_ID} ${experiment_list})
 Sim=${SLURM_ARRAY_TASK_ID}
-CustomEndTimeName='e'
+CustomEndTimeName=@ENDTIMENAME@
 # Fetch the Gene Knock Outs from the KO list file
-ko_list=/home/USER/BlueGem/KOLists/JOBx_ko.list
+ko_list=/home/@USER@/BlueGem/KOLists/@JOB@_ko.list
 
 Gene=$(awk NR==${SLURM_ARRAY_TASK_ID} ${ko_list})
 
@@ -123,8 +123,8 @@ fi
 
 # Post End of Analysis in BlueGem								
 # Move pdfs and figs to accessible folders for downloading with FileZilla
-# find /projects/GROUP/USER/output/PROJECTFOLDER/JOBx -type f -iname "*.pdf" -exec mv -t /projects/GROUP/USER/output/PROJECTFOLDER/JOBx/pdfs {} +
-# find /projects/GROUP/USER/output/PROJECTFOLDER/JOBx -type f -iname "*.fig" -exec mv -t /projects/GROUP/USER/output/PROJECTFOLDER/JOBx/figs {} +
+# find /projects/@GROUP@/@USER@/output/@PROJECTFOLDER@/@JOB@ -type f -iname "*.pdf" -exec mv -t /projects/@GROUP@/@USER@/output/@PROJECTFOLDER@/@JOB@/pdfs {} +
+# find /projects/@GROUP@/@USER@/output/@PROJECTFOLDER@/@JOB@ -type f -iname "*.fig" -exec mv -t /projects/@GROUP@/@USER@/output/@PROJECTFOLDER@/@JOB@/figs {} +
 
 #############################################################################################################################################################
 
@@ -145,11 +145,11 @@ fi
 #		- ExpLists
 #			-exp.list
 #- projects
-#	- GROUP
-#		- USER
+#	- @GROUP@
+#		- @USER@
 #			- output
-#				- PROJECTFOLDER
-#					- JOBx
+#				- @PROJECTFOLDER@
+#					- @JOB@
 #						- 'simname' = see *_exp.list
 #						- wildtype
 #						- mutant
@@ -0,0 +1,17 @@
+# The stages are flat modules run from Minesweeper_1.0, import them the same way
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from runlog import deletionLog
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+	''' An empty project folder as the working directory, the run log (OUTPUT_final/deletionlog.txt) ended in it '''
+
+	monkeypatch.chdir(tmp_path)
+	yield tmp_path
+	deletionLog().end()
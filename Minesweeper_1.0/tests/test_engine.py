@@ -0,0 +1,43 @@
+import json
+import os
+
+import pytest
+
+from engine import CHECKPOINT, MinesweeperEngine, latestCheckpoint, loadCheckpoint
+from geneset import GeneRegistry
+from surrogate import SurrogateSimulator
+
+def surrogate():
+	registry = GeneRegistry('SG_{:03d}'.format(x + 1) for x in range(80))
+	genes = list(registry.genes)
+	return registry, SurrogateSimulator(registry, essential=genes[:12], lethalsets=[genes[30:32], genes[50:53]], seed=1)
+
+def test_resume_from_a_checkpoint_matches_a_full_run(project):
+	registry, simulator = surrogate()
+	os.mkdir('full')
+	os.mkdir('stopped')
+	finalresults = MinesweeperEngine(simulator, registry=registry, checkpointdir='full').run()
+	MinesweeperEngine(simulator, registry=registry, checkpointdir='stopped').run()
+	# stop after Stage 2, as if the run was interrupted there
+	for checkpoint in os.listdir('stopped'):
+		if checkpoint != CHECKPOINT.format('2') and checkpoint != CHECKPOINT.format('1'):
+			os.remove(os.path.join('stopped', checkpoint))
+	assert latestCheckpoint('stopped') == os.path.join('stopped', CHECKPOINT.format('2'))
+	engine = loadCheckpoint(latestCheckpoint('stopped'), simulator, registry=registry, checkpointdir='stopped')
+	assert engine.stage == '2'
+	resumed = engine.resume()
+	assert {id: (deleted.mask, remaining.mask) for id, (deleted, remaining) in resumed.items()} == {id: (deleted.mask, remaining.mask) for id, (deleted, remaining) in finalresults.items()}
+
+def test_restore_rejects_another_checkpoint_format(project):
+	registry, simulator = surrogate()
+	os.mkdir('run')
+	engine = MinesweeperEngine(simulator, registry=registry, checkpointdir='run')
+	engine.run()
+	with open(latestCheckpoint('run')) as checkpoint_txt:
+		state = json.load(checkpoint_txt)
+	state['version'] = 0
+	with pytest.raises(ValueError):
+		MinesweeperEngine(simulator, registry=registry).restore(state)
+	del state['version']
+	with pytest.raises(ValueError):
+		MinesweeperEngine(simulator, registry=registry).restore(state)
@@ -0,0 +1,62 @@
+import random
+from itertools import combinations
+
+import pytest
+
+from geneset import GeneRegistry
+from latticesearch import LatticeSearch, loadLatticeSearch
+
+def monotoneRound(seed, groups=8):
+	''' The powerset of groups of genes, and a combination dividing unless it holds every gene of a synthetic lethal set (monotone) '''
+
+	chance = random.Random(seed)
+	registry = GeneRegistry('SG_{:03d}'.format(x + 1) for x in range(groups * 12))
+	genes = list(registry.genes)
+	chance.shuffle(genes)
+	cuts = sorted(chance.sample(range(1, len(genes)), groups - 1))
+	genegroups = [genes[start:end] for start, end in zip([0] + cuts, cuts + [len(genes)])]
+	lethalsets = [registry.geneSet(chance.sample(genes, chance.choice([1, 2, 2, 3]))) for x in range(chance.randint(1, 6))]
+	names = [str(x + 1) for x in range(groups)]
+	combos = []
+	for size in range(groups + 1):
+		for combo in combinations(names, size):
+			combos.append((' '.join(combo), registry.geneSet(gene for name in combo for gene in genegroups[int(name) - 1])))
+	divides = [not any(lethalset <= geneset for lethalset in lethalsets) for name, geneset in combos]
+	return combos, divides
+
+def search(combos, divides, order, reload=False):
+	lattice = LatticeSearch(combos, order)
+	wave = lattice.nextWave()
+	while wave:
+		lattice.record(wave, [divides[index] for index in wave])
+		if reload:
+			lattice = loadLatticeSearch(lattice.state())
+		wave = lattice.nextWave()
+	return lattice
+
+@pytest.mark.parametrize('order', ['largest', 'level'])
+def test_search_finds_the_best_deletion_of_the_full_powerset(order):
+	simulations = 0
+	full = 0
+	for seed in range(40):
+		combos, divides = monotoneRound(seed)
+		lattice = search(combos, divides, order)
+		best = max(len(geneset) for (name, geneset), divided in zip(combos, divides) if divided)
+		assert lattice.best() == best
+		# every combination simulated or labelled consistently with the ground truth
+		for index, divided in enumerate(divides):
+			assert lattice.viable[index] in (divided, None)
+		simulations = simulations + lattice.simulations()
+		full = full + len(combos) - 1
+	assert simulations < full / 2
+
+def test_largest_needs_fewer_simulations_than_level():
+	rounds = [monotoneRound(seed) for seed in range(40)]
+	largest = sum(search(combos, divides, 'largest').simulations() for combos, divides in rounds)
+	level = sum(search(combos, divides, 'level').simulations() for combos, divides in rounds)
+	assert largest < level
+	assert largest < 255 * len(rounds) / 4
+
+def test_search_resumes_from_its_state():
+	combos, divides = monotoneRound(3)
+	assert search(combos, divides, 'largest', reload=True).tested == search(combos, divides, 'largest').tested
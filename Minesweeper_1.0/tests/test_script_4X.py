@@ -0,0 +1,50 @@
+import os
+from itertools import combinations
+
+import pytest
+
+import script_4X
+from combofile import readComboFile, writeComboFile
+from geneset import GeneRegistry
+from runstate import RunState
+
+DIVIDED = 'Non Essential Protein UP RNA UP Divided'
+
+def writeRound(groups, controls):
+	''' A pending round 1 of red in the current directory: its eightsandgenes, ko.list / exp.list and every sim's result '''
+
+	for folder in ['OUTPUT_final', 'OUTPUT_script_4X/bashexpkofiles', 'INPUT_script_4X']:
+		os.makedirs(folder, exist_ok=True)
+	names = [str(group) for group in range(1, groups + 1)]
+	genes = [(name, "'MG_{:03d}', 'MG_{:03d}', ".format(2 * int(name), 2 * int(name) + 1)) for name in names]
+	combos = [combo for size in range(groups + 1) for combo in combinations(names, size)]
+	writeComboFile('OUTPUT_script_4X/red_1_eightsandgenes.txt', "'MG_100', ", genes, combos)
+	kolines = list(readComboFile('OUTPUT_script_4X/red_1_eightsandgenes.txt').koLines(GeneRegistry()))
+	experiments = ['gapko'] * len(kolines)
+	if controls:
+		kolines = kolines + ['\n', "'MG_006',\n"]
+		experiments = experiments + ['wildtype', 'mutant']
+	with open('OUTPUT_script_4X/bashexpkofiles/minegapko_red_1_ko.list', 'w') as ko:
+		ko.writelines(kolines)
+	with open('OUTPUT_script_4X/bashexpkofiles/minegapko_red_1_exp.list', 'w') as exp:
+		exp.writelines(experiment + '\n' for experiment in experiments)
+	with open('INPUT_script_4X/gapko_red_1_endtimes.txt', 'w') as endtimes:
+		for sim in range(1, len(kolines) + 1):
+			endtimes.write('{}\t10.0\t{}\n'.format(sim, DIVIDED))
+	state = RunState()
+	state.submit('red', 1, 'eights', 'minegapko_red_1', 'INPUT_script_4X/gapko_red_1_endtimes.txt')
+	state.save()
+	return combos
+
+@pytest.mark.parametrize('groups, controls', [(8, False), (3, True)])
+def test_matchedresults_has_a_row_per_combination(project, groups, controls):
+	combos = writeRound(groups, controls)
+	assert (len(combos) >= script_4X.CONTROLLIMIT) != controls
+
+	script_4X.interpretResults()
+
+	with open('OUTPUT_script_4X/matchedresults_red_1.txt') as matchedresults:
+		rows = matchedresults.readlines()
+	assert len(rows) == len(combos)
+	# the largest combination is matched, not dropped as if it were a control
+	assert rows[-1] == ' '.join(combos[-1]) + '\t10.0\t' + DIVIDED + '\n'
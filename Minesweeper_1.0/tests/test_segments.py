@@ -0,0 +1,29 @@
+import os
+
+from geneset import GeneRegistry
+from segments import COMPONENTS, compatibleSegments, segmentSlices
+
+DEMO = os.path.join(os.path.dirname(__file__), '..', '..', 'Minesweeper_0.9 DEMO Completed')
+
+def test_computed_matching_equals_the_table_for_the_shipped_segments():
+	registry = GeneRegistry()
+	boards = {}
+	with open(os.path.join(DEMO, 'OUTPUT_script_3', 'successfulboards.txt')) as successfulboards_txt:
+		for line in successfulboards_txt:
+			code, genecode = line.rstrip('\n').split('\t')
+			boards.setdefault(code, registry.parse(genecode))
+	assert len(boards) > 10
+	for code in boards:
+		table = [component for component in COMPONENTS[code] if component in boards]
+		assert sorted(compatibleSegments(code, boards)) == sorted(table)
+		assert compatibleSegments(code, boards, table=True) == table
+
+def test_table_differs_from_the_gene_sets_at_tile_boundaries_only():
+	for whole in range(40, 1500, 7):
+		registry = GeneRegistry('G{}'.format(gene) for gene in range(whole))
+		boards = {code: registry.geneSet(registry.genes[start:end]) for code, start, end in segmentSlices(whole)}
+		for code in COMPONENTS:
+			computed = set(compatibleSegments(code, boards))
+			# the tiled sizes (trunc(percent% of the genes) + 1) shift the tile boundaries by a gene per tile
+			for other in computed.symmetric_difference(COMPONENTS[code]):
+				assert len(boards[code] & boards[other]) <= 4
@@ -0,0 +1,37 @@
+import random
+
+from geneset import GeneRegistry
+from surrogate import BatchMasks, SurrogateSimulator
+
+def test_batch_checks_match_each_knockout_set():
+	chance = random.Random(0)
+	for genes in [5, 8, 9, 100, 700]:
+		masks = [chance.getrandbits(chance.randint(0, genes)) for x in range(300)] + [0, (1 << genes) - 1]
+		batch = BatchMasks(masks)
+		for x in range(50):
+			mask = sum(1 << gene for gene in chance.sample(range(genes + 20), chance.randint(0, 3)))
+			assert batch.flags(batch.holdsAny(mask)) == [bool(knockouts & mask) for knockouts in masks]
+			assert batch.flags(batch.holdsAll(mask)) == [knockouts & mask == mask for knockouts in masks]
+	assert BatchMasks([]).flags(BatchMasks([]).holdsAll(1)) == []
+
+def test_score_follows_the_ground_truth_and_repeats():
+	registry = GeneRegistry('SG_{:03d}'.format(x + 1) for x in range(60))
+	genes = list(registry.genes)
+	simulator = SurrogateSimulator(registry, essential=genes[:10], lethalsets=[genes[20:22], genes[30:33]], noprotein=genes[40:42], failurerate=0.2, seed=3)
+	chance = random.Random(1)
+	genesets = [registry.geneSet(chance.sample(genes[10:], chance.randint(0, 6))) for x in range(400)] + [registry.geneSet(genes[20:22])]
+	records = simulator.score(genesets)
+	assert records == simulator.score(genesets)
+	assert [record.sim for record in records] == list(range(1, len(genesets) + 1))
+	failures = 0
+	for geneset, record in zip(genesets, records):
+		lethal = simulator.lethal(geneset.mask)
+		assert lethal == (registry.geneSet(genes[20:22]) <= geneset or registry.geneSet(genes[30:33]) <= geneset)
+		assert ('Protein DOWN' in record.outcome) == bool(geneset.mask & simulator.noprotein)
+		if lethal:
+			assert not record.divided
+		elif not record.divided:
+			failures = failures + 1
+	# the stochastic failures come from the batch's random stream
+	assert 0 < failures < len(genesets) / 2
+	assert simulator.simulate(genesets[-1], 7).sim == 7
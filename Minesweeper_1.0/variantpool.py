@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+
+# Affiliation: Life Sciences, University of Bristol
+# Last Updated: 2026-10-18
+
+"""
+Worker pool for the round work of each variant in script_4X.py (remaining genes, eights groups and powersets, appended single kos).
+Each variant only reads and writes its own files (COLOUR_N in the file name), so the variants of a round are processed at the same
+time, one worker process per variant (processes, not threads: generating large powersets is pure python and holds the GIL).
+A worker's printed messages and deletion log / events are captured, and replayed by the main process in variant order, so the
+terminal and OUTPUT_final/deletionlog.txt read exactly as if the variants had been processed one after another.
+Shared state (runstate.json, the outcome cache, job submission) stays in the main process, which acts on the returned values.
+"""
+
+# Imports
+import io
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from runlog import captureLog, deletionLog
+
+def variantWorker(function, args, run, stage):
+	''' Runs in the worker process: function(*args), with its printed output and deletion log captured '''
+
+	runlog = captureLog(run, stage)
+	output = io.StringIO()
+	with redirect_stdout(output):
+		value = function(*args)
+	messages, events = runlog.captured()
+	return value, output.getvalue(), messages, events
+
+def runVariants(function, argslist, workers=None):
+	''' Calls function(*args) for each variant's args, workers at a time (default one per core, 1 = one after another in this process).
+		Yields the return values in the order of argslist, printing / logging each variant's captured output just before its value,
+		so the caller can act on each variant (createScripts(), runstate) in order. function has to be a module level function. '''
+
+	if workers is None:
+		workers = os.cpu_count() or 1
+	workers = min(workers, len(argslist))
+	if workers <= 1:
+		for args in argslist:
+			yield function(*args)
+		return
+
+	# nothing buffered in this process may be copied into the workers
+	log = deletionLog()
+	log.flush()
+	sys.stdout.flush()
+	with ProcessPoolExecutor(max_workers=workers) as pool:
+		futures = [pool.submit(variantWorker, function, args, log.run, log.stage) for args in argslist]
+		for future in futures:
+			value, output, messages, events = future.result()
+			sys.stdout.write(output)
+			log.replay(messages, events)
+			yield value